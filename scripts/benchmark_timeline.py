@@ -0,0 +1,106 @@
+"""Scaling benchmark for interval-based timeline selection
+
+Builds synthetic narration sets of increasing length (up to 10 hours by
+default) with a fixed number of candidate matches per entry and times
+select_matches_for_narration_intervals. With the sorted-interval index the
+time per narration hour should stay roughly constant for both selection
+strategies.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.matching import Match
+from src.core.timeline_builder import select_matches_for_narration_intervals
+from src.utils.srt_parser import SRTEntry
+
+
+def build_synthetic_narration(
+    hours: float,
+    candidates_per_entry: int,
+    movie_duration: float,
+    seed: int = 0
+) -> Tuple[List[SRTEntry], Dict[int, List[Match]]]:
+    """Build narration entries and grouped candidates for a given duration"""
+    rng = random.Random(seed)
+    entries = []
+    matches_by_narration = {}
+    
+    current_time = 0.0
+    total_seconds = hours * 3600.0
+    while current_time < total_seconds:
+        duration = rng.uniform(2.0, 6.0)
+        entry_index = len(entries)
+        entries.append(SRTEntry(
+            index=entry_index + 1,
+            start_time=current_time,
+            end_time=current_time + duration,
+            text=f"narration {entry_index}"
+        ))
+        
+        matches = []
+        for _ in range(candidates_per_entry):
+            start = rng.uniform(0.0, movie_duration - 10.0)
+            matches.append(Match(
+                segment_id=f"movie_{len(matches):06d}",
+                start_time=start,
+                end_time=start + rng.uniform(2.0, 8.0),
+                similarity_score=rng.uniform(0.7, 1.0),
+                narration_text="",
+                narration_time=current_time
+            ))
+        matches.sort(key=lambda m: m.similarity_score, reverse=True)
+        matches_by_narration[entry_index] = matches
+        
+        # Occasional pauses between narration lines
+        current_time += duration + rng.choice([0.0, 0.0, 0.5, 2.0])
+    
+    return entries, matches_by_narration
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark timeline selection scaling")
+    parser.add_argument("--hours", nargs="+", type=float, default=[0.5, 1.0, 2.0, 5.0, 10.0],
+                        help="Narration durations to benchmark (hours)")
+    parser.add_argument("--candidates", type=int, default=3, help="Candidate matches per entry")
+    parser.add_argument("--movie-duration", type=float, default=3 * 3600.0,
+                        help="Synthetic movie duration in seconds")
+    parser.add_argument("--interval-seconds", type=float, default=4.0)
+    parser.add_argument("--copyright-min-gap", type=float, default=30.0)
+    parser.add_argument("--selection-strategy", choices=["greedy", "dp"], default="dp")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size (best is reported)")
+    
+    args = parser.parse_args()
+    
+    print(f"{'hours':>6}  {'entries':>8}  {'ticks':>7}  {'selected':>8}  {'score':>9}  {'seconds':>8}  {'s/hour':>8}")
+    for hours in args.hours:
+        entries, matches_by_narration = build_synthetic_narration(
+            hours, args.candidates, args.movie_duration
+        )
+        
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            selection = select_matches_for_narration_intervals(
+                entries,
+                matches_by_narration,
+                interval_seconds=args.interval_seconds,
+                min_time_gap=args.copyright_min_gap,
+                strategy=args.selection_strategy
+            )
+            best = min(best, time.perf_counter() - started)
+        
+        total_score = sum(m.similarity_score for m in selection.matches)
+        print(f"{hours:>6g}  {len(entries):>8}  {selection.intervals:>7}  {len(selection.matches):>8}  "
+              f"{total_score:>9.1f}  {best:>8.3f}  {best / hours:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Calibrate encoder throughput on this host
+
+Renders a short synthetic movie (ffmpeg testsrc2, a moving test pattern;
+no external media needed) and times:
+
+- x264 encodes for every preset, CRF and process count (threads per
+  process = CPU count / processes, as parallel renders split them)
+- decoding, stream copy, the narration AAC encode and the start-up cost of
+  a one-frame clip render
+
+Every preset and CRF's quality is measured as the mean SSIM of its encode
+against the source, together with its bitrate: a fast preset reaches a
+given SSIM at a lower CRF, i.e. with a larger file. The result is written
+as the throughput profile used by the render stage's dry-run planner, and
+by renders with a quality_target to pick the fastest configuration (and
+parallel worker count) that meets it, optionally within max_bitrate_kbps.
+
+Times are net of the process start-up cost. A measurement that does not
+clearly exceed it is repeated with the test movie looped more often
+(never clamped), so very fast operations such as stream copy still get a
+real rate.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.adapters.ffmpeg_adapter import VideoSettings
+from src.core.render_plan import DEFAULT_PRESET_MPPS_PER_CORE, EncoderThroughput, ThroughputProfile
+from src.stages.render import RenderStage
+
+
+def run(cmd: List[str]) -> subprocess.CompletedProcess:
+    """Run ffmpeg, raising with its stderr on failure"""
+    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{result.stderr}")
+    return result
+
+
+def timed(cmds: List[List[str]]) -> float:
+    """Wall time of running the commands concurrently"""
+    started = time.perf_counter()
+    processes = [
+        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        for cmd in cmds
+    ]
+    for cmd, process in zip(cmds, processes):
+        _, stderr = process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{stderr}")
+    return time.perf_counter() - started
+
+
+def net_time(
+    make_cmds: Callable[[int], List[List[str]]],
+    overhead: float,
+    per_pass: float = 0.0,
+    max_loops: int = 64
+) -> Tuple[float, int]:
+    """Wall time of the commands minus start-up overhead and known work
+    
+    make_cmds(loops) builds the commands for `loops` passes over the test
+    input. While the net time is below the overhead (too small to tell
+    from timing noise), the measurement is repeated with twice as many
+    passes.
+    
+    Args:
+        make_cmds: Builds the concurrent commands for a pass count
+        overhead: Start-up cost of one round of commands in seconds
+        per_pass: Known time per pass to subtract (e.g. decoding)
+        max_loops: Maximum passes before giving up
+    
+    Returns:
+        Tuple of (net seconds, passes)
+    
+    Raises:
+        RuntimeError: If max_loops passes are still not measurable
+    """
+    loops = 1
+    while True:
+        elapsed = timed(make_cmds(loops)) - overhead - per_pass * loops
+        if elapsed >= overhead:
+            return elapsed, loops
+        if loops >= max_loops:
+            raise RuntimeError(
+                f"Not measurable after {loops} passes ({elapsed:.3f}s net): "
+                f"{' '.join(make_cmds(loops)[0])}"
+            )
+        loops *= 2
+
+
+def looped(loops: int) -> List[str]:
+    """Input options repeating the next input `loops` times"""
+    return ["-stream_loop", str(loops - 1)]
+
+
+def make_source(ffmpeg_path: str, path: Path, size: str, fps: int, duration: float, noise: int) -> None:
+    """Synthetic movie with a 2 s GOP, encoded at high quality"""
+    source_filter = f"testsrc2=size={size}:rate={fps}"
+    if noise:
+        source_filter += f",noise=alls={noise}:allf=t"
+    run([
+        ffmpeg_path, "-v", "error", "-y",
+        "-f", "lavfi", "-i", source_filter,
+        "-t", str(duration),
+        "-c:v", "libx264", "-preset", "ultrafast", "-crf", "10", "-g", str(2 * fps),
+        "-pix_fmt", "yuv420p",
+        str(path)
+    ])
+
+
+def measure_ssim(ffmpeg_path: str, encoded: Path, source: Path) -> Optional[float]:
+    """Mean SSIM of an encode against its source"""
+    result = run([
+        ffmpeg_path, "-hide_banner",
+        "-i", str(encoded), "-i", str(source),
+        "-lavfi", "ssim", "-f", "null", "-"
+    ])
+    match = re.search(r"All:\s*([0-9.]+)", result.stderr)
+    return float(match.group(1)) if match else None
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    default_processes = sorted({1, cpu_count} | {2 ** i for i in range(1, 8) if 2 ** i < cpu_count})
+    
+    parser = argparse.ArgumentParser(description="Measure encoder throughput and write the render throughput profile")
+    parser.add_argument("--ffmpeg-path", default="ffmpeg", help="Path to FFmpeg executable")
+    parser.add_argument("--project-root", type=Path, help="Project root directory (profile goes to cache/encoder_profile.json)")
+    parser.add_argument("--output", type=Path, help="Profile path (overrides --project-root)")
+    parser.add_argument("--presets", nargs="+", default=list(DEFAULT_PRESET_MPPS_PER_CORE), help="x264 presets to measure")
+    parser.add_argument("--processes", nargs="+", type=int, default=default_processes, help="Concurrent process counts to measure")
+    parser.add_argument("--crfs", nargs="+", type=int, default=[14, 18, 23, 28], help="x264 CRFs to measure")
+    parser.add_argument("--size", default="1280x720", help="Test movie frame size")
+    parser.add_argument("--fps", type=int, default=24, help="Test movie frame rate")
+    parser.add_argument("--duration", type=float, default=4.0, help="Test movie duration in seconds")
+    parser.add_argument("--noise", type=int, default=0, help="Temporal noise strength added to the test movie (film grain)")
+    args = parser.parse_args()
+    
+    output_path = args.output or RenderStage(project_root=args.project_root).get_encoder_profile_path()
+    width, height = (int(x) for x in args.size.split("x"))
+    frame_mp = width * height / 1e6
+    source_mp = frame_mp * args.fps * args.duration
+    
+    print(f"Calibrating encoder throughput ({cpu_count} CPUs, {args.size} @ {args.fps} fps, {args.duration:g} s)...")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        source = work_dir / "source.mp4"
+        make_source(args.ffmpeg_path, source, args.size, args.fps, args.duration, args.noise)
+        
+        # Start-up cost of a clip render: seek, open the encoder, write one frame
+        overhead = min(
+            timed([[args.ffmpeg_path, "-v", "error", "-y", "-ss", str(args.duration / 2), "-i", str(source),
+                    "-frames:v", "1", *VideoSettings().encode_args(), str(work_dir / "frame.mp4")]])
+            for _ in range(3)
+        )
+        print(f"  process overhead: {overhead:.3f}s")
+        
+        decode_time, loops = net_time(
+            lambda loops: [[args.ffmpeg_path, "-v", "error", *looped(loops), "-i", str(source), "-f", "null", "-"]],
+            overhead
+        )
+        decode_time /= loops
+        decode_mpps = source_mp / decode_time
+        print(f"  decode: {decode_mpps:.1f} MP/s")
+        
+        copy_time, loops = net_time(
+            lambda loops: [[args.ffmpeg_path, "-v", "error", "-y", *looped(loops), "-i", str(source), "-c", "copy",
+                            str(work_dir / "copy.mp4")]],
+            overhead
+        )
+        copy_speed = args.duration * loops / copy_time
+        audio_time, loops = net_time(
+            lambda loops: [[args.ffmpeg_path, "-v", "error", "-y", "-f", "lavfi", "-i", "sine=frequency=440",
+                            "-t", str(args.duration * 10 * loops), "-c:a", "aac", str(work_dir / "audio.m4a")]],
+            overhead
+        )
+        audio_speed = args.duration * 10 * loops / audio_time
+        print(f"  stream copy: {copy_speed:.0f}x realtime, narration encode: {audio_speed:.0f}x realtime")
+        
+        encoders = []
+        for preset in args.presets:
+            for crf in sorted(set(args.crfs)):
+                video = VideoSettings(preset=preset, crf=crf)
+                quality = bitrate_kbps = None
+                for processes in sorted(set(args.processes)):
+                    threads = max(1, cpu_count // processes)
+                    outputs = [work_dir / f"{preset}_{crf}_{processes}_{i}.mp4" for i in range(processes)]
+                    # The planner counts decoding separately
+                    try:
+                        encode_time, loops = net_time(
+                            lambda loops: [
+                                [args.ffmpeg_path, "-v", "error", "-y", *looped(loops), "-i", str(source), "-an",
+                                 *video.encode_args(), "-threads", str(threads), str(output)]
+                                for output in outputs
+                            ],
+                            overhead,
+                            per_pass=processes * decode_time
+                        )
+                    except RuntimeError as e:
+                        print(f"  {preset:>10} crf {crf:2d} x{processes}: skipped, {e}")
+                        continue
+                    mpps = processes * source_mp * loops / encode_time
+                    if quality is None:
+                        quality = measure_ssim(args.ffmpeg_path, outputs[0], source)
+                        bitrate_kbps = outputs[0].stat().st_size * 8 / (args.duration * loops) / 1000
+                    for output in outputs:
+                        output.unlink()
+                    
+                    encoders.append(EncoderThroughput(
+                        preset=preset, threads=threads, processes=processes,
+                        mpps=mpps, crf=crf, quality=quality, bitrate_kbps=bitrate_kbps
+                    ))
+                    print(f"  {preset:>10} crf {crf:2d} x{processes} ({threads} threads): {mpps:7.1f} MP/s, "
+                          f"{mpps / frame_mp:6.1f} fps, SSIM {quality if quality is not None else float('nan'):.4f}, "
+                          f"{bitrate_kbps:.0f} kb/s")
+    
+    if not encoders:
+        print("\n[ERROR] No encoder configuration could be measured")
+        return False
+    
+    profile = ThroughputProfile(
+        cpu_count=cpu_count,
+        decode_mpps=decode_mpps,
+        process_overhead=overhead,
+        copy_speed=copy_speed,
+        audio_speed=audio_speed,
+        encoders=encoders,
+        calibrated=True
+    )
+    profile.save(output_path)
+    print(f"\n[OK] Throughput profile saved to: {output_path}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
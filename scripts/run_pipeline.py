@@ -25,6 +25,7 @@ def main():
                        default=["ingest", "index", "search", "timeline", "render"],
                        help="Stages to run (default: all)")
     parser.add_argument("--skip-render", action="store_true", help="Skip render stage (only generate timeline.json)")
+    parser.add_argument("--proxy", action="store_true", help="Render a low-resolution proxy (same as preset \"proxy\")")
     parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
     
     args = parser.parse_args()
@@ -60,7 +61,8 @@ def main():
             print(f"Running {stage_name} stage...")
             print(f"{'='*60}")
             
-            result = stage.run(args.project_id)
+            config = {"options": {"preset": "proxy"}} if stage_name == "render" and args.proxy else None
+            result = stage.run(args.project_id, config)
             output_path = stage.save_output(args.project_id, result)
             
             print(f"✓ {stage_name} completed successfully")
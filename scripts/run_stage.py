@@ -29,6 +29,8 @@ def main():
     parser.add_argument("stage", choices=list(STAGES.keys()), help="Stage to run")
     parser.add_argument("--project-id", required=True, help="Project identifier")
     parser.add_argument("--ffmpeg-path", help="Path to FFmpeg executable")
+    parser.add_argument("--proxy", action="store_true", help="Render a low-resolution proxy (same as preset \"proxy\")")
+    parser.add_argument("--dry-run", action="store_true", help="Render: only predict the render cost and strategy")
     parser.add_argument("--embedding-model", default="sentence-transformers/all-MiniLM-L6-v2", help="Embedding model name")
     parser.add_argument("--project-root", type=Path, help="Project root directory")
     parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
@@ -55,7 +57,21 @@ def main():
     # Run stage
     try:
         print(f"Running {args.stage} stage for project {args.project_id}...")
-        result = stage.run(args.project_id)
+        config = {"options": {"preset": "proxy"}} if args.stage == "render" and args.proxy else None
+        if args.stage == "render" and args.dry_run:
+            plan = stage.plan(args.project_id, config)
+            plan_path = stage.save_plan(args.project_id, plan)
+            print(f"Strategy: {plan['strategy_name']} ({plan['processes']} ffmpeg processes)")
+            print(f"Predicted wall time: {plan['predicted_wall_seconds']:.1f}s "
+                  f"(decode {plan['decode_seconds']:.1f}s, encode {plan['encode_seconds']:.1f}s, "
+                  f"overhead {plan['overhead_seconds']:.1f}s)")
+            for strategy, seconds in plan["alternatives"].items():
+                print(f"  {strategy}: {seconds:.1f}s")
+            if not plan["calibrated_profile"]:
+                print("Using default throughput; run scripts/calibrate_encoder.py for host-specific estimates")
+            print(f"Plan saved to: {plan_path}")
+            return
+        result = stage.run(args.project_id, config)
         output_path = stage.save_output(args.project_id, result)
         print(f"Stage completed successfully. Output saved to: {output_path}")
     except Exception as e:
@@ -0,0 +1,198 @@
+"""CLI script for evaluating a grid of timeline configurations in one pass
+
+Every combination of similarity threshold, copyright gap and interval
+length goes through the timeline stage's own selection
+(TimelineStage.select_matches and its duration budget), on top of the
+project.json options, so scene weights, priorities / min_priority and
+spoiler filtering apply exactly as in a stage run. Worker processes keep
+their own timeline state in a temporary directory: candidates are loaded
+once per worker, and configurations sharing a threshold and interval
+length reuse the candidate table. Nothing is written to the project; use
+tune_timeline.py or project.json to apply the chosen configuration.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.stages.timeline import TimelineStage
+
+
+METRIC_COLUMNS = ["coverage", "mean_score", "fallbacks", "skipped", "trimmed", "segments", "output_duration"]
+
+# Worker state, set once per process by _init_worker
+_stage = None
+_project_id = None
+_ingest_data = None
+_base_options = None
+_state_dir = None
+
+
+def _init_worker(
+    project_root: Optional[Path],
+    project_id: str,
+    base_options: Dict[str, Any],
+    tmp_dir: str
+) -> None:
+    """Open the stage and a private timeline state in the worker process"""
+    global _stage, _project_id, _ingest_data, _base_options, _state_dir
+    _stage = TimelineStage(project_root=project_root)
+    _project_id = project_id
+    _ingest_data = _stage.load_ingest_output(project_id)
+    _base_options = base_options
+    _state_dir = Path(tmp_dir) / f"timeline_state_{os.getpid()}"
+
+
+def evaluate_configuration(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the stage's selection for one configuration and score it
+    
+    Args:
+        config: Option overrides (similarity_threshold, copyright_min_gap,
+            interval_seconds and any fixed sweep options)
+    
+    Returns:
+        Configuration merged with its metrics
+    """
+    opts = dict(_base_options)
+    opts.update(config)
+    
+    selection = _stage.select_matches(_project_id, _ingest_data, opts, state_dir=_state_dir)
+    selected = len(selection.matches)
+    _stage.apply_budget(selection, opts)
+    
+    matches = selection.matches
+    scores = [m.similarity_score for m in matches]
+    result = dict(config)
+    result.update({
+        "coverage": selected / selection.intervals if selection.intervals else 0.0,
+        "mean_score": sum(scores) / len(scores) if scores else 0.0,
+        "fallbacks": selection.fallbacks,
+        "skipped": selection.skipped,
+        "trimmed": selection.trimmed,
+        "segments": len(matches),
+        "output_duration": sum(m.end_time - m.start_time for m in matches)
+    })
+    return result
+
+
+def format_table(results: List[Dict[str, Any]]) -> str:
+    """Format results as an aligned text table"""
+    header = ["threshold", "gap", "interval"] + METRIC_COLUMNS
+    rows = []
+    for r in results:
+        rows.append([
+            f"{r['similarity_threshold']:.2f}",
+            f"{r['copyright_min_gap']:g}",
+            f"{r['interval_seconds']:g}",
+            f"{r['coverage']:.3f}",
+            f"{r['mean_score']:.3f}",
+            str(r["fallbacks"]),
+            str(r["skipped"]),
+            str(r["trimmed"]),
+            str(r["segments"]),
+            f"{r['output_duration']:.1f}"
+        ])
+    
+    widths = [max([len(h)] + [len(row[i]) for row in rows]) for i, h in enumerate(header)]
+    lines = ["  ".join(h.rjust(w) for h, w in zip(header, widths))]
+    for row in rows:
+        lines.append("  ".join(v.rjust(w) for v, w in zip(row, widths)))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate a grid of timeline configurations")
+    parser.add_argument("--project-id", required=True, help="Project identifier")
+    parser.add_argument("--project-root", type=Path, help="Project root directory")
+    parser.add_argument("--similarity-thresholds", nargs="+", type=float, default=[0.65, 0.7, 0.75, 0.8])
+    parser.add_argument("--copyright-min-gaps", nargs="+", type=float, default=[0.0, 15.0, 30.0, 60.0])
+    parser.add_argument("--interval-seconds", nargs="+", type=float, default=[3.0, 4.0, 5.0])
+    parser.add_argument("--selection-strategy", choices=["greedy", "dp"],
+                        help="Segment selection strategy (default: project option)")
+    parser.add_argument("--no-reuse", action="store_true",
+                        help="Use every movie segment at most once (dp only)")
+    parser.add_argument("--max-duration", type=float,
+                        help="Trim each configuration to this output duration in seconds (default: project option)")
+    parser.add_argument("--min-segment-length", type=float,
+                        help="Minimum segment length when trimming to max_duration (default: project option)")
+    parser.add_argument("--use-similarity-matrix", action="store_true",
+                        help="Derive candidates from the persisted similarity matrix")
+    parser.add_argument("--top-k", type=int, help="Candidates per window (similarity matrix only)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--sort-by", choices=METRIC_COLUMNS, default="coverage")
+    parser.add_argument("--format", choices=["table", "json"], default="table")
+    parser.add_argument("--output", type=Path, help="Write results to file instead of stdout")
+    
+    args = parser.parse_args()
+    
+    stage = TimelineStage(project_root=args.project_root)
+    
+    # Sweep options override project.json, exactly as tune_timeline.py does
+    fixed = {}
+    if args.selection_strategy is not None:
+        fixed["selection_strategy"] = args.selection_strategy
+    if args.no_reuse:
+        fixed["allow_segment_reuse"] = False
+    if args.max_duration is not None:
+        fixed["max_duration"] = args.max_duration
+    if args.min_segment_length is not None:
+        fixed["min_segment_length"] = args.min_segment_length
+    if args.use_similarity_matrix:
+        fixed["use_similarity_matrix"] = True
+    if args.top_k is not None:
+        fixed["candidate_top_k"] = args.top_k
+    
+    try:
+        # Fail early (ingest output missing) before starting workers
+        stage.load_ingest_output(args.project_id)
+        base_options = stage.resolve_options(stage.load_project_config(args.project_id) or None)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    # Gaps vary fastest, so consecutive configurations share the candidate table
+    configs = [
+        dict(fixed, similarity_threshold=threshold, interval_seconds=interval, copyright_min_gap=gap)
+        for threshold, interval, gap in itertools.product(
+            args.similarity_thresholds,
+            args.interval_seconds,
+            args.copyright_min_gaps
+        )
+    ]
+    
+    workers = max(1, min(args.workers or 1, len(configs)))
+    print(f"Evaluating {len(configs)} configurations with {workers} worker(s)...", file=sys.stderr)
+    
+    try:
+        with tempfile.TemporaryDirectory() as tmp, ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(args.project_root, args.project_id, base_options, tmp)
+        ) as executor:
+            chunksize = max(1, len(configs) // (workers * 4))
+            results = list(executor.map(evaluate_configuration, configs, chunksize=chunksize))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    results.sort(key=lambda r: r[args.sort_by], reverse=True)
+    
+    text = json.dumps(results, indent=2) if args.format == "json" else format_table(results)
+    if args.output:
+        args.output.write_text(text + "\n", encoding='utf-8')
+        print(f"Results saved to: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Test duration-budgeted selection against brute force on small inputs
+
+Durations are multiples of the knapsack resolution, so the discretized DP
+has to reach the brute-force optimum exactly, also through
+select_within_budget (which only falls back to greedy for budgets too
+large for the DP table). The greedy fallback has to stay within budget and
+reach at least half the optimum, priority tiers must never give up a
+higher-tier segment for a lower one, and matches that already fit the
+budget come back unchanged. The copyright-gap re-check after trimming has
+to drop the same matches as prevent_consecutive_segments.
+"""
+
+import argparse
+import itertools
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.budget import (
+    DEFAULT_RESOLUTION,
+    apply_duration_budget,
+    greedy_ratio_select,
+    knapsack_select,
+    select_within_budget
+)
+from src.core.filtering import prevent_consecutive_segments
+from src.core.matching import Match
+
+
+def brute_force(durations: np.ndarray, values: np.ndarray, budget: float) -> float:
+    """Best total value over every subset within the budget"""
+    best = 0.0
+    for size in range(1, len(durations) + 1):
+        for subset in itertools.combinations(range(len(durations)), size):
+            subset = list(subset)
+            if durations[subset].sum() <= budget + 1e-9:
+                best = max(best, float(values[subset].sum()))
+    return best
+
+
+def make_matches(durations: np.ndarray, values: np.ndarray) -> list:
+    """Matches spread over the movie (so the copyright gap never triggers)"""
+    return [
+        Match(
+            segment_id=f"seg_{i}",
+            start_time=i * 100.0,
+            end_time=i * 100.0 + float(duration),
+            similarity_score=float(value),
+            narration_text="",
+            narration_time=i * 4.0
+        )
+        for i, (duration, value) in enumerate(zip(durations.tolist(), values.tolist()))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare budgeted selection with brute force")
+    parser.add_argument("--instances", type=int, default=300, help="Random instances to check")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    
+    print("Testing duration-budgeted selection...")
+    print("=" * 60)
+    
+    failures = 0
+    for instance in range(args.instances):
+        n_items = int(rng.integers(1, 11))
+        values = rng.uniform(0.0, 1.0, size=n_items)
+        matches = make_matches(rng.integers(1, 80, size=n_items) * DEFAULT_RESOLUTION, values)
+        # Durations as apply_duration_budget sees them (end - start)
+        durations = np.asarray([m.end_time - m.start_time for m in matches])
+        budget = float(rng.integers(0, 300) * DEFAULT_RESOLUTION)
+        expected = brute_force(durations, values, budget)
+        
+        selected = knapsack_select(durations, values, budget)
+        if durations[selected].sum() > budget + 1e-9 or not np.isclose(values[selected].sum(), expected):
+            print(f"  [FAIL] instance {instance}: knapsack={values[selected].sum():.6f} brute force={expected:.6f}")
+            failures += 1
+        
+        selected = select_within_budget(durations, values, budget)
+        if durations[selected].sum() > budget + 1e-9 or not np.isclose(values[selected].sum(), expected):
+            print(f"  [FAIL] instance {instance}: budgeted selection is not optimal")
+            failures += 1
+        
+        selected = greedy_ratio_select(durations, values, budget)
+        if durations[selected].sum() > budget + 1e-9 or values[selected].sum() < expected / 2 - 1e-9:
+            print(f"  [FAIL] instance {instance}: greedy below half the optimum or over budget")
+            failures += 1
+        
+        # Within budget: unchanged, even with segments below min_segment_length
+        unchanged = apply_duration_budget(matches, float(durations.sum()), min_segment_length=5.0, min_time_gap=30.0)
+        if unchanged != matches:
+            print(f"  [FAIL] instance {instance}: matches within budget were trimmed")
+            failures += 1
+        
+        # Priority tiers: the highest tier gets the first pick of the budget
+        priorities = rng.integers(1, 4, size=n_items).tolist()
+        kept = apply_duration_budget(matches, budget, priorities=priorities)
+        kept_ids = {m.segment_id for m in kept}
+        top = [i for i, p in enumerate(priorities) if p == max(priorities)]
+        top_best = brute_force(durations[top], values[top], budget)
+        top_kept = sum(values[i] for i in top if f"seg_{i}" in kept_ids)
+        if sum(m.end_time - m.start_time for m in kept) > budget + 1e-9 or not np.isclose(top_kept, top_best):
+            print(f"  [FAIL] instance {instance}: priority trimming gave up top-tier value")
+            failures += 1
+        
+        # Copyright gap: segments 5 s apart in movie time, so the re-check drops some
+        packed = [replace(m, start_time=m.start_time / 20.0, end_time=m.end_time - m.start_time * 0.95) for m in matches]
+        trimmed = apply_duration_budget(packed, budget)
+        expected = prevent_consecutive_segments(trimmed, min_time_gap=30.0) if len(trimmed) < len(packed) else trimmed
+        if apply_duration_budget(packed, budget, min_time_gap=30.0) != expected:
+            print(f"  [FAIL] instance {instance}: copyright gap re-check differs from prevent_consecutive_segments")
+            failures += 1
+    
+    if failures:
+        print(f"\n[ERROR] {failures} check(s) failed over {args.instances} instances")
+        return False
+    
+    print(f"\n[OK] Budgeted selection matches brute force on {args.instances} instances")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
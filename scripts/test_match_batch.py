@@ -0,0 +1,136 @@
+"""Test the columnar MatchBatch filters against their Match-list versions
+
+Random matches (shared segment ids, coarse times and scores so that ties
+and touching segments occur) go through every list filter and its batch
+counterpart; converting the batch result back with to_matches() has to
+give the same matches in the same order.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.contracts.models.timeline import SpoilerRisk
+from src.core.filtering import (
+    apply_scene_weights,
+    filter_batch_by_priority,
+    filter_batch_by_spoiler_risk,
+    filter_by_priority,
+    filter_by_spoiler_risk,
+    merge_nearby_segments,
+    merge_nearby_segments_batch,
+    prevent_consecutive_segments,
+    prevent_consecutive_segments_batch,
+    scene_weight_column
+)
+from src.core.matching import (
+    Match,
+    MatchBatch,
+    filter_batch_by_similarity_threshold,
+    filter_by_similarity_threshold
+)
+
+
+def random_matches(rng: np.random.Generator, count: int) -> List[Match]:
+    """Matches on a coarse grid with segment ids shared between rows"""
+    n_segments = max(1, count // 2)
+    starts = rng.integers(0, 200, size=count) * 0.5
+    durations = rng.integers(1, 8, size=count) * 0.5
+    return [
+        Match(
+            segment_id=f"seg_{segment}",
+            start_time=float(start),
+            end_time=float(start + duration),
+            similarity_score=float(score),
+            narration_text=f"text {i}",
+            narration_time=float(narration_time),
+            narration_file_id=f"file_{i % 3}"
+        )
+        for i, (segment, start, duration, score, narration_time) in enumerate(zip(
+            rng.integers(0, n_segments, size=count).tolist(),
+            starts.tolist(),
+            durations.tolist(),
+            (rng.integers(0, 20, size=count) / 20.0).tolist(),
+            (rng.integers(0, 50, size=count) * 2.0).tolist()
+        ))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare MatchBatch filters with the Match-list filters")
+    parser.add_argument("--instances", type=int, default=300, help="Random instances to check")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    
+    print("Testing MatchBatch filters...")
+    print("=" * 60)
+    
+    failures = 0
+    for instance in range(args.instances):
+        matches = random_matches(rng, int(rng.integers(0, 60)))
+        batch = MatchBatch.from_matches(matches)
+        segment_ids = sorted({m.segment_id for m in matches})
+        # Tables cover a random subset of the segments
+        covered = [s for s in segment_ids if rng.random() < 0.6]
+        risks = {s: SpoilerRisk(risk=float(rng.integers(0, 11) / 10.0)) for s in covered}
+        weights = {s: float(rng.uniform(0.5, 2.0)) for s in covered}
+        priorities = {s: int(rng.integers(1, 11)) for s in covered}
+        
+        threshold = float(rng.integers(0, 20) / 20.0)
+        min_priority = int(rng.integers(1, 11))
+        merge_threshold = float(rng.choice([0.0, 0.5, 2.0, 5.0]))
+        min_time_gap = float(rng.choice([0.0, 5.0, 30.0]))
+        
+        checks = {
+            "to_matches": (matches, batch.to_matches()),
+            "similarity threshold": (
+                filter_by_similarity_threshold(matches, threshold),
+                filter_batch_by_similarity_threshold(batch, threshold).to_matches()
+            ),
+            "spoiler risk": (
+                filter_by_spoiler_risk(matches, risks, threshold),
+                filter_batch_by_spoiler_risk(batch, risks, threshold).to_matches()
+            ),
+            "scene weights": (
+                [m.weight for m in apply_scene_weights(matches, weights)],
+                scene_weight_column(batch, weights).tolist()
+            ),
+            "priority": (
+                [
+                    m.segment_id
+                    for m in filter_by_priority(apply_scene_weights(matches, {}, priorities), min_priority)
+                ],
+                filter_batch_by_priority(batch, priorities, min_priority).segment_id.tolist()
+            ),
+            "merge": (
+                merge_nearby_segments(matches, merge_threshold),
+                merge_nearby_segments_batch(batch, merge_threshold).to_matches()
+            ),
+            "copyright gap": (
+                prevent_consecutive_segments(matches, min_time_gap),
+                prevent_consecutive_segments_batch(batch, min_time_gap).to_matches()
+            )
+        }
+        for name, (expected, actual) in checks.items():
+            if actual != expected:
+                print(f"  [FAIL] instance {instance}: {name} differs")
+                failures += 1
+    
+    if failures:
+        print(f"\n[ERROR] {failures} check(s) failed over {args.instances} instances")
+        return False
+    
+    print(f"\n[OK] Batch filters match the list filters on {args.instances} instances")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,127 @@
+"""Test sweep-line overlap detection against the previous O(n^2) loops
+
+Random matches (coarse start times and durations, so equal starts, touching
+segments and exact threshold ratios occur) are checked with the reference
+nested loop that detect_overlaps and remove_severe_overlaps used before the
+sweep line: detect_overlaps has to return the same pairs in the same order,
+and remove_severe_overlaps the same matches. With shared segment ids the old
+code dropped every match with a removed id; the sweep only drops the
+matches that lost a pair, which is checked separately.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.matching import Match, detect_overlaps, remove_severe_overlaps
+
+
+def reference_detect_overlaps(matches: List[Match], overlap_threshold: float = 0.5) -> List[Tuple[Match, Match]]:
+    """detect_overlaps before the sweep line"""
+    overlaps = []
+    sorted_matches = sorted(matches, key=lambda m: m.start_time)
+    
+    for i, match1 in enumerate(sorted_matches):
+        for match2 in sorted_matches[i+1:]:
+            overlap_start = max(match1.start_time, match2.start_time)
+            overlap_end = min(match1.end_time, match2.end_time)
+            
+            if overlap_start < overlap_end:
+                overlap_duration = overlap_end - overlap_start
+                match1_duration = match1.end_time - match1.start_time
+                match2_duration = match2.end_time - match2.start_time
+                overlap_ratio = overlap_duration / min(match1_duration, match2_duration)
+                
+                if overlap_ratio >= overlap_threshold:
+                    overlaps.append((match1, match2))
+    
+    return overlaps
+
+
+def reference_remove_severe_overlaps(matches: List[Match], overlap_threshold: float = 0.7) -> List[Match]:
+    """remove_severe_overlaps before the sweep line (removes by segment_id)"""
+    to_remove_ids = set()
+    for match1, match2 in reference_detect_overlaps(matches, overlap_threshold):
+        if match1.similarity_score >= match2.similarity_score:
+            to_remove_ids.add(match2.segment_id)
+        else:
+            to_remove_ids.add(match1.segment_id)
+    return [m for m in matches if m.segment_id not in to_remove_ids]
+
+
+def random_matches(rng: np.random.Generator, count: int, distinct_ids: int) -> List[Match]:
+    """Matches on a 0.5 s grid drawing segment ids from distinct_ids values"""
+    starts = rng.integers(0, 60, size=count) * 0.5
+    durations = rng.integers(1, 12, size=count) * 0.5
+    # Coarse scores so that ties (kept: the earlier start) happen too
+    scores = rng.integers(0, 5, size=count) / 4.0
+    ids = rng.integers(0, distinct_ids, size=count)
+    return [
+        Match(
+            segment_id=f"seg_{segment_id}",
+            start_time=float(start),
+            end_time=float(start + duration),
+            similarity_score=float(score),
+            narration_text=""
+        )
+        for segment_id, start, duration, score in zip(ids.tolist(), starts, durations, scores)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sweep-line overlap detection with the O(n^2) reference")
+    parser.add_argument("--instances", type=int, default=300, help="Random instances to check")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    
+    print("Testing sweep-line overlap detection...")
+    print("=" * 60)
+    
+    failures = 0
+    for instance in range(args.instances):
+        count = int(rng.integers(0, 80))
+        threshold = float(rng.choice([0.0, 0.25, 0.5, 0.7, 1.0]))
+        
+        # Unique ids: identical behaviour to the reference
+        matches = random_matches(rng, count, distinct_ids=10 ** 9)
+        expected = [(id(a), id(b)) for a, b in reference_detect_overlaps(matches, threshold)]
+        actual = [(id(a), id(b)) for a, b in detect_overlaps(matches, threshold)]
+        if actual != expected:
+            print(f"  [FAIL] instance {instance}: detect_overlaps differs ({len(actual)} vs {len(expected)} pairs)")
+            failures += 1
+        
+        expected = [id(m) for m in reference_remove_severe_overlaps(matches, threshold)]
+        actual = [id(m) for m in remove_severe_overlaps(matches, threshold)]
+        if actual != expected:
+            print(f"  [FAIL] instance {instance}: remove_severe_overlaps differs")
+            failures += 1
+        
+        # Shared ids: only the matches that lost a pair are removed
+        matches = random_matches(rng, count, distinct_ids=max(1, count // 3))
+        losers = set()
+        for a, b in reference_detect_overlaps(matches, threshold):
+            losers.add(id(b) if a.similarity_score >= b.similarity_score else id(a))
+        expected = [id(m) for m in matches if id(m) not in losers]
+        actual = [id(m) for m in remove_severe_overlaps(matches, threshold)]
+        if actual != expected:
+            print(f"  [FAIL] instance {instance}: remove_severe_overlaps with shared ids removed the wrong matches")
+            failures += 1
+    
+    if failures:
+        print(f"\n[ERROR] {failures} check(s) failed over {args.instances} instances")
+        return False
+    
+    print(f"\n[OK] Sweep-line results match the reference on {args.instances} instances")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
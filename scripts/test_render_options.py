@@ -0,0 +1,67 @@
+"""Test up-front validation of the render options
+
+An unknown render_mode (e.g. the typo "paralel") has to stop run() and
+plan() with a StageExecutionError before any timeline, probe or ffmpeg
+work, instead of silently falling back to the single-graph render; also
+for proxy renders (preset "proxy"). Valid modes get past the check (and
+fail later on the missing timeline).
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.stages.base import StageExecutionError
+from src.stages.render import RENDER_MODES, RenderStage
+
+
+CASES = [
+    ({"render_mode": "paralel"}, True),
+    ({"render_mode": "Parallel"}, True),
+    ({"render_mode": None}, True),
+    # Proxy renders pick their strategy from render_mode too
+    ({"preset": "proxy", "render_mode": "paralel"}, True),
+    ({"preset": "proxy", "render_mode": "fats", "proxy_source": True}, True)
+] + [({"render_mode": mode}, False) for mode in RENDER_MODES] + [
+    ({"preset": "proxy", "render_mode": mode}, False) for mode in RENDER_MODES
+]
+
+
+def main():
+    print("Testing render option validation...")
+    print("=" * 60)
+    
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        # Empty project: no project.json, no timeline
+        stage = RenderStage(project_root=Path(tmp))
+        
+        for options, invalid in CASES:
+            for name, call in (("run", stage.run), ("plan", stage.plan)):
+                try:
+                    call("test_project", {"options": options})
+                    error = ""
+                except StageExecutionError as e:
+                    error = str(e)
+                except Exception as e:
+                    print(f"  [FAIL] {name} with {options}: {type(e).__name__}: {e}")
+                    failures += 1
+                    continue
+                
+                if invalid != error.startswith("Unknown render_mode"):
+                    print(f"  [FAIL] {name} with {options}: {error or 'no error'}")
+                    failures += 1
+    
+    if failures:
+        print(f"\n[ERROR] {failures} check(s) failed")
+        return False
+    
+    print(f"\n[OK] Unknown render modes are rejected up front ({len(CASES)} option sets)")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
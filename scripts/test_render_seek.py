@@ -0,0 +1,106 @@
+"""Test seek-based segment extraction against the trim-based render path
+
+Renders the same timeline over a synthetic test movie (ffmpeg testsrc, no
+external media needed) with per-segment seeking inputs and with trim
+filters, and checks that both outputs have the same number of frames.
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.adapters.ffmpeg_adapter import FFmpegAdapter
+from src.contracts.models.timeline import Timeline, Segment
+
+
+def make_test_media(ffmpeg_path: str, work_dir: Path, duration: float, fps: int) -> tuple:
+    """Create a synthetic movie (2 s GOP) and a narration tone"""
+    movie = work_dir / "movie.mp4"
+    narration = work_dir / "narration.m4a"
+    subprocess.run([
+        ffmpeg_path, "-v", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc=size=320x180:rate={fps}",
+        "-t", str(duration),
+        "-c:v", "libx264", "-preset", "ultrafast", "-g", str(2 * fps),
+        str(movie)
+    ], check=True)
+    subprocess.run([
+        ffmpeg_path, "-v", "error", "-y",
+        "-f", "lavfi", "-i", "sine=frequency=440",
+        "-t", str(duration),
+        "-c:a", "aac",
+        str(narration)
+    ], check=True)
+    return movie, narration
+
+
+def count_frames(ffmpeg_path: str, video: Path) -> int:
+    """Count video frames by decoding to the null muxer"""
+    result = subprocess.run(
+        [ffmpeg_path, "-hide_banner", "-i", str(video), "-map", "0:v:0", "-f", "null", "-"],
+        capture_output=True, text=True, check=True
+    )
+    frames = re.findall(r"frame=\s*(\d+)", result.stderr)
+    return int(frames[-1]) if frames else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare seek-based and trim-based render frame counts")
+    parser.add_argument("--ffmpeg-path", default="ffmpeg", help="Path to FFmpeg executable")
+    parser.add_argument("--duration", type=float, default=600.0, help="Test movie duration in seconds")
+    parser.add_argument("--fps", type=int, default=24, help="Test movie frame rate")
+    args = parser.parse_args()
+
+    adapter = FFmpegAdapter(ffmpeg_path=args.ffmpeg_path)
+    if not adapter.check_ffmpeg_available():
+        print("[SKIP] FFmpeg is not available")
+        return True
+
+    print("Testing seek-based segment extraction...")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        movie, narration = make_test_media(args.ffmpeg_path, work_dir, args.duration, args.fps)
+
+        # Off-keyframe boundaries, including segments late in the movie
+        late = args.duration - 10.0
+        segments = [
+            Segment(start=1.3, end=4.1),
+            Segment(start=12.05, end=15.5),
+            Segment(start=args.duration / 2 + 0.7, end=args.duration / 2 + 3.2),
+            Segment(start=late, end=late + 2.9)
+        ]
+
+        counts = {}
+        for name, seek in (("seek", True), ("trim", False)):
+            output = work_dir / f"{name}.mp4"
+            timeline = Timeline(
+                input=str(movie),
+                narration=str(narration),
+                output=str(output),
+                segments=segments
+            )
+            started = time.perf_counter()
+            adapter.cut_and_concat_video(timeline, overwrite=True, seek=seek)
+            elapsed = time.perf_counter() - started
+            counts[name] = count_frames(args.ffmpeg_path, output)
+            print(f"  {name}: {counts[name]} frames in {elapsed:.2f}s")
+
+    if counts["seek"] != counts["trim"]:
+        print(f"\n[ERROR] Frame counts differ: seek={counts['seek']} trim={counts['trim']}")
+        return False
+
+    print(f"\n[OK] Frame counts match ({counts['seek']} frames)")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
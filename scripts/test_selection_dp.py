@@ -0,0 +1,134 @@
+"""Test the DP segment selector against brute force on small random inputs
+
+Every interval gets 0-3 candidates with random movie centers and scores.
+Enumerating every pick-or-skip combination gives the best total score
+under the copyright gap; the DP selector has to reach it with a compliant
+selection. Selections without reuse have to reach the brute-force
+optimum among selections that use every segment at most once (and stay
+compliant when the search is cut short), and the ragged candidate table
+is checked against a plain Python grouping.
+"""
+
+import argparse
+import itertools
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.selection import build_candidate_table, select_candidates, select_without_reuse
+
+
+def random_instance(rng: np.random.Generator, max_intervals: int, max_candidates: int, movie_duration: float):
+    """Ragged candidates: (offsets, segment ids, centers, scores)"""
+    sizes = rng.integers(0, max_candidates + 1, size=rng.integers(1, max_intervals + 1))
+    offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+    n = int(offsets[-1])
+    # Few distinct segments so that reuse actually happens
+    segment_ids = rng.integers(0, max(1, n // 2), size=n)
+    centers = rng.uniform(0.0, movie_duration, size=max(1, n // 2))[segment_ids]
+    scores = rng.uniform(0.5, 1.0, size=n)
+    return offsets, segment_ids, centers, scores
+
+
+def is_compliant(slots, centers, min_time_gap: float) -> bool:
+    """Consecutive picks are at least min_time_gap apart"""
+    return all(
+        abs(centers[a] - centers[b]) >= min_time_gap
+        for a, b in zip(slots, slots[1:])
+    )
+
+
+def brute_force(offsets, centers, scores, min_time_gap: float, segment_ids=None) -> float:
+    """Best total score over every pick-or-skip combination
+    
+    With segment_ids, only combinations using every segment at most once count.
+    """
+    choices = [[None] + list(range(offsets[t], offsets[t + 1])) for t in range(len(offsets) - 1)]
+    best = 0.0
+    for combination in itertools.product(*choices):
+        slots = [slot for slot in combination if slot is not None]
+        if segment_ids is not None and len(set(segment_ids[slots].tolist())) < len(slots):
+            continue
+        if is_compliant(slots, centers, min_time_gap):
+            best = max(best, float(sum(scores[slots])))
+    return best
+
+
+def picked_slots(offsets, picks) -> list:
+    """Flat slot of every picked candidate"""
+    return [int(offsets[t] + j) for t, j in enumerate(picks.tolist()) if j >= 0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the DP selector with brute force")
+    parser.add_argument("--instances", type=int, default=500, help="Random instances to check")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    
+    print("Testing DP segment selection against brute force...")
+    print("=" * 60)
+    
+    failures = 0
+    for instance in range(args.instances):
+        offsets, segment_ids, centers, scores = random_instance(rng, 7, 3, 120.0)
+        min_time_gap = float(rng.choice([0.0, 10.0, 30.0, 60.0]))
+        
+        picks = select_candidates(segment_ids, offsets, centers, scores, min_time_gap, allow_reuse=True)
+        slots = picked_slots(offsets, picks)
+        total = float(sum(scores[slots]))
+        expected = brute_force(offsets, centers, scores, min_time_gap)
+        if not is_compliant(slots, centers, min_time_gap) or not np.isclose(total, expected):
+            print(f"  [FAIL] instance {instance}: dp={total:.6f} brute force={expected:.6f}")
+            failures += 1
+        
+        picks = select_candidates(segment_ids, offsets, centers, scores, min_time_gap, allow_reuse=False)
+        slots = picked_slots(offsets, picks)
+        used = segment_ids[slots].tolist()
+        total = float(sum(scores[slots]))
+        expected = brute_force(offsets, centers, scores, min_time_gap, segment_ids)
+        if not is_compliant(slots, centers, min_time_gap) or len(used) != len(set(used)):
+            print(f"  [FAIL] instance {instance}: no-reuse selection reuses a segment or breaks the gap")
+            failures += 1
+        elif not np.isclose(total, expected):
+            print(f"  [FAIL] instance {instance}: no-reuse dp={total:.6f} brute force={expected:.6f}")
+            failures += 1
+        
+        # A search cut short still returns a compliant reuse-free selection
+        picks = select_without_reuse(segment_ids, offsets, centers, scores, min_time_gap, max_solves=1)
+        slots = picked_slots(offsets, picks)
+        used = segment_ids[slots].tolist()
+        if not is_compliant(slots, centers, min_time_gap) or len(used) != len(set(used)):
+            print(f"  [FAIL] instance {instance}: truncated no-reuse search reuses a segment or breaks the gap")
+            failures += 1
+        
+        # Ragged table: every interval lists its entry's rows, best first
+        interval_entries = rng.integers(0, 5, size=len(offsets) - 1)
+        entry_indices = rng.integers(0, 5, size=len(scores))
+        keep = rng.random(len(scores)) > 0.2
+        table_offsets, rows = build_candidate_table(interval_entries, entry_indices, scores, keep=keep)
+        for t, entry in enumerate(interval_entries.tolist()):
+            expected_rows = sorted(
+                (row for row in range(len(scores)) if keep[row] and entry_indices[row] == entry),
+                key=lambda row: -scores[row]
+            )
+            if rows[table_offsets[t]:table_offsets[t + 1]].tolist() != expected_rows:
+                print(f"  [FAIL] instance {instance}: candidate table differs for interval {t}")
+                failures += 1
+                break
+    
+    if failures:
+        print(f"\n[ERROR] {failures} check(s) failed over {args.instances} instances")
+        return False
+    
+    print(f"\n[OK] DP selection matches brute force on {args.instances} instances")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,95 @@
+"""Test the staleness check of the persisted similarity matrix
+
+A matrix is only used for timeline candidates when index_output.json
+exists and its fingerprint and embedding model match the ones stored with
+the matrix. A missing index output, a missing fingerprint or any mismatch
+must make the timeline stage fall back to the search output.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.similarity_matrix import SimilarityMatrixWriter
+from src.stages.base import StageExecutionError
+from src.stages.timeline import TimelineStage
+
+
+PROJECT_ID = "test_project"
+FINGERPRINT = "index-fingerprint"
+MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def write_matrix(stage: TimelineStage) -> None:
+    """Persist a small dense matrix computed from FINGERPRINT and MODEL"""
+    writer = SimilarityMatrixWriter(
+        directory=stage.get_similarity_matrix_path(PROJECT_ID),
+        n_windows=2,
+        chunk_ids=["movie_000000", "movie_000001", "movie_000002"],
+        chunk_starts=[0.0, 10.0, 20.0],
+        chunk_ends=[5.0, 15.0, 25.0]
+    )
+    writer.write_rows(0, np.array([[0.9, 0.2, 0.1], [0.3, 0.8, 0.4]]))
+    writer.close(
+        [
+            {"narration_file_id": "narration", "chunk_index": i, "narration_time": i * 4.0, "narration_text": ""}
+            for i in range(2)
+        ],
+        manifest_extra={"index_fingerprint": FINGERPRINT, "embedding_model": MODEL}
+    )
+
+
+def main():
+    print("Testing similarity matrix staleness...")
+    print("=" * 60)
+    
+    cases = [
+        ("no index output", None, False),
+        ("index output without fingerprint", {"embedding_model": MODEL}, False),
+        ("other index", {"fingerprint": "other", "embedding_model": MODEL}, False),
+        ("other embedding model", {"fingerprint": FINGERPRINT, "embedding_model": "other"}, False),
+        ("current index", {"fingerprint": FINGERPRINT, "embedding_model": MODEL}, True)
+    ]
+    
+    failures = 0
+    for name, index_data, usable in cases:
+        with tempfile.TemporaryDirectory() as tmp:
+            stage = TimelineStage(project_root=Path(tmp))
+            write_matrix(stage)
+            if index_data is not None:
+                outputs_path = stage.get_outputs_path(PROJECT_ID)
+                outputs_path.mkdir(parents=True, exist_ok=True)
+                (outputs_path / "index_output.json").write_text(json.dumps(index_data), encoding='utf-8')
+            
+            matrix = stage.load_similarity_matrix(PROJECT_ID)
+            if (matrix is not None) != usable:
+                print(f"  [FAIL] {name}: matrix {'rejected' if usable else 'used'}")
+                failures += 1
+            
+            # Stale matrices fall back to the (here missing) search output
+            try:
+                candidates = list(stage.load_candidates(PROJECT_ID, {"use_similarity_matrix": True}))
+                fell_back = False
+            except StageExecutionError:
+                candidates = []
+                fell_back = True
+            if fell_back == usable or (usable and not candidates):
+                print(f"  [FAIL] {name}: candidates {'not ' if usable else ''}taken from the matrix")
+                failures += 1
+    
+    if failures:
+        print(f"\n[ERROR] {failures} check(s) failed")
+        return False
+    
+    print(f"\n[OK] Only a matrix of the current index is used ({len(cases)} cases)")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,99 @@
+"""Test keyframe snapping of segment boundaries
+
+Random segments on a coarse grid (so starts and ends land on or between
+keyframes and next to the end of the file) are snapped with
+snap_segments. Every start has to be a keyframe, every end a keyframe or
+the media duration, and no segment may be empty while the media has a
+second boundary. Segments the previous implementation snapped to a
+non-empty range have to come out unchanged. Also checks the segment at the
+end of the file that used to collapse (4.9-5.0 with keyframes 0 and 5).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.media_index import nearest_points, snap_segments
+
+
+def reference_snap(starts: np.ndarray, ends: np.ndarray, keyframes: np.ndarray, duration: float):
+    """snap_segments before the last-boundary fallback"""
+    if len(keyframes) == 0:
+        keyframes = np.zeros(1)
+    boundaries = np.unique(np.append(keyframes, duration))
+    
+    if len(keyframes) == 1:
+        snapped_starts = np.full(len(starts), keyframes[0])
+    else:
+        snapped_starts = nearest_points(keyframes, starts)
+    if len(boundaries) == 1:
+        snapped_ends = np.full(len(ends), boundaries[0])
+    else:
+        snapped_ends = nearest_points(boundaries, ends)
+    
+    next_boundary = boundaries[np.minimum(
+        np.searchsorted(boundaries, snapped_starts, side='right'), len(boundaries) - 1
+    )]
+    snapped_ends = np.where(snapped_ends <= snapped_starts, next_boundary, snapped_ends)
+    return snapped_starts, snapped_ends
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check keyframe snapping of segment boundaries")
+    parser.add_argument("--instances", type=int, default=500, help="Random instances to check")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    
+    print("Testing keyframe snapping...")
+    print("=" * 60)
+    
+    failures = 0
+    
+    report = snap_segments([4.9], [5.0], np.array([0.0, 5.0]), 5.0)
+    if report.starts.tolist() != [0.0] or report.ends.tolist() != [5.0]:
+        print(f"  [FAIL] segment at the end of the file: {report.starts.tolist()}-{report.ends.tolist()}")
+        failures += 1
+    
+    for instance in range(args.instances):
+        duration = float(rng.integers(1, 40))
+        keyframes = np.unique(rng.integers(0, int(duration) + 1, size=int(rng.integers(1, 8))).astype(np.float64))
+        count = int(rng.integers(1, 30))
+        starts = rng.integers(0, int(duration * 10) + 1, size=count) / 10.0
+        ends = np.minimum(starts + rng.integers(0, 60, size=count) / 10.0, duration)
+        
+        report = snap_segments(starts, ends, keyframes, duration)
+        boundaries = np.unique(np.append(keyframes, duration))
+        
+        if not np.isin(report.starts, keyframes).all() or not np.isin(report.ends, boundaries).all():
+            print(f"  [FAIL] instance {instance}: boundary not snapped to a keyframe or the end")
+            failures += 1
+        if len(boundaries) > 1 and (report.ends <= report.starts).any():
+            print(f"  [FAIL] instance {instance}: empty segment")
+            failures += 1
+        
+        expected_starts, expected_ends = reference_snap(starts, ends, keyframes, duration)
+        kept = expected_ends > expected_starts
+        if (
+            not np.array_equal(report.starts[kept], expected_starts[kept])
+            or not np.array_equal(report.ends[kept], expected_ends[kept])
+        ):
+            print(f"  [FAIL] instance {instance}: non-empty segments snapped differently")
+            failures += 1
+    
+    if failures:
+        print(f"\n[ERROR] {failures} check(s) failed over {args.instances} instances")
+        return False
+    
+    print(f"\n[OK] Snapped segments are keyframe-aligned and non-empty on {args.instances} instances")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
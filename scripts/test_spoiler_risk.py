@@ -0,0 +1,93 @@
+"""Test spoiler-risk scoring on everyday dialogue
+
+Common lines that are no spoilers (including words such as "finally",
+"secret", "dead" or "goodbye") must not hit the lexicon and must score
+below the default spoiler_risk_threshold outside the final act. A single
+lexicon hit on its own also has to stay below it, while real spoiler
+lines late in the movie have to reach it.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.spoiler import lexicon_hits, score_spoiler_risk
+
+
+ORDINARY_LINES = [
+    "Finally, someone who gets it.",
+    "Can you keep a secret?",
+    "Goodbye, see you tomorrow.",
+    "My phone is dead, can I borrow yours?",
+    "This traffic is going to be the death of me.",
+    "Just tell me the truth.",
+    "I think we're being set up for a sales pitch.",
+    "Last time I checked, you were late.",
+    "They lived happily in that little house.",
+    "I could kill for a coffee right now.",
+    "Farewell party is at eight.",
+    "It's over there, next to the door.",
+    "We did it! We finished the puzzle.",
+    "Your father called, he wants his car back.",
+    "One last thing before you go.",
+    "The end of the street is closed.",
+    "The battery died on the way here."
+]
+
+SPOILER_LINES = [
+    "It was you all along. You've been lying to me the whole time.",
+    "He's dead. They killed him at the docks.",
+    "It's finally over. The war is over."
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check spoiler-risk scores of everyday dialogue")
+    parser.add_argument("--threshold", type=float, default=0.3, help="Spoiler risk threshold")
+    parser.add_argument("--duration", type=float, default=6000.0, help="Movie duration in seconds")
+    args = parser.parse_args()
+    
+    print("Testing spoiler-risk scoring...")
+    print("=" * 60)
+    
+    failures = 0
+    
+    hits = lexicon_hits(ORDINARY_LINES)
+    for text, row in zip(ORDINARY_LINES, hits):
+        if row.any():
+            print(f"  [FAIL] lexicon hit on ordinary line: {text!r}")
+            failures += 1
+    
+    # Spread over the movie before the final act
+    times = [args.duration * 0.7 * i / len(ORDINARY_LINES) for i in range(len(ORDINARY_LINES))]
+    scores = score_spoiler_risk(ORDINARY_LINES, times, args.duration)
+    for text, risk in zip(ORDINARY_LINES, scores.risk.tolist()):
+        if risk >= args.threshold:
+            print(f"  [FAIL] ordinary line scored {risk:.3f}: {text!r}")
+            failures += 1
+    
+    single = score_spoiler_risk(["Rest in peace, old friend."], [0.0], args.duration)
+    if single.risk[0] >= args.threshold:
+        print(f"  [FAIL] a single lexicon hit scored {single.risk[0]:.3f}")
+        failures += 1
+    
+    late = [args.duration * 0.95] * len(SPOILER_LINES)
+    scores = score_spoiler_risk(SPOILER_LINES, late, args.duration)
+    for text, risk in zip(SPOILER_LINES, scores.risk.tolist()):
+        if risk < args.threshold:
+            print(f"  [FAIL] spoiler line scored {risk:.3f}: {text!r}")
+            failures += 1
+    
+    if failures:
+        print(f"\n[ERROR] {failures} check(s) failed")
+        return False
+    
+    print(f"\n[OK] {len(ORDINARY_LINES)} ordinary lines stay below {args.threshold}, spoiler lines reach it")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
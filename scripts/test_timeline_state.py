@@ -0,0 +1,147 @@
+"""Test incremental timeline selection against a full recompute
+
+Runs the timeline stage's DP selection over random candidates through a
+sequence of option changes (threshold, interval length, copyright gap,
+reuse, scene weights), once with a persisted TimelineState that is reused
+between runs and once with a fresh state every run. Each run has to
+select the same matches. Also checks the candidate layer round trip and
+that an interrupted save leaves no layer key pointing at other data.
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.core.timeline_state as timeline_state
+from src.core.interval_index import IntervalIndex
+from src.core.matching import MatchBatch
+from src.core.timeline_state import TimelineState
+from src.stages.timeline import TimelineStage
+from src.utils.fingerprint import fingerprint_values
+
+
+def random_candidates(rng: np.random.Generator, n_entries: int, n_matches: int):
+    """Narration entries and a candidate batch with shared segment ids"""
+    durations = rng.uniform(2.0, 12.0, size=n_entries)
+    ends = np.cumsum(durations + rng.uniform(0.0, 2.0, size=n_entries))
+    entry_index = IntervalIndex(ends - durations, ends)
+    entry_indices = rng.integers(0, n_entries, size=n_matches)
+    segments = rng.integers(0, max(1, n_matches // 3), size=n_matches)
+    starts = rng.uniform(0.0, 3600.0, size=max(1, n_matches // 3))[segments]
+    batch = MatchBatch(
+        segment_id=np.array([f"seg_{s}" for s in segments.tolist()], dtype=object),
+        start_time=starts,
+        end_time=starts + 3.0,
+        similarity_score=rng.uniform(0.5, 1.0, size=n_matches),
+        narration_time=entry_index.starts[entry_indices] + 0.5,
+        narration_text=np.array([f"entry {e}" for e in entry_indices.tolist()], dtype=object),
+        narration_file_id=np.array(["narration"] * n_matches, dtype=object),
+        chunk_id=segments.astype(np.int32)
+    )
+    return entry_index, batch, entry_indices
+
+
+def select(stage: TimelineStage, state: TimelineState, inputs, weights: np.ndarray, opts: dict) -> list:
+    """Run the stage's DP selection and return the picked matches"""
+    entry_index, batch, entry_indices = inputs
+    keep = batch.similarity_score >= opts["similarity_threshold"]
+    selection = stage.select_dp(
+        state, "inputs", fingerprint_values(weights.tolist()),
+        entry_index, batch, entry_indices, batch.similarity_score * weights, keep, opts
+    )
+    return [(m.segment_id, m.start_time, m.narration_time) for m in selection.matches]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare incremental timeline selection with a full recompute")
+    parser.add_argument("--instances", type=int, default=20, help="Random instances to check")
+    parser.add_argument("--steps", type=int, default=15, help="Option changes per instance")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    
+    print("Testing incremental timeline state...")
+    print("=" * 60)
+    
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        stage = TimelineStage(project_root=work_dir)
+        
+        for instance in range(args.instances):
+            inputs = random_candidates(rng, int(rng.integers(1, 80)), int(rng.integers(0, 600)))
+            entry_index, batch, entry_indices = inputs
+            state_dir = work_dir / f"state_{instance}"
+            
+            # Candidate layer round trip
+            TimelineState(state_dir).save_candidates("inputs", entry_index, batch, entry_indices)
+            loaded_index, loaded, loaded_entries = TimelineState(state_dir).load_candidates("inputs")
+            if (
+                loaded.to_matches() != batch.to_matches()
+                or not np.array_equal(loaded_entries, entry_indices)
+                or not np.array_equal(loaded_index.starts, entry_index.starts)
+            ):
+                print(f"  [FAIL] instance {instance}: candidate layer round trip differs")
+                failures += 1
+            
+            opts = {
+                "similarity_threshold": 0.7,
+                "interval_seconds": 4.0,
+                "copyright_min_gap": 30.0,
+                "allow_segment_reuse": True
+            }
+            weights = np.ones(len(batch))
+            for step in range(args.steps):
+                # Change one option (or nothing) per step
+                change = rng.integers(0, 6)
+                if change == 0:
+                    opts["similarity_threshold"] = float(rng.choice([0.6, 0.7, 0.8]))
+                elif change == 1:
+                    opts["interval_seconds"] = float(rng.choice([3.0, 4.0, 5.0]))
+                elif change == 2:
+                    opts["copyright_min_gap"] = float(rng.choice([0.0, 15.0, 30.0]))
+                elif change == 3:
+                    opts["allow_segment_reuse"] = not opts["allow_segment_reuse"]
+                elif change == 4:
+                    weights = rng.choice([0.5, 1.0, 1.5], size=len(batch))
+                
+                # Reopen the persisted state, as a re-run of the stage does
+                incremental = select(stage, TimelineState(state_dir), inputs, weights, opts)
+                fresh_dir = work_dir / f"fresh_{instance}_{step}"
+                full = select(stage, TimelineState(fresh_dir), inputs, weights, opts)
+                if incremental != full:
+                    print(f"  [FAIL] instance {instance} step {step}: reused state selects differently ({opts})")
+                    failures += 1
+        
+        # An interrupted save must not leave a key pointing at other data
+        state = TimelineState(work_dir / "state_0")
+        table_key = state.manifest.get("table_key")
+        with mock.patch.object(timeline_state, "_write_npz", side_effect=OSError("disk full")):
+            try:
+                state.save_selection("other", np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int64),
+                                     "other", np.empty(0, dtype=np.int64))
+            except OSError:
+                pass
+        reopened = TimelineState(work_dir / "state_0")
+        if reopened.load_table(table_key) is not None or reopened.load_table("other") is not None:
+            print("  [FAIL] interrupted save left a table key in the manifest")
+            failures += 1
+    
+    if failures:
+        print(f"\n[ERROR] {failures} check(s) failed")
+        return False
+    
+    print(f"\n[OK] Reused timeline state matches a full recompute on {args.instances} instances")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,67 @@
+"""CLI script for re-tuning a timeline from the persisted similarity matrix
+
+Re-derives candidates under new parameters without loading the embedding
+model or ChromaDB. Requires a search run with the "similarity_matrix"
+project option enabled.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.stages.timeline import TimelineStage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-tune timeline from the persisted similarity matrix")
+    parser.add_argument("--project-id", required=True, help="Project identifier")
+    parser.add_argument("--project-root", type=Path, help="Project root directory")
+    parser.add_argument("--similarity-threshold", type=float, help="Minimum similarity score")
+    parser.add_argument("--copyright-min-gap", type=float, help="Minimum movie-time gap between consecutive segments")
+    parser.add_argument("--interval-seconds", type=float, help="Narration interval length in seconds")
+    parser.add_argument("--top-k", type=int, help="Candidates per narration window")
+    parser.add_argument("--selection-strategy", choices=["greedy", "dp"], help="Segment selection strategy")
+    
+    args = parser.parse_args()
+    
+    stage = TimelineStage(project_root=args.project_root)
+    
+    matrix = stage.load_similarity_matrix(args.project_id)
+    if matrix is None:
+        print(
+            "Error: no similarity matrix matching the current index. "
+            "Set options.similarity_matrix in project.json and re-run the search stage.",
+            file=sys.stderr
+        )
+        sys.exit(1)
+    
+    overrides = {"use_similarity_matrix": True}
+    if args.similarity_threshold is not None:
+        overrides["similarity_threshold"] = args.similarity_threshold
+    if args.copyright_min_gap is not None:
+        overrides["copyright_min_gap"] = args.copyright_min_gap
+    if args.interval_seconds is not None:
+        overrides["interval_seconds"] = args.interval_seconds
+    if args.selection_strategy is not None:
+        overrides["selection_strategy"] = args.selection_strategy
+    if args.top_k is not None:
+        if args.top_k > matrix.max_k:
+            print(f"Warning: top-k limited to {matrix.max_k} by the stored matrix")
+        overrides["candidate_top_k"] = args.top_k
+    
+    try:
+        print(f"Re-tuning timeline for project {args.project_id} ({matrix.kind} matrix, {matrix.scores.shape[0]} windows)...")
+        result = stage.run(args.project_id, config={"options": overrides})
+        output_path = stage.save_output(args.project_id, result)
+        print(f"[OK] Timeline re-tuned: {len(result['segments'])} segments")
+        print(f"  Output: {output_path}")
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -84,7 +84,24 @@ class ChromaDBAdapter:
             where=where
         )
         return results
-    
+
+    def get_all(
+        self,
+        collection_name: str,
+        include: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Get all records of a collection
+
+        Args:
+            collection_name: Name of the collection
+            include: Fields to include (default: embeddings and metadatas)
+
+        Returns:
+            Dictionary with ids and the requested fields
+        """
+        collection = self.get_or_create_collection(collection_name)
+        return collection.get(include=include or ["embeddings", "metadatas"])
+
     def delete_collection(self, collection_name: str) -> None:
         """Delete a collection
         
@@ -0,0 +1,169 @@
+"""Content-addressed cache of rendered segment clips"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+
+class ClipCache:
+    """Directory of encoded segment clips with an SQLite LRU index
+    
+    Clips are keyed by (input file content hash, start, end, encoder
+    settings), so a clip is only reused for the same frames of the same
+    movie encoded the same way. Clip files live next to the index; once
+    their total size exceeds max_bytes, the least recently used clips are
+    deleted.
+    """
+    
+    def __init__(self, directory: Path, max_bytes: int = 20 * 1024 ** 3):
+        """Initialize cache
+        
+        Args:
+            directory: Cache directory (clips and index.sqlite)
+            max_bytes: Disk budget for cached clips in bytes
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        directory.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(directory / "index.sqlite"))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS clips ("
+            "key TEXT PRIMARY KEY, "
+            "size INTEGER NOT NULL, "
+            "last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_clips_last_access ON clips (last_access)"
+        )
+        self._conn.commit()
+        self._entries, self._bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM clips"
+        ).fetchone()
+    
+    def __enter__(self) -> "ClipCache":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+    
+    def make_key(
+        self,
+        input_hash: str,
+        start: float,
+        end: float,
+        encoder_settings: Sequence[str]
+    ) -> str:
+        """Build cache key for a segment clip
+        
+        Args:
+            input_hash: Content hash of the input video
+            start: Segment start time in seconds
+            end: Segment end time in seconds
+            encoder_settings: Encoder arguments the clip is rendered with
+        
+        Returns:
+            Cache key
+        """
+        settings_key = json.dumps(list(encoder_settings))
+        return hashlib.sha256(
+            f"{input_hash}|{start:.6f}|{end:.6f}|{settings_key}".encode('utf-8')
+        ).hexdigest()
+    
+    def clip_path(self, key: str) -> Path:
+        """Path of the clip file for a key (whether cached or not)"""
+        return self.directory / key[:2] / f"{key}.mp4"
+    
+    def get(self, key: str) -> Optional[Path]:
+        """Get cached clip
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Path to the clip, or None on miss
+        """
+        row = self._conn.execute("SELECT size FROM clips WHERE key = ?", (key,)).fetchone()
+        path = self.clip_path(key)
+        
+        if row is not None and not path.exists():
+            # Clip deleted behind the cache's back
+            self._remove(key, row[0])
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        self._conn.execute("UPDATE clips SET last_access = ? WHERE key = ?", (time.time(), key))
+        return path
+    
+    def put(self, key: str) -> None:
+        """Register the clip written to clip_path(key)
+        
+        Eviction is left to evict(), so clips of a render in progress are
+        not deleted before they are concatenated.
+        
+        Args:
+            key: Cache key
+        """
+        size = self.clip_path(key).stat().st_size
+        row = self._conn.execute("SELECT size FROM clips WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._bytes -= row[0]
+            self._entries -= 1
+        self._conn.execute(
+            "INSERT OR REPLACE INTO clips (key, size, last_access) VALUES (?, ?, ?)",
+            (key, size, time.time())
+        )
+        self._bytes += size
+        self._entries += 1
+    
+    def evict(self) -> None:
+        """Delete least recently used clips until the cache fits max_bytes"""
+        while self._bytes > self.max_bytes and self._entries:
+            rows = self._conn.execute(
+                "SELECT key, size FROM clips ORDER BY last_access ASC LIMIT 100"
+            ).fetchall()
+            for key, size in rows:
+                if self._bytes <= self.max_bytes:
+                    break
+                self.clip_path(key).unlink(missing_ok=True)
+                self._remove(key, size)
+                self.evictions += 1
+        self._conn.commit()
+    
+    def _remove(self, key: str, size: int) -> None:
+        self._conn.execute("DELETE FROM clips WHERE key = ?", (key,))
+        self._bytes -= size
+        self._entries -= 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get reuse statistics for this session
+        
+        Returns:
+            Dictionary with hits, misses, hit_rate (clip reuse rate),
+            evictions, entries and bytes
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": self._entries,
+            "bytes": self._bytes
+        }
+    
+    def close(self) -> None:
+        """Commit pending writes and close the database"""
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
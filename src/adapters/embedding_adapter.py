@@ -84,6 +84,7 @@ class EmbeddingAdapter:
                     indices_to_embed.append(i)
             
             # Embed texts not in cache
+            new_embeddings = []
             if texts_to_embed:
                 model = self._load_model()
                 new_embeddings = model.encode(texts_to_embed, convert_to_numpy=True).tolist()
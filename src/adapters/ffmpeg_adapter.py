@@ -1,80 +1,832 @@
 """FFmpeg adapter for video processing operations"""
 
+import json
+import os
 import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from src.adapters.clip_cache import ClipCache
+from src.adapters.ffmpeg_process import FFmpegProgress, RingLog, run_ffmpeg
+from src.contracts.models.project import OutputVariant
 from src.contracts.models.timeline import Timeline, Segment
 
 
+AUDIO_ENCODE_ARGS = ["-c:a", "aac"]
+
+# Bump when render_clip changes how frames are selected or encoded
+CLIP_FORMAT_VERSION = "1"
+
+# Segments per filter graph; longer timelines are rendered in groups
+DEFAULT_GROUP_SIZE = 16
+
+
+@dataclass(frozen=True)
+class VideoSettings:
+    """Video encoder settings, shared by every render path so parallel
+    clips match the single-graph output"""
+    preset: str = "veryfast"
+    crf: int = 18
+    max_height: Optional[int] = None    # Downscale taller video (keeps aspect ratio)
+    fps: Optional[float] = None         # Output frame rate (None = source rate)
+    
+    def encode_args(self) -> List[str]:
+        """Encoder arguments"""
+        return ["-c:v", "libx264", "-preset", self.preset, "-crf", str(self.crf)]
+    
+    def filters(self) -> List[str]:
+        """Filters applied to every segment right after the cut"""
+        filters = []
+        if self.max_height:
+            filters.append(f"scale=-2:'min({self.max_height},ih)'")
+        if self.fps:
+            filters.append(f"fps={self.fps:g}")
+        return filters
+    
+    def segment_chain(self, trim: str) -> str:
+        """Per-segment graph chain: cut, downscale, reset timestamps, rate
+        
+        The frame rate filter goes after setpts, which would otherwise
+        drop the rate it sets.
+        """
+        chain = [trim]
+        if self.max_height:
+            chain.append(f"scale=-2:'min({self.max_height},ih)'")
+        chain.append("setpts=PTS-STARTPTS")
+        if self.fps:
+            chain.append(f"fps={self.fps:g}")
+        return ",".join(chain)
+
+
+DEFAULT_VIDEO_SETTINGS = VideoSettings()
+# Low-resolution editorial proxies
+PROXY_VIDEO_SETTINGS = VideoSettings(preset="ultrafast", crf=30, max_height=360)
+
+
 class FFmpegAdapter:
     """Adapter for FFmpeg operations"""
     
-    def __init__(self, ffmpeg_path: Optional[str] = None):
+    def __init__(
+        self,
+        ffmpeg_path: Optional[str] = None,
+        ffprobe_path: Optional[str] = None,
+        progress_callback: Optional[Callable[[FFmpegProgress], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        deadline: Optional[float] = None,
+        log: Optional[RingLog] = None
+    ):
         """Initialize FFmpeg adapter
         
+        Every ffmpeg process the adapter starts reports progress to
+        progress_callback (called from the rendering threads), writes its
+        stderr to log, and is stopped when cancel_event is set or the
+        deadline passes.
+        
         Args:
             ffmpeg_path: Path to FFmpeg executable (default: system PATH)
+            ffprobe_path: Path to ffprobe executable (default: next to
+                ffmpeg_path, else system PATH)
+            progress_callback: Called with every FFmpegProgress event
+            cancel_event: Stops running and pending processes when set
+            deadline: time.monotonic() value at which rendering is stopped
+            log: Bounded log receiving ffmpeg's stderr
         """
         self.ffmpeg_path = ffmpeg_path or "ffmpeg"
+        self.ffprobe_path = ffprobe_path or self._default_ffprobe_path(ffmpeg_path)
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.deadline = deadline
+        self.log = log
+    
+    @staticmethod
+    def _default_ffprobe_path(ffmpeg_path: Optional[str]) -> str:
+        if ffmpeg_path:
+            ffmpeg = Path(ffmpeg_path)
+            sibling = ffmpeg.with_name(ffmpeg.name.replace("ffmpeg", "ffprobe"))
+            if sibling != ffmpeg and sibling.exists():
+                return str(sibling)
+        return "ffprobe"
     
     def cut_and_concat_video(
         self,
         timeline: Timeline,
-        overwrite: bool = True
+        overwrite: bool = True,
+        seek: bool = True,
+        video: VideoSettings = DEFAULT_VIDEO_SETTINGS,
+        variants: Sequence[Tuple[OutputVariant, str]] = (),
+        group_size: int = DEFAULT_GROUP_SIZE
     ) -> None:
         """Cut and concatenate video segments with narration
         
+        With seek (default) every segment is opened as its own input with
+        input-side -ss/-t, so ffmpeg seeks to the keyframe before the
+        segment and decodes only from there; frames before the start are
+        decoded and dropped, which keeps the cut frame-accurate and selects
+        the same frames as the trim path. The trim path instead decodes the
+        movie from the beginning up to each segment.
+        
+        The filter graph is passed as a -filter_complex_script file, so its
+        size is not limited by the command line. Timelines with more than
+        group_size segments are rendered in groups of group_size segments,
+        one group at a time (video only), and the group files are joined
+        with the concat demuxer using stream copy while the narration is
+        muxed in. Every ffmpeg process therefore holds at most group_size
+        decoders, whatever the timeline length.
+        
         Args:
             timeline: Timeline object with segments
             overwrite: Whether to overwrite existing output file
+            seek: Use per-segment seeking inputs instead of trim filters
+            video: Encoder settings and per-segment filters (e.g. proxy
+                downscaling, applied before the concat)
+            variants: Additional (variant, output path) pairs; the cut
+                segments are decoded once and split between all outputs
+                (grouped renders derive them from the assembled master)
+            group_size: Maximum segments per filter graph
         """
-        input_file = timeline.input
-        narration_file = timeline.narration
-        output_file = timeline.output
+        if not timeline.segments:
+            raise ValueError("Timeline has no segments to render")
+        
+        output_dir = Path(timeline.output).parent
+        output_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix="render_", dir=output_dir) as tmp_dir:
+            work_dir = Path(tmp_dir)
+            if len(timeline.segments) <= group_size:
+                self._render_graph(timeline, work_dir / "graph.txt", overwrite, seek, video, variants)
+            else:
+                self._render_groups(timeline, work_dir, group_size, overwrite, seek, video, variants)
+    
+    def _render_graph(
+        self,
+        timeline: Timeline,
+        script_path: Path,
+        overwrite: bool,
+        seek: bool,
+        video: VideoSettings,
+        variants: Sequence[Tuple[OutputVariant, str]]
+    ) -> None:
+        """Render the whole timeline with one filter graph"""
         segments = timeline.segments
+        input_args, filter_complex = self.build_segment_graph(timeline.input, segments, seek, video)
+        narration_input = input_args.count("-i")
+        
+        labels = ["[outv]"]
+        if variants:
+            split_graph, labels = self.build_variant_split("[outv]", [variant for variant, _ in variants])
+            filter_complex += ";" + split_graph
+        self.write_filter_script(filter_complex, script_path)
+        
+        # Build FFmpeg command
+        cmd = [
+            self.ffmpeg_path,
+            "-y" if overwrite else "-n",
+            *input_args,
+            "-i", str(timeline.narration),
+            "-filter_complex_script", str(script_path),
+            "-map", labels[0],
+            "-map", f"{narration_input}:a:0",
+            *video.encode_args(),
+            *AUDIO_ENCODE_ARGS,
+            "-shortest",
+            "-movflags", "+faststart",
+            str(timeline.output)
+        ]
+        for (variant, variant_file), label in zip(variants, labels[1:]):
+            cmd += [
+                "-map", label,
+                "-map", f"{narration_input}:a:0",
+                *self.variant_encode_args(variant, video),
+                *AUDIO_ENCODE_ARGS,
+                "-shortest",
+                *self.container_args(variant.container),
+                str(variant_file)
+            ]
+        
+        self._run(cmd, "render", sum(seg.end - seg.start for seg in segments))
+    
+    def _render_groups(
+        self,
+        timeline: Timeline,
+        work_dir: Path,
+        group_size: int,
+        overwrite: bool,
+        seek: bool,
+        video: VideoSettings,
+        variants: Sequence[Tuple[OutputVariant, str]]
+    ) -> None:
+        """Render the timeline in groups of segments and join the groups"""
+        group_paths = []
+        for first in range(0, len(timeline.segments), group_size):
+            group = timeline.segments[first:first + group_size]
+            group_path = work_dir / f"group_{first // group_size:06d}.mp4"
+            self.render_group(
+                timeline.input,
+                group,
+                group_path,
+                group_path.with_suffix(".txt"),
+                seek=seek,
+                video=video
+            )
+            group_paths.append(group_path)
+        
+        self.concat_clips(
+            group_paths,
+            timeline.narration,
+            timeline.output,
+            work_dir / "concat.txt",
+            overwrite=overwrite
+        )
+        self.transcode_variants(timeline.output, variants, video=video, overwrite=overwrite)
+    
+    def render_group(
+        self,
+        input_file: str,
+        segments: Sequence[Segment],
+        output_file: Path,
+        script_path: Path,
+        seek: bool = True,
+        video: VideoSettings = DEFAULT_VIDEO_SETTINGS
+    ) -> None:
+        """Cut and concatenate some segments into a video-only file
+        
+        Args:
+            input_file: Source video
+            segments: Segments of the group
+            output_file: Group video path (overwritten)
+            script_path: Path for the filter graph script
+            seek: Use per-segment seeking inputs instead of trim filters
+            video: Encoder settings and per-segment filters
+        """
+        input_args, filter_complex = self.build_segment_graph(input_file, segments, seek, video)
+        self.write_filter_script(filter_complex, script_path)
+        
+        cmd = [
+            self.ffmpeg_path,
+            "-y",
+            *input_args,
+            "-filter_complex_script", str(script_path),
+            "-map", "[outv]",
+            "-an",
+            # Keep the source timestamps (no CFR resampling) so group
+            # durations add up exactly when the groups are joined
+            "-fps_mode", "passthrough",
+            *video.encode_args(),
+            str(output_file)
+        ]
         
-        # Build filter complex for trimming and concatenation
+        self._run(cmd, f"group {Path(output_file).stem}", sum(seg.end - seg.start for seg in segments))
+    
+    def build_segment_graph(
+        self,
+        input_file: str,
+        segments: Sequence[Segment],
+        seek: bool = True,
+        video: VideoSettings = DEFAULT_VIDEO_SETTINGS
+    ) -> Tuple[List[str], str]:
+        """Inputs and filter graph concatenating segments to [outv]"""
+        if seek:
+            return self.build_seek_graph(input_file, segments, video)
+        return ["-i", str(input_file)], self.build_trim_graph(segments, video)
+    
+    @staticmethod
+    def write_filter_script(filter_complex: str, script_path: Path) -> None:
+        """Write a filter graph for -filter_complex_script (one chain per line)"""
+        with open(script_path, 'w', encoding='utf-8') as f:
+            f.write(filter_complex.replace(";", ";\n"))
+    
+    def transcode_variants(
+        self,
+        master_file: str,
+        variants: Sequence[Tuple[OutputVariant, str]],
+        video: VideoSettings = DEFAULT_VIDEO_SETTINGS,
+        overwrite: bool = True
+    ) -> None:
+        """Derive variants from a rendered master in one decode pass
+        
+        Used after renders that assemble the master by stream copy
+        (parallel clips); the master's audio is copied.
+        
+        Args:
+            master_file: Rendered master video
+            variants: (variant, output path) pairs
+            video: Encoder settings (preset and quality)
+            overwrite: Whether to overwrite existing output files
+        """
+        if not variants:
+            return
+        split_graph, labels = self.build_variant_split("[0:v]", [variant for variant, _ in variants], master=False)
+        
+        cmd = [
+            self.ffmpeg_path,
+            "-y" if overwrite else "-n",
+            "-i", str(master_file),
+            "-filter_complex", split_graph
+        ]
+        for (variant, variant_file), label in zip(variants, labels):
+            cmd += [
+                "-map", label,
+                "-map", "0:a:0",
+                *self.variant_encode_args(variant, video),
+                "-c:a", "copy",
+                *self.container_args(variant.container),
+                str(variant_file)
+            ]
+        
+        self._run(cmd, "variants")
+    
+    def build_variant_split(
+        self,
+        source_label: str,
+        variants: Sequence[OutputVariant],
+        master: bool = True
+    ) -> Tuple[str, List[str]]:
+        """Split one video stream into the master and per-variant chains
+        
+        Args:
+            source_label: Graph label of the decoded stream
+            variants: Variants to derive
+            master: Whether the first output label passes the stream through
+        
+        Returns:
+            Tuple of (graph, output labels); with master the first label is
+            the unmodified stream, followed by one label per variant
+        """
+        split_labels = [f"[split{i}]" for i in range(len(variants) + int(master))]
+        graph = [f"{source_label}split={len(split_labels)}{''.join(split_labels)}"]
+        labels = split_labels[:1] if master else []
+        
+        for i, (variant, split_label) in enumerate(zip(variants, split_labels[int(master):])):
+            label = f"[variant{i}]"
+            graph.append(f"{split_label}{self.variant_chain(variant)}{label}")
+            labels.append(label)
+        
+        return ";".join(graph), labels
+    
+    @staticmethod
+    def variant_chain(variant: OutputVariant) -> str:
+        """Crop and scale filters of a variant"""
+        chain = []
+        if variant.crop:
+            num, den = (int(x) for x in variant.crop.split(":"))
+            # Center crop with even dimensions (required for yuv420p)
+            chain.append(
+                f"crop=w='trunc(min(iw,ih*{num}/{den})/2)*2':h='trunc(min(ih,iw*{den}/{num})/2)*2'"
+            )
+        if variant.width or variant.height:
+            chain.append(f"scale={variant.width or -2}:{variant.height or -2}")
+        return ",".join(chain) or "null"
+    
+    @staticmethod
+    def variant_encode_args(variant: OutputVariant, video: VideoSettings) -> List[str]:
+        """Video encoder arguments of a variant (bitrate or the master's CRF)"""
+        if not variant.video_bitrate:
+            return video.encode_args()
+        bitrate = variant.video_bitrate
+        return [
+            "-c:v", "libx264",
+            "-preset", video.preset,
+            "-b:v", bitrate,
+            "-maxrate", bitrate,
+            "-bufsize", _double_bitrate(bitrate)
+        ]
+    
+    @staticmethod
+    def container_args(container: str) -> List[str]:
+        """Muxer arguments per container"""
+        if container in ("mp4", "mov"):
+            return ["-movflags", "+faststart"]
+        return []
+    
+    def build_trim_graph(
+        self,
+        segments: Sequence[Segment],
+        video: VideoSettings = DEFAULT_VIDEO_SETTINGS
+    ) -> str:
+        """Filter graph trimming every segment out of input 0"""
         filters_v = []
         v_labels = []
         
         for i, seg in enumerate(segments):
-            start = seg.start
-            end = seg.end
-            filters_v.append(
-                f"[0:v]trim=start={start}:end={end},setpts=PTS-STARTPTS[v{i}]"
-            )
+            chain = video.segment_chain(f"trim=start={seg.start}:end={seg.end}")
+            filters_v.append(f"[0:v]{chain}[v{i}]")
             v_labels.append(f"[v{i}]")
         
         filter_complex = ";".join(filters_v) + ";"
         filter_complex += "".join(v_labels)
         filter_complex += f"concat=n={len(v_labels)}:v=1:a=0[outv]"
+        return filter_complex
+    
+    def build_seek_graph(
+        self,
+        input_file: str,
+        segments: Sequence[Segment],
+        video: VideoSettings = DEFAULT_VIDEO_SETTINGS
+    ) -> Tuple[List[str], str]:
+        """Seeking inputs (one per segment) and the graph concatenating them
+        
+        Returns:
+            Tuple of (input arguments, filter graph); input i is segment i
+        """
+        input_args = []
+        filters_v = []
+        v_labels = []
+        
+        for i, seg in enumerate(segments):
+            duration = f"{seg.end - seg.start:.6f}"
+            input_args += [
+                "-ss", f"{seg.start:.6f}",
+                "-t", duration,
+                "-i", str(input_file)
+            ]
+            # The seek keeps the frame on screen at the start (negative
+            # timestamp); trim from 0 selects exactly the frames trim would
+            chain = video.segment_chain(f"trim=start=0:end={duration}")
+            filters_v.append(f"[{i}:v]{chain}[v{i}]")
+            v_labels.append(f"[v{i}]")
+        
+        filter_complex = ";".join(filters_v) + ";"
+        filter_complex += "".join(v_labels)
+        filter_complex += f"concat=n={len(v_labels)}:v=1:a=0[outv]"
+        return input_args, filter_complex
+    
+    def render_parallel(
+        self,
+        timeline: Timeline,
+        max_workers: Optional[int] = None,
+        work_dir: Optional[Path] = None,
+        overwrite: bool = True,
+        clip_cache: Optional[ClipCache] = None,
+        input_hash: Optional[str] = None,
+        video: VideoSettings = DEFAULT_VIDEO_SETTINGS
+    ) -> None:
+        """Render segments as independent clips in parallel, then assemble
+        
+        Every segment is encoded by its own ffmpeg process (input-side seek,
+        same encoder settings as cut_and_concat_video), at most max_workers
+        at a time. The clips are joined with the concat demuxer using stream
+        copy and the narration is muxed in the same final pass, so only the
+        clip encodes cost CPU time.
+        
+        With a clip cache, clips are looked up by (input_hash, start, end,
+        encoder settings) and only missing ones are encoded; the cache is
+        trimmed to its disk budget after the concat.
+        
+        Args:
+            timeline: Timeline object with segments
+            max_workers: Concurrent ffmpeg processes (default: CPU count)
+            work_dir: Directory for intermediate clips (default: a temporary
+                directory next to the output, removed afterwards)
+            overwrite: Whether to overwrite existing output file
+            clip_cache: Optional cache to reuse clips across renders
+            input_hash: Content hash of timeline.input (required with clip_cache)
+            video: Encoder settings and per-segment filters
+        """
+        segments = timeline.segments
+        if not segments:
+            raise ValueError("Timeline has no segments to render")
+        if clip_cache is not None and not input_hash:
+            raise ValueError("input_hash is required with a clip cache")
+        
+        cpu_count = os.cpu_count() or 1
+        workers = max(1, min(max_workers or cpu_count, len(segments)))
+        # Split the encoder threads between the processes instead of oversubscribing
+        threads = max(1, cpu_count // workers)
+        
+        if work_dir is None:
+            output_dir = Path(timeline.output).parent
+            output_dir.mkdir(parents=True, exist_ok=True)
+            with tempfile.TemporaryDirectory(prefix="clips_", dir=output_dir) as tmp_dir:
+                self._render_clips_and_concat(
+                    timeline, Path(tmp_dir), workers, threads, overwrite, clip_cache, input_hash, video
+                )
+        else:
+            work_dir.mkdir(parents=True, exist_ok=True)
+            self._render_clips_and_concat(
+                timeline, work_dir, workers, threads, overwrite, clip_cache, input_hash, video
+            )
+    
+    def clip_settings(self, video: VideoSettings = DEFAULT_VIDEO_SETTINGS) -> List[str]:
+        """Settings that determine a clip's content (part of the cache key)"""
+        return [CLIP_FORMAT_VERSION, *video.encode_args(), *video.filters()]
+    
+    def _render_clips_and_concat(
+        self,
+        timeline: Timeline,
+        work_dir: Path,
+        workers: int,
+        threads: int,
+        overwrite: bool,
+        clip_cache: Optional[ClipCache],
+        input_hash: Optional[str],
+        video: VideoSettings
+    ) -> None:
+        clip_paths = []
+        jobs = {}    # Clip path -> segment, for clips that need encoding
+        keys = {}    # Clip path -> cache key, for clips that need encoding
+        
+        if clip_cache is None:
+            for i, seg in enumerate(timeline.segments):
+                clip_path = work_dir / f"clip_{i:06d}.mp4"
+                clip_paths.append(clip_path)
+                jobs[clip_path] = seg
+        else:
+            settings = self.clip_settings(video)
+            for seg in timeline.segments:
+                key = clip_cache.make_key(input_hash, seg.start, seg.end, settings)
+                clip_path = clip_cache.clip_path(key)
+                if clip_path not in jobs and clip_cache.get(key) is None:
+                    jobs[clip_path] = seg
+                    keys[clip_path] = key
+                clip_paths.append(clip_path)
+        
+        # ffmpeg does the work in child processes; threads only wait on them.
+        # Clips are registered as they finish, so a failed or interrupted
+        # render leaves no unindexed clips behind in the cache directory.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._render_clip_atomic, timeline.input, seg, clip_path, threads, video): clip_path
+                for clip_path, seg in jobs.items()
+            }
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    if clip_cache is not None:
+                        clip_cache.put(keys[futures.pop(future)])
+            except BaseException:
+                # Drop queued clips, let running ones finish and keep those written
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=True)
+                if clip_cache is not None:
+                    for future, clip_path in futures.items():
+                        if not future.cancelled() and future.exception() is None:
+                            clip_cache.put(keys[clip_path])
+                raise
+        
+        self.concat_clips(
+            clip_paths,
+            timeline.narration,
+            timeline.output,
+            work_dir / "concat.txt",
+            overwrite=overwrite
+        )
+        
+        if clip_cache is not None:
+            clip_cache.evict()
+    
+    def _render_clip_atomic(
+        self,
+        input_file: str,
+        seg: Segment,
+        clip_path: Path,
+        threads: int,
+        video: VideoSettings
+    ) -> None:
+        """Render a clip under a temporary name so no partial clip is ever cached"""
+        clip_path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = clip_path.with_name(f"{clip_path.stem}.part{clip_path.suffix}")
+        try:
+            self.render_clip(input_file, seg.start, seg.end, part_path, threads, video)
+            os.replace(part_path, clip_path)
+        finally:
+            part_path.unlink(missing_ok=True)
+    
+    def render_clip(
+        self,
+        input_file: str,
+        start: float,
+        end: float,
+        output_file: Path,
+        threads: Optional[int] = None,
+        video: VideoSettings = DEFAULT_VIDEO_SETTINGS
+    ) -> None:
+        """Encode one segment of the input as a standalone video clip
+        
+        Args:
+            input_file: Source video
+            start: Segment start time in seconds
+            end: Segment end time in seconds
+            output_file: Clip path (overwritten)
+            threads: Encoder threads (default: ffmpeg's choice)
+            video: Encoder settings and per-segment filters
+        """
+        duration = f"{end - start:.6f}"
+        cmd = [
+            self.ffmpeg_path,
+            "-y",
+            "-ss", f"{start:.6f}",
+            "-t", duration,
+            "-i", str(input_file),
+            "-map", "0:v:0",
+            "-vf", ",".join([f"trim=start=0:end={duration}", *video.filters()]),
+            "-an",
+            *video.encode_args()
+        ]
+        if threads:
+            cmd += ["-threads", str(threads)]
+        cmd.append(str(output_file))
+        
+        self._run(cmd, f"clip {start:.2f}-{end:.2f}", end - start)
+    
+    def concat_clips(
+        self,
+        clip_paths: Sequence[Path],
+        narration_file: str,
+        output_file: str,
+        list_path: Path,
+        overwrite: bool = True
+    ) -> None:
+        """Join clips with the concat demuxer (stream copy) and mux narration
+        
+        Clips must share codec parameters, e.g. all come from render_clip.
+        
+        Args:
+            clip_paths: Clips in output order
+            narration_file: Narration audio (encoded to AAC)
+            output_file: Output video path
+            list_path: Path for the concat demuxer list file
+            overwrite: Whether to overwrite existing output file
+        """
+        with open(list_path, 'w', encoding='utf-8') as f:
+            for clip_path in clip_paths:
+                escaped = str(Path(clip_path).resolve()).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
         
-        # Build FFmpeg command
         cmd = [
             self.ffmpeg_path,
             "-y" if overwrite else "-n",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", str(list_path),
+            "-i", str(narration_file),
+            "-map", "0:v:0",
+            "-map", "1:a:0",
+            "-c:v", "copy",
+            *AUDIO_ENCODE_ARGS,
+            "-shortest",
+            "-movflags", "+faststart",
+            str(output_file)
+        ]
+        
+        self._run(cmd, "concat")
+    
+    def transcode_proxy(
+        self,
+        input_file: str,
+        output_file: Path,
+        video: VideoSettings = PROXY_VIDEO_SETTINGS,
+        keyframe_interval: float = 1.0
+    ) -> None:
+        """Transcode the whole input to a low-resolution proxy (video only)
+        
+        Keyframes are forced every keyframe_interval seconds so later
+        seeking renders from the proxy decode very little.
+        
+        Args:
+            input_file: Source video
+            output_file: Proxy path (overwritten)
+            video: Proxy encoder settings and filters
+            keyframe_interval: Seconds between forced keyframes
+        """
+        cmd = [
+            self.ffmpeg_path,
+            "-y",
             "-i", str(input_file),
+            "-map", "0:v:0",
+            "-an"
+        ]
+        if video.filters():
+            cmd += ["-vf", ",".join(video.filters())]
+        cmd += [
+            *video.encode_args(),
+            "-force_key_frames", f"expr:gte(t,n_forced*{keyframe_interval:g})",
+            str(output_file)
+        ]
+        
+        self._run(cmd, "proxy_transcode")
+    
+    def copy_concat_segments(
+        self,
+        input_file: str,
+        starts: Sequence[float],
+        ends: Sequence[float],
+        narration_file: str,
+        output_file: str,
+        list_path: Path,
+        overwrite: bool = True
+    ) -> None:
+        """Cut segments by stream copy and join them with the concat demuxer
+        
+        No video is decoded or encoded: every segment is an inpoint/outpoint
+        entry on the input file, so starts must be keyframes (see
+        src.core.media_index.snap_segments). The narration is encoded to
+        AAC in the same pass.
+        
+        Args:
+            input_file: Source video
+            starts: Segment start times (keyframes) in seconds
+            ends: Segment end times in seconds
+            narration_file: Narration audio
+            output_file: Output video path
+            list_path: Path for the concat demuxer list file
+            overwrite: Whether to overwrite existing output file
+        """
+        escaped = str(Path(input_file).resolve()).replace("'", "'\\''")
+        with open(list_path, 'w', encoding='utf-8') as f:
+            for start, end in zip(starts, ends):
+                f.write(f"file '{escaped}'\ninpoint {start:.6f}\noutpoint {end:.6f}\n")
+        
+        cmd = [
+            self.ffmpeg_path,
+            "-y" if overwrite else "-n",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", str(list_path),
             "-i", str(narration_file),
-            "-filter_complex", filter_complex,
-            "-map", "[outv]",
+            "-map", "0:v:0",
             "-map", "1:a:0",
-            "-c:v", "libx264",
-            "-preset", "veryfast",
-            "-crf", "18",
-            "-c:a", "aac",
+            "-c:v", "copy",
+            *AUDIO_ENCODE_ARGS,
             "-shortest",
             "-movflags", "+faststart",
             str(output_file)
         ]
         
-        # Execute FFmpeg
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        self._run(cmd, "preview", sum(end - start for start, end in zip(starts, ends)))
+    
+    def probe_media(self, input_file: str) -> Dict[str, Any]:
+        """Probe duration, frame rate, resolution and keyframes with ffprobe
+        
+        Keyframes come from the packet flags, which needs a demux pass but
+        no decoding.
+        
+        Args:
+            input_file: Media file
+        
+        Returns:
+            Dictionary with duration, fps, width, height and keyframes
+            (sorted times in seconds)
+        """
+        result = self._run_probe([
+            "-select_streams", "v:0",
+            "-show_entries", "stream=width,height,avg_frame_rate,r_frame_rate:format=duration",
+            "-of", "json",
+            str(input_file)
+        ])
+        info = json.loads(result)
+        stream = (info.get("streams") or [{}])[0]
+        fps = _parse_frame_rate(stream.get("avg_frame_rate")) or _parse_frame_rate(stream.get("r_frame_rate"))
+        
+        packets = self._run_probe([
+            "-select_streams", "v:0",
+            "-show_entries", "packet=pts_time,flags",
+            "-of", "csv=p=0",
+            str(input_file)
+        ])
+        
+        return {
+            "duration": float((info.get("format") or {}).get("duration") or 0.0),
+            "fps": fps,
+            "width": int(stream.get("width") or 0),
+            "height": int(stream.get("height") or 0),
+            "keyframes": _parse_keyframe_packets(packets.splitlines())
+        }
+    
+    def _run_probe(self, args: List[str]) -> str:
+        """Execute ffprobe and return stdout, raising RuntimeError on failure"""
+        cmd = [self.ffprobe_path, "-v", "error", *args]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        except FileNotFoundError:
+            raise RuntimeError(f"ffprobe not found: {self.ffprobe_path}")
         
         if result.returncode != 0:
             raise RuntimeError(
-                f"FFmpeg failed with return code {result.returncode}:\n"
+                f"ffprobe failed with return code {result.returncode}:\n"
                 f"stderr: {result.stderr}"
             )
+        return result.stdout
+    
+    def _run(self, cmd: List[str], label: str = "", expected_duration: Optional[float] = None) -> None:
+        """Execute an FFmpeg command with progress, log, cancel and deadline
+        
+        Raises:
+            FFmpegCancelledError: If cancel_event was set
+            FFmpegTimeoutError: If the deadline passed
+            RuntimeError: If ffmpeg fails
+        """
+        run_ffmpeg(
+            cmd,
+            label=label,
+            expected_duration=expected_duration,
+            on_progress=self.progress_callback,
+            cancel_event=self.cancel_event,
+            deadline=self.deadline,
+            log=self.log
+        )
     
     def check_ffmpeg_available(self) -> bool:
         """Check if FFmpeg is available
@@ -93,3 +845,34 @@ class FFmpegAdapter:
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return False
 
+
+def _parse_frame_rate(rate: Optional[str]) -> float:
+    """Parse an ffprobe frame rate such as "24000/1001" (0.0 if unknown)"""
+    if not rate:
+        return 0.0
+    numerator, _, denominator = rate.partition("/")
+    try:
+        return float(numerator) / float(denominator or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def _parse_keyframe_packets(lines: Sequence[str]) -> List[float]:
+    """Sorted keyframe times from ffprobe "pts_time,flags" packet lines"""
+    times = set()
+    for line in lines:
+        fields = line.strip().split(",")
+        if len(fields) < 2 or not fields[1].startswith("K"):
+            continue
+        try:
+            times.add(float(fields[0]))
+        except ValueError:
+            continue
+    return sorted(times)
+
+
+def _double_bitrate(bitrate: str) -> str:
+    """Twice an ffmpeg bitrate string such as "2500k" (rate control buffer)"""
+    suffix = bitrate[-1] if bitrate[-1].isalpha() else ""
+    value = float(bitrate[:-1] if suffix else bitrate)
+    return f"{value * 2:g}{suffix}"
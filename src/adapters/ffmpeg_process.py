@@ -0,0 +1,239 @@
+"""FFmpeg process runner with streaming progress, bounded logs and cancellation"""
+
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+STDERR_TAIL_LINES = 200           # stderr lines kept in memory for error messages
+LOG_MAX_BYTES = 5 * 1024 * 1024   # Log file size before it rolls over to <name>.1
+TERMINATE_GRACE_SECONDS = 5.0     # Wait after SIGTERM before killing
+
+
+class FFmpegCancelledError(RuntimeError):
+    """Raised when an ffmpeg process is stopped through the cancel event"""
+    pass
+
+
+class FFmpegTimeoutError(RuntimeError):
+    """Raised when an ffmpeg process is stopped at the deadline"""
+    pass
+
+
+@dataclass
+class FFmpegProgress:
+    """One ffmpeg -progress report"""
+    label: str
+    frame: int
+    fps: float
+    speed: Optional[float]          # Output seconds per wall second
+    out_time: float                 # Output seconds written so far
+    expected_duration: Optional[float]
+    eta: Optional[float]            # Wall seconds left (needs expected_duration and speed)
+    done: bool
+    
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "label": self.label,
+            "frame": self.frame,
+            "fps": self.fps,
+            "speed": self.speed,
+            "out_time": self.out_time,
+            "expected_duration": self.expected_duration,
+            "eta": self.eta,
+            "done": self.done
+        }
+
+
+def parse_progress_block(
+    values: Dict[str, str],
+    label: str = "",
+    expected_duration: Optional[float] = None
+) -> FFmpegProgress:
+    """Build a progress event from the key=value lines of one report
+    
+    Args:
+        values: Keys and values of one -progress block (ends with progress=)
+        label: Name of the process the report belongs to
+        expected_duration: Expected output duration in seconds, for the ETA
+    
+    Returns:
+        FFmpegProgress
+    """
+    def number(key: str) -> Optional[float]:
+        try:
+            return float(values.get(key, "").rstrip("x"))
+        except ValueError:
+            return None
+    
+    out_time_us = number("out_time_us")
+    if out_time_us is None:
+        # Older ffmpeg versions report out_time_ms in microseconds as well
+        out_time_us = number("out_time_ms")
+    out_time = max(out_time_us or 0.0, 0.0) / 1_000_000
+    speed = number("speed")
+    done = values.get("progress") == "end"
+    
+    eta = None
+    if done:
+        eta = 0.0
+    elif expected_duration is not None and speed:
+        eta = max(expected_duration - out_time, 0.0) / speed
+    
+    return FFmpegProgress(
+        label=label,
+        frame=int(number("frame") or 0),
+        fps=number("fps") or 0.0,
+        speed=speed,
+        out_time=out_time,
+        expected_duration=expected_duration,
+        eta=eta,
+        done=done
+    )
+
+
+class RingLog:
+    """Thread-safe line log with a size cap
+    
+    When the file reaches max_bytes it is moved to <name>.1 and a new file
+    is started, so at most two files (about 2 * max_bytes) exist.
+    """
+    
+    def __init__(self, path: Optional[Path] = None, max_bytes: int = LOG_MAX_BYTES):
+        """Open log
+        
+        Args:
+            path: Log file (None discards lines)
+            max_bytes: Size at which the file rolls over
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._file = None
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(path, 'a', encoding='utf-8')
+    
+    def __enter__(self) -> "RingLog":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+    
+    def write(self, line: str) -> None:
+        """Append a line"""
+        if self._file is None:
+            return
+        with self._lock:
+            self._file.write(line if line.endswith("\n") else line + "\n")
+            if self._file.tell() >= self.max_bytes:
+                self._file.close()
+                self.path.replace(self.path.with_name(self.path.name + ".1"))
+                self._file = open(self.path, 'w', encoding='utf-8')
+    
+    def close(self) -> None:
+        """Flush and close the log file"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def run_ffmpeg(
+    cmd: List[str],
+    label: str = "",
+    expected_duration: Optional[float] = None,
+    on_progress: Optional[Callable[[FFmpegProgress], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    deadline: Optional[float] = None,
+    log: Optional[RingLog] = None
+) -> None:
+    """Run ffmpeg, streaming progress reports and stderr
+    
+    -progress pipe:1 and -nostats are added after the executable. Progress
+    blocks on stdout become FFmpegProgress events; stderr goes line by line
+    to the log, keeping only the last STDERR_TAIL_LINES in memory.
+    
+    Args:
+        cmd: ffmpeg command (executable first)
+        label: Name of the process in progress events and the log
+        expected_duration: Expected output duration in seconds, for the ETA
+        on_progress: Called with every progress event
+        cancel_event: Stops the process when set
+        deadline: time.monotonic() value at which the process is stopped
+        log: Log receiving stderr
+    
+    Raises:
+        FFmpegCancelledError: If cancel_event was set
+        FFmpegTimeoutError: If the deadline passed
+        RuntimeError: If ffmpeg fails
+    """
+    cmd = [cmd[0], "-nostdin", "-nostats", "-progress", "pipe:1", *cmd[1:]]
+    process = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors='replace'
+    )
+    
+    tail = deque(maxlen=STDERR_TAIL_LINES)
+    stopped = []    # "cancelled" or "timeout", set by the watcher
+    
+    def read_stderr() -> None:
+        for line in process.stderr:
+            tail.append(line.rstrip("\n"))
+            if log is not None:
+                log.write(f"[{label}] {line}" if label else line)
+    
+    def watch() -> None:
+        while process.poll() is None:
+            if cancel_event is not None and cancel_event.is_set():
+                stopped.append("cancelled")
+            elif deadline is not None and time.monotonic() >= deadline:
+                stopped.append("timeout")
+            else:
+                time.sleep(0.1)
+                continue
+            process.terminate()
+            try:
+                process.wait(TERMINATE_GRACE_SECONDS)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            return
+    
+    stderr_thread = threading.Thread(target=read_stderr, daemon=True)
+    watcher_thread = threading.Thread(target=watch, daemon=True)
+    stderr_thread.start()
+    watcher_thread.start()
+    
+    values: Dict[str, str] = {}
+    for line in process.stdout:
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            continue
+        values[key] = value.strip()
+        if key == "progress":
+            if on_progress is not None:
+                on_progress(parse_progress_block(values, label, expected_duration))
+            values = {}
+    
+    returncode = process.wait()
+    watcher_thread.join()
+    stderr_thread.join()
+    
+    if stopped and stopped[0] == "cancelled":
+        raise FFmpegCancelledError(f"FFmpeg cancelled{f' ({label})' if label else ''}")
+    if stopped:
+        raise FFmpegTimeoutError(f"FFmpeg timed out{f' ({label})' if label else ''}")
+    if returncode != 0:
+        stderr = "\n".join(tail)
+        raise RuntimeError(
+            f"FFmpeg failed with return code {returncode}:\n"
+            f"stderr: {stderr}"
+        )
@@ -0,0 +1,160 @@
+"""Persistent query-result cache for narration searches"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class QueryResultCache:
+    """SQLite-backed cache of vector store query results
+    
+    Entries are keyed by (normalized query text hash, embedding model,
+    index fingerprint, n_results, filter), so a result is only reused for
+    the exact same index and query. The least recently used entries are
+    evicted once max_entries is exceeded.
+    """
+    
+    def __init__(self, db_path: Path, max_entries: int = 100000):
+        """Initialize cache
+        
+        Args:
+            db_path: Path to SQLite database file
+            max_entries: Maximum number of cached queries
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS query_results ("
+            "key TEXT PRIMARY KEY, "
+            "result TEXT NOT NULL, "
+            "last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_query_results_last_access "
+            "ON query_results (last_access)"
+        )
+        self._conn.commit()
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM query_results").fetchone()[0]
+    
+    def __enter__(self) -> "QueryResultCache":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+    
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize query text (collapse whitespace) so cosmetic edits still hit"""
+        return re.sub(r'\s+', ' ', text).strip()
+    
+    def make_key(
+        self,
+        text: str,
+        model_name: str,
+        index_fingerprint: str,
+        n_results: int,
+        where: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Build cache key for a query
+        
+        Args:
+            text: Query text
+            model_name: Embedding model name
+            index_fingerprint: Fingerprint of the queried index
+            n_results: Number of results requested
+            where: Optional metadata filter
+        
+        Returns:
+            Cache key
+        """
+        text_hash = hashlib.sha256(self.normalize_text(text).encode('utf-8')).hexdigest()
+        filter_key = json.dumps(where, sort_keys=True) if where else ""
+        return hashlib.sha256(
+            f"{text_hash}|{model_name}|{index_fingerprint}|{n_results}|{filter_key}".encode('utf-8')
+        ).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get cached query result
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached result dictionary, or None on miss
+        """
+        row = self._conn.execute(
+            "SELECT result FROM query_results WHERE key = ?", (key,)
+        ).fetchone()
+        
+        if row is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        self._conn.execute(
+            "UPDATE query_results SET last_access = ? WHERE key = ?", (time.time(), key)
+        )
+        return json.loads(row[0])
+    
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store query result, evicting least recently used entries if needed
+        
+        Args:
+            key: Cache key
+            result: JSON-serializable query result
+        """
+        payload = json.dumps(result)
+        now = time.time()
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO query_results (key, result, last_access) VALUES (?, ?, ?)",
+            (key, payload, now)
+        )
+        if cursor.rowcount == 0:
+            self._conn.execute(
+                "UPDATE query_results SET result = ?, last_access = ? WHERE key = ?",
+                (payload, now, key)
+            )
+            return
+        
+        self._entries += 1
+        if self._entries > self.max_entries:
+            excess = self._entries - self.max_entries
+            self._conn.execute(
+                "DELETE FROM query_results WHERE key IN ("
+                "SELECT key FROM query_results ORDER BY last_access ASC LIMIT ?)",
+                (excess,)
+            )
+            self._entries -= excess
+            self.evictions += excess
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics for this session
+        
+        Returns:
+            Dictionary with hits, misses, hit_rate, evictions and entries
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": self._entries
+        }
+    
+    def close(self) -> None:
+        """Commit pending writes and close the database"""
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
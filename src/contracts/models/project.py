@@ -4,6 +4,29 @@ from typing import Optional, Literal, List
 from pydantic import BaseModel, Field
 
 
+class SceneWeightOverride(BaseModel):
+    """Editor override for the scene weight/priority of movie chunks"""
+    segment_id: Optional[str] = Field(None, description="Movie chunk ID (alternative to start/end)")
+    start: Optional[float] = Field(None, ge=0, description="Range start in movie seconds")
+    end: Optional[float] = Field(None, ge=0, description="Range end in movie seconds")
+    weight: Optional[float] = Field(None, ge=0, description="Scene weight replacing the computed one")
+    priority: Optional[int] = Field(None, ge=1, le=10, description="Clip priority (higher is kept first)")
+
+
+class OutputVariant(BaseModel):
+    """Additional render output derived from the same decode as the master"""
+    name: str = Field(..., pattern=r"^[A-Za-z0-9_-]+$", description="Variant name (written to <output>_<name>.<container>)")
+    width: Optional[int] = Field(None, ge=2, description="Output width (height follows the aspect ratio if not set)")
+    height: Optional[int] = Field(None, ge=2, description="Output height (width follows the aspect ratio if not set)")
+    crop: Optional[str] = Field(None, pattern=r"^[0-9]+:[0-9]+$", description="Center-crop to this aspect ratio, e.g. 9:16")
+    video_bitrate: Optional[str] = Field(
+        None,
+        pattern=r"^[0-9]+(\.[0-9]+)?[kKmM]?$",
+        description="Target video bitrate, e.g. 2500k (default: constant quality)"
+    )
+    container: Literal["mp4", "mkv", "mov"] = Field(default="mp4", description="Output container")
+
+
 class ProjectOptions(BaseModel):
     """Project processing options"""
     spoiler_safe_mode: bool = Field(default=False, description="Enable spoiler filtering")
@@ -21,9 +44,147 @@ class ProjectOptions(BaseModel):
         le=1,
         description="Minimum similarity score for segment selection"
     )
-    preset: Literal["quick", "standard", "spoiler_safe", "high_quality"] = Field(
+    copyright_min_gap: float = Field(
+        default=30.0,
+        ge=0,
+        description="Minimum movie-time gap between consecutive segments in seconds"
+    )
+    interval_seconds: float = Field(
+        default=4.0,
+        gt=0,
+        description="Narration interval length for segment selection in seconds"
+    )
+    selection_strategy: Literal["greedy", "dp"] = Field(
+        default="greedy",
+        description="Segment selection (greedy picks per interval, dp maximizes total similarity under the copyright gap)"
+    )
+    allow_segment_reuse: bool = Field(
+        default=True,
+        description="Allow the same movie segment to be selected for more than one narration interval (false: dp strategy only; optimal unless the search hits its limit, which is logged)"
+    )
+    search_output_format: Literal["json", "jsonl", "columnar"] = Field(
+        default="json",
+        description="Search output format (jsonl streams results per narration window, columnar stores normalized tables)"
+    )
+    query_cache: bool = Field(
+        default=True,
+        description="Cache search query results so re-runs only search changed narration windows"
+    )
+    query_cache_max_entries: int = Field(
+        default=100000,
+        ge=1,
+        description="Maximum cached queries (least recently used are evicted)"
+    )
+    similarity_matrix: Optional[Literal["dense", "topk"]] = Field(
+        default=None,
+        description="Persist narration x movie similarity matrix during search (dense or top-K sparse)"
+    )
+    similarity_matrix_top_k: int = Field(
+        default=50,
+        ge=1,
+        description="Entries kept per narration window in the top-K similarity matrix"
+    )
+    use_similarity_matrix: bool = Field(
+        default=False,
+        description="Derive timeline candidates from the persisted similarity matrix"
+    )
+    candidate_top_k: int = Field(
+        default=3,
+        ge=1,
+        description="Candidates per narration window when deriving from the similarity matrix"
+    )
+    scene_weights: bool = Field(
+        default=False,
+        description="Scale candidate scores by the per-chunk scene weights computed at index time"
+    )
+    scene_weight_overrides: List[SceneWeightOverride] = Field(
+        default_factory=list,
+        description="Editor weight/priority overrides by chunk ID or movie time range"
+    )
+    min_priority: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=10,
+        description="Drop candidates whose priority is set and below this level"
+    )
+    render_mode: Literal["single", "parallel", "fast"] = Field(
+        default="single",
+        description="Render as one filter graph (single), as parallel clips joined by stream copy (parallel), or as a keyframe-snapped stream-copy preview (fast)"
+    )
+    render_workers: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Concurrent ffmpeg processes in parallel render mode (default: CPU count)"
+    )
+    video_preset: Literal[
+        "ultrafast", "superfast", "veryfast", "faster", "fast", "medium", "slow", "slower", "veryslow"
+    ] = Field(
+        default="veryfast",
+        description="x264 preset of renders (proxies use ultrafast)"
+    )
+    video_crf: int = Field(
+        default=18,
+        ge=0,
+        le=51,
+        description="x264 CRF of renders (lower is higher quality)"
+    )
+    quality_target: Optional[float] = Field(
+        default=None,
+        gt=0,
+        le=1,
+        description="Minimum SSIM; picks the fastest calibrated preset meeting it (overrides video_preset and video_crf)"
+    )
+    max_bitrate_kbps: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="With quality_target: skip calibrated configurations whose calibration encode exceeded this bitrate"
+    )
+    render_group_size: int = Field(
+        default=16,
+        ge=1,
+        description="Maximum segments per ffmpeg filter graph; longer timelines are rendered in groups and joined"
+    )
+    render_timeout: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Seconds after which a render is stopped (default: no limit)"
+    )
+    clip_cache: bool = Field(
+        default=True,
+        description="Reuse encoded segment clips across parallel renders (only new or changed segments are encoded)"
+    )
+    clip_cache_max_gb: float = Field(
+        default=20.0,
+        gt=0,
+        description="Disk budget of the clip cache in GB (least recently used clips are evicted)"
+    )
+    proxy_height: int = Field(
+        default=360,
+        ge=2,
+        description="Maximum frame height of proxy renders (downscaled keeping aspect ratio)"
+    )
+    proxy_crf: int = Field(
+        default=30,
+        ge=0,
+        le=51,
+        description="x264 CRF of proxy renders (higher is smaller and lower quality)"
+    )
+    proxy_max_fps: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Frame rate cap of proxy renders"
+    )
+    proxy_source: bool = Field(
+        default=False,
+        description="Cut proxy renders from a cached low-res transcode of the movie"
+    )
+    output_variants: List[OutputVariant] = Field(
+        default_factory=list,
+        description="Additional outputs (resolution, crop, bitrate, container) rendered in the same pass as the master"
+    )
+    preset: Literal["quick", "standard", "spoiler_safe", "high_quality", "proxy"] = Field(
         default="standard",
-        description="Processing preset"
+        description="Processing preset (proxy renders a low-res review copy to <name>_proxy.<ext>)"
     )
 
 
@@ -18,6 +18,9 @@ class IndexOutput(BaseModel):
     collection_name: str
     chunks_indexed: int
     total_duration: float
+    embedding_model: Optional[str] = None
+    fingerprint: Optional[str] = None
+    spoiler_scored: bool = False
 
 
 class SearchMatch(BaseModel):
@@ -27,6 +30,10 @@ class SearchMatch(BaseModel):
     end_time: float
     similarity_score: float
     narration_text: Optional[str] = None
+    narration_file_id: Optional[str] = None
+    narration_time: Optional[float] = None
+    chunk_index: Optional[int] = None
+    result_rank: Optional[int] = None
 
 
 class SearchOutput(BaseModel):
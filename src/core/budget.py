@@ -0,0 +1,221 @@
+"""Duration-budgeted segment selection
+
+Chooses the subset of selected segments that maximizes total (weighted)
+similarity while the total duration stays within max_duration.
+
+Exact selection is a 0/1 knapsack over durations discretized to
+`resolution` seconds. Durations are rounded up, so the real total never
+exceeds the budget. The DP table is capped at max_cells: larger inputs first
+coarsen the resolution, and if that gets too coarse they fall back to
+greedy selection by similarity per second.
+
+With priorities, trimming is priority-aware: tiers are filled from the
+highest priority down, each with the budget the tiers above left over, so
+a lower-priority segment never displaces a higher-priority one.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from src.core.matching import Match
+
+
+DEFAULT_RESOLUTION = 0.1          # Seconds per knapsack capacity cell
+DEFAULT_MAX_CELLS = 20_000_000    # Items x capacity cells for the exact DP
+MIN_CAPACITY_CELLS = 100          # Coarser than this falls back to greedy
+DEFAULT_PRIORITY = 5              # Tier of segments without a priority (1-10 scale)
+
+
+def knapsack_select(
+    durations: np.ndarray,
+    values: np.ndarray,
+    budget: float,
+    resolution: float = DEFAULT_RESOLUTION
+) -> np.ndarray:
+    """Exact 0/1 knapsack over discretized durations
+    
+    Args:
+        durations: Item durations in seconds
+        values: Item values (non-negative)
+        budget: Total duration budget in seconds
+        resolution: Capacity cell size in seconds
+    
+    Returns:
+        Sorted indices of selected items
+    """
+    capacity = int(np.floor(budget / resolution + 1e-9))
+    weights = np.ceil(durations / resolution - 1e-9).astype(np.int64)
+    n_items = len(durations)
+    
+    best = np.zeros(capacity + 1)
+    taken = np.zeros((n_items, capacity + 1), dtype=bool)
+    
+    for i in range(n_items):
+        w = int(weights[i])
+        if w > capacity:
+            continue
+        with_item = best[:capacity + 1 - w] + values[i]
+        take = with_item > best[w:]
+        taken[i, w:] = take
+        best[w:] = np.where(take, with_item, best[w:])
+    
+    selected = []
+    remaining = capacity
+    for i in range(n_items - 1, -1, -1):
+        if taken[i, remaining]:
+            selected.append(i)
+            remaining -= int(weights[i])
+    
+    return np.asarray(sorted(selected), dtype=np.int64)
+
+
+def greedy_ratio_select(
+    durations: np.ndarray,
+    values: np.ndarray,
+    budget: float
+) -> np.ndarray:
+    """Greedy selection by value per second
+    
+    Items are added best ratio first while they fit. The result is compared
+    with the single most valuable item that fits, which bounds the greedy
+    result at half the optimum.
+    
+    Args:
+        durations: Item durations in seconds
+        values: Item values (non-negative)
+        budget: Total duration budget in seconds
+    
+    Returns:
+        Sorted indices of selected items
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = np.where(durations > 0, values / durations, np.inf)
+    order = np.argsort(-ratios, kind='stable')
+    
+    selected = []
+    total_duration = 0.0
+    total_value = 0.0
+    for i in order.tolist():
+        if total_duration + durations[i] <= budget:
+            selected.append(i)
+            total_duration += durations[i]
+            total_value += values[i]
+    
+    fits = np.flatnonzero(durations <= budget)
+    if len(fits):
+        best_single = int(fits[np.argmax(values[fits])])
+        if values[best_single] > total_value:
+            selected = [best_single]
+    
+    return np.asarray(sorted(selected), dtype=np.int64)
+
+
+def select_within_budget(
+    durations: np.ndarray,
+    values: np.ndarray,
+    budget: float,
+    resolution: float = DEFAULT_RESOLUTION,
+    max_cells: int = DEFAULT_MAX_CELLS
+) -> np.ndarray:
+    """Select items maximizing total value within a duration budget
+    
+    Args:
+        durations: Item durations in seconds
+        values: Item values (non-negative)
+        budget: Total duration budget in seconds
+        resolution: Preferred capacity cell size in seconds
+        max_cells: Maximum DP table size (items x capacity cells)
+    
+    Returns:
+        Sorted indices of selected items
+    """
+    durations = np.asarray(durations, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    n_items = len(durations)
+    
+    if n_items == 0 or budget <= 0:
+        return np.empty(0, dtype=np.int64)
+    if durations.sum() <= budget:
+        return np.arange(n_items, dtype=np.int64)
+    
+    # Coarsen the grid so the DP table stays within max_cells; small budgets
+    # at the preferred resolution stay exact
+    coarse_resolution = budget * n_items / max_cells
+    if coarse_resolution > resolution:
+        if budget / coarse_resolution < MIN_CAPACITY_CELLS:
+            return greedy_ratio_select(durations, values, budget)
+        resolution = coarse_resolution
+    return knapsack_select(durations, values, budget, resolution)
+
+
+def apply_duration_budget(
+    matches: List[Match],
+    max_duration: float,
+    min_segment_length: float = 0.0,
+    min_time_gap: Optional[float] = None,
+    weights: Optional[np.ndarray] = None,
+    priorities: Optional[Sequence[Optional[int]]] = None
+) -> List[Match]:
+    """Trim selected matches to a total duration budget
+    
+    When the matches already fit, they are returned unchanged. Otherwise
+    matches shorter than min_segment_length are not eligible for the
+    budget. Kept matches stay in their original (narration) order. Removing matches can bring
+    two segments next to each other that are closer than min_time_gap in
+    movie time; if min_time_gap is given, such segments are dropped
+    afterwards.
+    
+    Args:
+        matches: Selected matches in narration order
+        max_duration: Maximum total duration in seconds
+        min_segment_length: Minimum segment duration in seconds
+        min_time_gap: Optional minimum movie-time gap to re-check
+        weights: Optional per-match weights multiplied into the scores
+        priorities: Optional per-match priorities (None = DEFAULT_PRIORITY);
+            higher tiers are kept first
+    
+    Returns:
+        Matches within the budget
+    """
+    if not matches:
+        return []
+    
+    starts = np.asarray([m.start_time for m in matches], dtype=np.float64)
+    ends = np.asarray([m.end_time for m in matches], dtype=np.float64)
+    durations = ends - starts
+    if durations.sum() <= max_duration:
+        return list(matches)
+    
+    values = np.asarray([m.similarity_score for m in matches], dtype=np.float64)
+    if weights is not None:
+        values = values * np.asarray(weights, dtype=np.float64)
+    values = np.maximum(values, 0.0)
+    
+    eligible = np.flatnonzero(durations >= min_segment_length)
+    if priorities is None:
+        selected = eligible[select_within_budget(durations[eligible], values[eligible], max_duration)]
+    else:
+        tiers = np.asarray(
+            [DEFAULT_PRIORITY if p is None else p for p in priorities], dtype=np.int64
+        )[eligible]
+        remaining = max_duration
+        chosen = []
+        for tier in np.unique(tiers)[::-1].tolist():
+            members = eligible[tiers == tier]
+            picked = members[select_within_budget(durations[members], values[members], remaining)]
+            chosen.append(picked)
+            remaining -= float(durations[picked].sum())
+        selected = np.sort(np.concatenate(chosen)) if chosen else eligible[:0]
+    kept = [matches[i] for i in selected.tolist()]
+    
+    if min_time_gap is not None and len(kept) < len(matches):
+        # Same scan as prevent_consecutive_segments_batch, on the selected columns
+        from src.core.filtering import consecutive_gap_rows
+        narration_times = np.asarray(
+            [np.nan if m.narration_time is None else m.narration_time for m in kept], dtype=np.float64
+        )
+        rows = consecutive_gap_rows(narration_times, starts[selected], ends[selected], min_time_gap)
+        kept = [kept[i] for i in rows.tolist()]
+    
+    return kept
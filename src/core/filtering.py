@@ -1,7 +1,11 @@
 """Filtering logic for spoiler avoidance, scene weighting, etc."""
 
+from dataclasses import replace
 from typing import List, Optional, Dict
-from src.core.matching import Match
+
+import numpy as np
+
+from src.core.matching import Match, MatchBatch
 from src.contracts.models.timeline import SpoilerRisk
 
 
@@ -16,7 +20,7 @@ def filter_by_spoiler_risk(
         matches: List of matches to filter
         spoiler_risks: Dictionary mapping segment_id to SpoilerRisk
         risk_threshold: Maximum allowed spoiler risk (0-1)
-        
+    
     Returns:
         Filtered list of matches
     """
@@ -28,24 +32,62 @@ def filter_by_spoiler_risk(
     return filtered
 
 
+def filter_batch_by_spoiler_risk(
+    batch: MatchBatch,
+    spoiler_risks: dict[str, SpoilerRisk],
+    risk_threshold: float = 0.3
+) -> MatchBatch:
+    """Vectorized filter_by_spoiler_risk
+    
+    Args:
+        batch: Matches to filter
+        spoiler_risks: Dictionary mapping segment_id to SpoilerRisk
+        risk_threshold: Maximum allowed spoiler risk (0-1)
+    
+    Returns:
+        Filtered batch (segments without a risk score are kept)
+    """
+    risks = batch.lookup(
+        {segment_id: risk.risk for segment_id, risk in spoiler_risks.items()},
+        default=np.nan
+    )
+    return batch.take(np.isnan(risks) | (risks <= risk_threshold))
+
+
 def apply_scene_weights(
     matches: List[Match],
-    scene_weights: dict[str, float]
+    scene_weights: dict[str, float],
+    priorities: Optional[dict[str, int]] = None
 ) -> List[Match]:
-    """Apply scene weights to matches
+    """Apply scene weights (and optional priorities) to matches
     
     Args:
         matches: List of matches
         scene_weights: Dictionary mapping segment_id to weight
-        
+        priorities: Optional dictionary mapping segment_id to priority
+    
     Returns:
-        List of matches with weights applied (stored in match metadata)
+        New list of matches with weight (default 1.0) and priority set
     """
-    for match in matches:
-        weight = scene_weights.get(match.segment_id, 1.0)
-        # Store weight in match (would need to extend Match dataclass)
-        # For now, this is a placeholder for future implementation
-    return matches
+    priorities = priorities or {}
+    return [
+        replace(
+            match,
+            weight=scene_weights.get(match.segment_id, 1.0),
+            priority=priorities.get(match.segment_id, match.priority)
+        )
+        for match in matches
+    ]
+
+
+def scene_weight_column(batch: MatchBatch, scene_weights: dict[str, float]) -> np.ndarray:
+    """Vectorized apply_scene_weights: weight per batch row (default 1.0)"""
+    return batch.lookup(scene_weights, default=1.0)
+
+
+def priority_column(batch: MatchBatch, priorities: dict[str, int]) -> np.ndarray:
+    """Priority per batch row (0 where not set)"""
+    return batch.lookup(priorities, default=0, dtype=np.int64)
 
 
 def filter_by_priority(
@@ -57,13 +99,30 @@ def filter_by_priority(
     Args:
         matches: List of matches
         min_priority: Minimum priority level
-        
+    
     Returns:
-        Filtered list of matches
+        Filtered list of matches (matches without a priority are kept)
+    """
+    return [m for m in matches if m.priority is None or m.priority >= min_priority]
+
+
+def filter_batch_by_priority(
+    batch: MatchBatch,
+    priorities: dict[str, int],
+    min_priority: int = 1
+) -> MatchBatch:
+    """Vectorized filter_by_priority
+    
+    Args:
+        batch: Matches to filter
+        priorities: Dictionary mapping segment_id to priority
+        min_priority: Minimum priority level
+    
+    Returns:
+        Filtered batch (segments without a priority are kept)
     """
-    # Priority filtering would require Match to have priority field
-    # This is a placeholder for future implementation
-    return matches
+    column = priority_column(batch, priorities)
+    return batch.take((column == 0) | (column >= min_priority))
 
 
 def merge_nearby_segments(
@@ -75,7 +134,7 @@ def merge_nearby_segments(
     Args:
         matches: List of matches
         merge_threshold: Maximum gap in seconds to merge
-        
+    
     Returns:
         List of matches with nearby segments merged
     """
@@ -104,6 +163,48 @@ def merge_nearby_segments(
     return merged
 
 
+def merge_nearby_segments_batch(
+    batch: MatchBatch,
+    merge_threshold: float = 5.0
+) -> MatchBatch:
+    """Vectorized merge_nearby_segments
+    
+    In start-time order a match joins the previous group when its gap to
+    the previous match's end is within merge_threshold, so group boundaries
+    come from one diff over the sorted columns.
+    
+    Args:
+        batch: Matches
+        merge_threshold: Maximum gap in seconds to merge
+    
+    Returns:
+        Batch with one row per merged group (sorted by start time)
+    """
+    if len(batch) == 0:
+        return batch
+    
+    batch = batch.take(np.argsort(batch.start_time, kind='stable'))
+    gaps = batch.start_time[1:] - batch.end_time[:-1]
+    group_starts = np.concatenate(([0], np.flatnonzero(gaps > merge_threshold) + 1))
+    group_ends = np.append(group_starts[1:], len(batch))
+    
+    merged = batch.take(group_starts)
+    merged.end_time = batch.end_time[group_ends - 1]
+    merged.similarity_score = np.maximum.reduceat(batch.similarity_score, group_starts)
+    
+    # Merged groups carry joined narration text and no narration timing
+    multi = np.flatnonzero(group_ends - group_starts > 1)
+    if len(multi):
+        merged.narration_time[multi] = np.nan
+        merged.narration_file_id[multi] = None
+        for group in multi.tolist():
+            merged.narration_text[group] = " ".join(
+                batch.narration_text[group_starts[group]:group_ends[group]].tolist()
+            )
+    
+    return merged
+
+
 def prevent_consecutive_segments(
     matches: List[Match],
     min_time_gap: float = 30.0,
@@ -119,7 +220,7 @@ def prevent_consecutive_segments(
         matches: List of matches sorted by narration time
         min_time_gap: Minimum time gap between consecutive segments in movie time (seconds)
         alternative_matches: Optional dict mapping segment_id to list of alternative matches
-        
+    
     Returns:
         Filtered list with distributed segments (copyright compliant)
     """
@@ -174,3 +275,62 @@ def prevent_consecutive_segments(
     
     return filtered
 
+
+def prevent_consecutive_segments_batch(
+    batch: MatchBatch,
+    min_time_gap: float = 30.0
+) -> MatchBatch:
+    """Columnar prevent_consecutive_segments (without alternatives)
+    
+    Each kept segment depends on the previously kept one, so the scan is
+    sequential, but it runs over plain float lists instead of Match objects.
+    Use the list version when alternative matches should be substituted.
+    
+    Args:
+        batch: Matches (ordered by narration time after sorting)
+        min_time_gap: Minimum time gap between consecutive segments in movie time (seconds)
+    
+    Returns:
+        Batch with too-close segments removed (sorted by narration time)
+    """
+    if len(batch) == 0:
+        return batch
+    
+    return batch.take(consecutive_gap_rows(
+        batch.narration_time, batch.start_time, batch.end_time, min_time_gap
+    ))
+
+
+def consecutive_gap_rows(
+    narration_times: np.ndarray,
+    start_times: np.ndarray,
+    end_times: np.ndarray,
+    min_time_gap: float = 30.0
+) -> np.ndarray:
+    """Rows kept by prevent_consecutive_segments_batch, on plain columns
+    
+    Args:
+        narration_times: Narration time per row (NaN sorts by start time)
+        start_times: Movie start time per row
+        end_times: Movie end time per row
+        min_time_gap: Minimum time gap between consecutive segments in movie time (seconds)
+    
+    Returns:
+        Indices of the kept rows in narration order
+    """
+    if len(start_times) == 0:
+        return np.empty(0, dtype=np.int64)
+    
+    # Rows without narration time sort by their movie start time
+    sort_keys = np.where(np.isnan(narration_times), start_times, narration_times)
+    order = np.argsort(sort_keys, kind='stable')
+    centers = ((start_times[order] + end_times[order]) / 2.0).tolist()
+    
+    keep = [0]
+    last_movie_time = centers[0]
+    for i in range(1, len(centers)):
+        if abs(centers[i] - last_movie_time) >= min_time_gap:
+            keep.append(i)
+            last_movie_time = centers[i]
+    
+    return order[np.asarray(keep, dtype=np.int64)]
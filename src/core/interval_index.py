@@ -0,0 +1,77 @@
+"""Sorted-interval index for time -> narration entry lookups"""
+
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from src.utils.srt_parser import SRTEntry
+
+
+class IntervalIndex:
+    """Index over intervals sorted by start time
+    
+    find(t) returns the first interval (in list order) with
+    start <= t <= end, the same answer as a linear scan, in O(log N).
+    
+    Because intervals are sorted by start, the candidates for t are the
+    prefix with start <= t. Among that prefix, the first interval with
+    end >= t is the first position where the running maximum of end
+    times reaches t, which is found by bisecting the running maximum.
+    """
+    
+    def __init__(self, starts: Sequence[float], ends: Sequence[float]):
+        """Build index
+        
+        Args:
+            starts: Interval start times, sorted ascending
+            ends: Interval end times (same length as starts)
+        """
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.asarray(ends, dtype=np.float64)
+        if len(self.starts) and np.any(np.diff(self.starts) < 0):
+            raise ValueError("IntervalIndex requires intervals sorted by start time")
+        
+        self.max_ends = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+        # Python lists make scalar bisect lookups cheaper than NumPy scalars
+        self._starts_list = self.starts.tolist()
+        self._max_ends_list = self.max_ends.tolist()
+    
+    @classmethod
+    def from_entries(cls, entries: List[SRTEntry]) -> "IntervalIndex":
+        """Build index over SRT entries (must be sorted by start time)"""
+        return cls([e.start_time for e in entries], [e.end_time for e in entries])
+    
+    def __len__(self) -> int:
+        return len(self._starts_list)
+    
+    def find(self, t: float) -> Optional[int]:
+        """Find the first interval containing t
+        
+        Args:
+            t: Time in seconds
+        
+        Returns:
+            Interval index, or None if no interval contains t
+        """
+        last_candidate = bisect_right(self._starts_list, t) - 1
+        if last_candidate < 0:
+            return None
+        first_reaching = bisect_left(self._max_ends_list, t)
+        return first_reaching if first_reaching <= last_candidate else None
+    
+    def find_many(self, times: Sequence[float], default: int = -1) -> np.ndarray:
+        """Vectorized find() for an array of times
+        
+        Args:
+            times: Times in seconds
+            default: Value for times not contained in any interval
+        
+        Returns:
+            Integer array of interval indices
+        """
+        times = np.asarray(times, dtype=np.float64)
+        last_candidate = np.searchsorted(self.starts, times, side='right') - 1
+        first_reaching = np.searchsorted(self.max_ends, times, side='left')
+        found = (last_candidate >= 0) & (first_reaching <= last_candidate)
+        return np.where(found, first_reaching, default).astype(np.int64)
@@ -1,8 +1,11 @@
 """Semantic matching algorithms"""
 
-from typing import List, Tuple, Optional
+import heapq
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Optional
 from dataclasses import dataclass
 
+import numpy as np
+
 
 @dataclass
 class Match:
@@ -14,6 +17,172 @@ class Match:
     narration_text: str
     narration_time: Optional[float] = None  # Narration time (for sorting and copyright compliance)
     narration_file_id: Optional[str] = None  # Identifier for which narration file this match belongs to
+    weight: Optional[float] = None  # Scene weight (see src/core/scene_weights.py)
+    priority: Optional[int] = None  # Editor priority 1-10 (higher is more important)
+
+
+@dataclass
+class MatchBatch:
+    """Matches stored as parallel NumPy columns
+    
+    Row i of every column describes one match. Numeric columns are float64
+    (a missing narration_time is NaN); chunk_id is a dense int32 id shared
+    by all rows with the same segment_id, so per-segment tables can be
+    applied with one gather. Identifiers and text are object arrays.
+    Used where per-object Match handling would dominate (grouping and
+    filtering tens of thousands of candidates).
+    """
+    segment_id: np.ndarray
+    start_time: np.ndarray
+    end_time: np.ndarray
+    similarity_score: np.ndarray
+    narration_time: np.ndarray
+    narration_text: np.ndarray
+    narration_file_id: np.ndarray
+    chunk_id: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.similarity_score)
+    
+    @classmethod
+    def from_dicts(cls, match_dicts: Iterable[Dict[str, Any]]) -> "MatchBatch":
+        """Build batch from search match dictionaries in a single pass
+        
+        Missing narration_time is stored as 0.0 and missing narration_text
+        as an empty string, as for Match objects built from search output.
+        
+        Args:
+            match_dicts: Search match dictionaries
+            
+        Returns:
+            MatchBatch
+        """
+        segment_ids = []
+        start_times = []
+        end_times = []
+        scores = []
+        narration_times = []
+        narration_texts = []
+        file_ids = []
+        
+        for match_data in match_dicts:
+            segment_ids.append(match_data["segment_id"])
+            start_times.append(match_data["start_time"])
+            end_times.append(match_data["end_time"])
+            scores.append(match_data["similarity_score"])
+            narration_times.append(match_data.get("narration_time") or 0.0)
+            narration_texts.append(match_data.get("narration_text") or "")
+            file_ids.append(match_data.get("narration_file_id"))
+        
+        return cls(
+            segment_id=_object_array(segment_ids),
+            start_time=np.asarray(start_times, dtype=np.float64),
+            end_time=np.asarray(end_times, dtype=np.float64),
+            similarity_score=np.asarray(scores, dtype=np.float64),
+            narration_time=np.asarray(narration_times, dtype=np.float64),
+            narration_text=_object_array(narration_texts),
+            narration_file_id=_object_array(file_ids),
+            chunk_id=_dense_ids(segment_ids)
+        )
+    
+    @classmethod
+    def from_matches(cls, matches: List[Match]) -> "MatchBatch":
+        """Build batch from Match objects
+        
+        Args:
+            matches: List of matches
+            
+        Returns:
+            MatchBatch (None narration_time becomes NaN)
+        """
+        segment_ids = [m.segment_id for m in matches]
+        return cls(
+            segment_id=_object_array(segment_ids),
+            start_time=np.asarray([m.start_time for m in matches], dtype=np.float64),
+            end_time=np.asarray([m.end_time for m in matches], dtype=np.float64),
+            similarity_score=np.asarray([m.similarity_score for m in matches], dtype=np.float64),
+            narration_time=np.asarray(
+                [np.nan if m.narration_time is None else m.narration_time for m in matches],
+                dtype=np.float64
+            ),
+            narration_text=_object_array([m.narration_text for m in matches]),
+            narration_file_id=_object_array([m.narration_file_id for m in matches]),
+            chunk_id=_dense_ids(segment_ids)
+        )
+    
+    def take(self, indices: np.ndarray) -> "MatchBatch":
+        """Select rows by index array or boolean mask"""
+        return MatchBatch(
+            segment_id=self.segment_id[indices],
+            start_time=self.start_time[indices],
+            end_time=self.end_time[indices],
+            similarity_score=self.similarity_score[indices],
+            narration_time=self.narration_time[indices],
+            narration_text=self.narration_text[indices],
+            narration_file_id=self.narration_file_id[indices],
+            chunk_id=self.chunk_id[indices]
+        )
+    
+    def lookup(self, table: Dict[str, Any], default: Any, dtype=np.float64) -> np.ndarray:
+        """Map a per-segment table onto rows
+        
+        The table is consulted once per distinct chunk, then gathered by
+        chunk_id, so cost is O(distinct segments + rows).
+        
+        Args:
+            table: Dictionary keyed by segment_id
+            default: Value for segments missing from the table
+            dtype: Result dtype
+            
+        Returns:
+            Array with one value per row
+        """
+        if len(self) == 0:
+            return np.empty(0, dtype=dtype)
+        
+        chunk_ids, first_rows = np.unique(self.chunk_id, return_index=True)
+        per_chunk = np.full(int(chunk_ids[-1]) + 1, default, dtype=dtype)
+        per_chunk[chunk_ids] = [
+            table.get(segment_id, default) for segment_id in self.segment_id[first_rows].tolist()
+        ]
+        return per_chunk[self.chunk_id]
+    
+    def to_matches(self) -> List[Match]:
+        """Convert rows to Match objects (in row order)"""
+        narration_times = [None if t != t else t for t in self.narration_time.tolist()]
+        return [
+            Match(
+                segment_id=segment_id,
+                start_time=start_time,
+                end_time=end_time,
+                similarity_score=score,
+                narration_text=narration_text,
+                narration_time=narration_time,
+                narration_file_id=file_id
+            )
+            for segment_id, start_time, end_time, score, narration_text, narration_time, file_id in zip(
+                self.segment_id.tolist(),
+                self.start_time.tolist(),
+                self.end_time.tolist(),
+                self.similarity_score.tolist(),
+                self.narration_text.tolist(),
+                narration_times,
+                self.narration_file_id.tolist()
+            )
+        ]
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    """Build 1-D object array (np.asarray would split tuples or infer str dtype)"""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _dense_ids(values: List[Any]) -> np.ndarray:
+    """Dense int32 ids in order of first appearance"""
+    ids = {}
+    return np.asarray([ids.setdefault(value, len(ids)) for value in values], dtype=np.int32)
 
 
 def filter_by_similarity_threshold(
@@ -32,6 +201,77 @@ def filter_by_similarity_threshold(
     return [m for m in matches if m.similarity_score >= threshold]
 
 
+def filter_batch_by_similarity_threshold(
+    batch: MatchBatch,
+    threshold: float = 0.75
+) -> MatchBatch:
+    """Vectorized filter_by_similarity_threshold
+    
+    Args:
+        batch: Matches to filter
+        threshold: Minimum similarity score (0-1)
+        
+    Returns:
+        Filtered batch
+    """
+    return batch.take(batch.similarity_score >= threshold)
+
+
+def _sweep_overlapping_pairs(
+    start_times: Sequence[float],
+    end_times: Sequence[float],
+    overlap_threshold: float
+) -> Iterator[Tuple[int, int, int, int]]:
+    """Yield (position_i, position_j, i, j) for overlapping segment pairs
+    
+    Segments are processed in start-time order while a heap keeps the
+    active segments (ordered by end time). Segments that ended before the
+    current start are popped, so every remaining active segment overlaps
+    the current one: O(n log n + overlapping pairs). Pairs are yielded in
+    sweep order (grouped by the later segment).
+    """
+    order = sorted(range(len(start_times)), key=lambda i: start_times[i])
+    active = []  # (end_time, position, index, duration)
+    
+    for position, j in enumerate(order):
+        start_j = start_times[j]
+        end_j = end_times[j]
+        
+        while active and active[0][0] <= start_j:
+            heapq.heappop(active)
+        
+        duration_j = end_j - start_j
+        for end_i, position_i, i, duration_i in active:
+            # Active segments start no later than start_j and end after it
+            overlap_duration = (end_i if end_i < end_j else end_j) - start_j
+            if overlap_duration > 0:
+                shorter = duration_i if duration_i < duration_j else duration_j
+                if overlap_duration / shorter >= overlap_threshold:
+                    yield position_i, position, i, j
+        
+        heapq.heappush(active, (end_j, position, j, duration_j))
+
+
+def find_overlapping_pairs(
+    start_times: Sequence[float],
+    end_times: Sequence[float],
+    overlap_threshold: float = 0.5
+) -> List[Tuple[int, int]]:
+    """Find overlapping segment pairs with a sweep line
+    
+    Args:
+        start_times: Segment start times
+        end_times: Segment end times
+        overlap_threshold: Minimum overlap ratio (overlap / shorter duration)
+        
+    Returns:
+        Index pairs (i, j) into the inputs, where i comes first in start-time
+        order; pairs are ordered by i's then j's start-time position
+    """
+    pairs = sorted(_sweep_overlapping_pairs(start_times, end_times, overlap_threshold))
+    return [(i, j) for _, _, i, j in pairs]
+
+
 def detect_overlaps(matches: List[Match], overlap_threshold: float = 0.5) -> List[Tuple[Match, Match]]:
     """Detect overlapping segments
     
@@ -40,34 +280,22 @@ def detect_overlaps(matches: List[Match], overlap_threshold: float = 0.5) -> Lis
         overlap_threshold: Minimum overlap ratio to consider (0-1)
         
     Returns:
-        List of tuples containing overlapping matches
+        List of tuples containing overlapping matches (earlier start first)
     """
-    overlaps = []
-    sorted_matches = sorted(matches, key=lambda m: m.start_time)
-    
-    for i, match1 in enumerate(sorted_matches):
-        for match2 in sorted_matches[i+1:]:
-            # Calculate overlap
-            overlap_start = max(match1.start_time, match2.start_time)
-            overlap_end = min(match1.end_time, match2.end_time)
-            
-            if overlap_start < overlap_end:
-                overlap_duration = overlap_end - overlap_start
-                match1_duration = match1.end_time - match1.start_time
-                match2_duration = match2.end_time - match2.start_time
-                
-                # Calculate overlap ratio
-                overlap_ratio = overlap_duration / min(match1_duration, match2_duration)
-                
-                if overlap_ratio >= overlap_threshold:
-                    overlaps.append((match1, match2))
-    
-    return overlaps
+    pairs = find_overlapping_pairs(
+        [m.start_time for m in matches],
+        [m.end_time for m in matches],
+        overlap_threshold
+    )
+    return [(matches[i], matches[j]) for i, j in pairs]
 
 
 def remove_severe_overlaps(matches: List[Match], overlap_threshold: float = 0.7) -> List[Match]:
     """Remove matches with severe overlaps, keeping higher-scored ones
     
+    Matches are identified by their position in the list, so unrelated
+    matches sharing a segment_id are not removed together.
+    
     Args:
         matches: List of matches
         overlap_threshold: Overlap ratio threshold for removal
@@ -75,15 +303,19 @@ def remove_severe_overlaps(matches: List[Match], overlap_threshold: float = 0.7)
     Returns:
         List of matches with severe overlaps removed
     """
-    overlaps = detect_overlaps(matches, overlap_threshold)
-    to_remove_ids = set()
+    # Removal does not depend on pair order, so skip sorting the pairs
+    pairs = _sweep_overlapping_pairs(
+        [m.start_time for m in matches],
+        [m.end_time for m in matches],
+        overlap_threshold
+    )
+    to_remove = set()
     
-    for match1, match2 in overlaps:
+    for _, _, i, j in pairs:
         # Keep the match with higher similarity score
-        if match1.similarity_score >= match2.similarity_score:
-            to_remove_ids.add(match2.segment_id)
+        if matches[i].similarity_score >= matches[j].similarity_score:
+            to_remove.add(j)
         else:
-            to_remove_ids.add(match1.segment_id)
+            to_remove.add(i)
     
-    return [m for m in matches if m.segment_id not in to_remove_ids]
-
+    return [m for position, m in enumerate(matches) if position not in to_remove]
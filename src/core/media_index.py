@@ -0,0 +1,210 @@
+"""Cached media metadata and keyframe index per input file
+
+Probing a movie for its keyframes takes a full demux pass, so the result
+is stored once per file content, keyed by its SHA-256:
+
+    cache/media/
+      hashes.json          path -> size, mtime and content hash
+      <sha256>.json        duration, fps, resolution and keyframe times
+
+The content hash is recomputed only when the file's size or modification
+time changes, so a re-render of an unchanged movie costs one stat call.
+
+Stream-copy renders can only start a clip on a keyframe. snap_segments
+moves segment boundaries to the nearest keyframes and reports how far each
+boundary moved.
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.fingerprint import fingerprint_file
+
+
+MEDIA_INDEX_VERSION = "1.0"
+HASHES_FILE = "hashes.json"
+
+
+@dataclass
+class MediaInfo:
+    """Media metadata of one input file"""
+    file_hash: str
+    duration: float
+    fps: float
+    width: int
+    height: int
+    keyframes: np.ndarray = field(default_factory=lambda: np.empty(0))    # Sorted times in seconds
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MediaInfo":
+        return cls(
+            file_hash=data["file_hash"],
+            duration=float(data["duration"]),
+            fps=float(data["fps"]),
+            width=int(data["width"]),
+            height=int(data["height"]),
+            keyframes=np.asarray(data["keyframes"], dtype=np.float64)
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": MEDIA_INDEX_VERSION,
+            "file_hash": self.file_hash,
+            "duration": self.duration,
+            "fps": self.fps,
+            "width": self.width,
+            "height": self.height,
+            "keyframes": self.keyframes.tolist()
+        }
+
+
+class MediaIndex:
+    """Directory cache of MediaInfo keyed by file content hash"""
+    
+    def __init__(self, directory: Path):
+        """Open (or prepare) the media cache
+        
+        Args:
+            directory: Cache directory (created on first save)
+        """
+        self.directory = directory
+    
+    def file_hash(self, path: Path) -> str:
+        """Content hash of a file, reused while its size and mtime are unchanged"""
+        path = Path(path)
+        stat = path.stat()
+        key = str(path.resolve())
+        hashes = self._load_hashes()
+        
+        entry = hashes.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return entry["sha256"]
+        
+        digest = fingerprint_file(path)
+        hashes[key] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": digest}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / HASHES_FILE, 'w', encoding='utf-8') as f:
+            json.dump(hashes, f, indent=2)
+        return digest
+    
+    def get(self, file_hash: str) -> Optional[MediaInfo]:
+        """Cached media info for a content hash (None if missing or stale)"""
+        info_path = self.directory / f"{file_hash}.json"
+        if not info_path.exists():
+            return None
+        with open(info_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != MEDIA_INDEX_VERSION:
+            return None
+        return MediaInfo.from_dict(data)
+    
+    def put(self, info: MediaInfo) -> None:
+        """Store media info under its content hash"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / f"{info.file_hash}.json", 'w', encoding='utf-8') as f:
+            json.dump(info.to_dict(), f)
+    
+    def _load_hashes(self) -> Dict[str, Dict[str, Any]]:
+        hashes_path = self.directory / HASHES_FILE
+        if not hashes_path.exists():
+            return {}
+        with open(hashes_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+@dataclass
+class SnapReport:
+    """Keyframe-snapped segment boundaries and how far they moved"""
+    starts: np.ndarray
+    ends: np.ndarray
+    start_shifts: np.ndarray    # Snapped minus requested, in seconds
+    end_shifts: np.ndarray
+    
+    def to_dict(self) -> Dict[str, Any]:
+        shifts = np.abs(np.concatenate([self.start_shifts, self.end_shifts]))
+        return {
+            "max_boundary_shift": float(shifts.max()) if len(shifts) else 0.0,
+            "mean_boundary_shift": float(shifts.mean()) if len(shifts) else 0.0,
+            "duration_change": float(np.sum(self.end_shifts) - np.sum(self.start_shifts)),
+            "segments": [
+                {"start": start, "end": end, "start_shift": start_shift, "end_shift": end_shift}
+                for start, end, start_shift, end_shift in zip(
+                    self.starts.tolist(), self.ends.tolist(),
+                    self.start_shifts.tolist(), self.end_shifts.tolist()
+                )
+            ]
+        }
+
+
+def nearest_points(points: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Nearest of the sorted points for every value (earlier point on ties)"""
+    right = np.clip(np.searchsorted(points, values), 1, len(points) - 1)
+    left = right - 1
+    take_left = np.abs(values - points[left]) <= np.abs(points[right] - values)
+    return np.where(take_left, points[left], points[right])
+
+
+def snap_segments(
+    starts: Sequence[float],
+    ends: Sequence[float],
+    keyframes: np.ndarray,
+    duration: float
+) -> SnapReport:
+    """Snap segment boundaries to the nearest keyframes
+    
+    Starts snap to keyframes; ends snap to keyframes or the end of the
+    file. A segment whose ends would meet is extended to the next boundary
+    after its start; a segment starting on the last boundary ends there and
+    starts on the previous keyframe instead. No segment becomes empty
+    unless the media has no second boundary at all.
+    
+    Args:
+        starts: Segment start times in seconds
+        ends: Segment end times in seconds
+        keyframes: Sorted keyframe times in seconds
+        duration: Media duration in seconds
+    
+    Returns:
+        SnapReport with snapped boundaries and shifts
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    keyframes = np.asarray(keyframes, dtype=np.float64)
+    if len(keyframes) == 0:
+        keyframes = np.zeros(1)
+    boundaries = np.unique(np.append(keyframes, duration))
+    
+    if len(keyframes) == 1:
+        snapped_starts = np.full(len(starts), keyframes[0])
+    else:
+        snapped_starts = nearest_points(keyframes, starts)
+    if len(boundaries) == 1:
+        snapped_ends = np.full(len(ends), boundaries[0])
+    else:
+        snapped_ends = nearest_points(boundaries, ends)
+    
+    empty = snapped_ends <= snapped_starts
+    after = np.searchsorted(boundaries, snapped_starts, side='right')
+    at_last = empty & (after == len(boundaries))
+    next_boundary = boundaries[np.minimum(after, len(boundaries) - 1)]
+    previous_keyframe = keyframes[np.maximum(np.searchsorted(keyframes, snapped_starts, side='left') - 1, 0)]
+    snapped_ends = np.where(empty, np.where(at_last, snapped_starts, next_boundary), snapped_ends)
+    snapped_starts = np.where(at_last, previous_keyframe, snapped_starts)
+    
+    return SnapReport(
+        starts=snapped_starts,
+        ends=snapped_ends,
+        start_shifts=snapped_starts - starts,
+        end_shifts=snapped_ends - ends
+    )
+
+
+def segment_bounds(segments: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end columns of timeline segments"""
+    starts = np.fromiter((seg.start for seg in segments), dtype=np.float64, count=len(segments))
+    ends = np.fromiter((seg.end for seg in segments), dtype=np.float64, count=len(segments))
+    return starts, ends
@@ -0,0 +1,460 @@
+"""Render cost estimation for the render stage's dry run
+
+A render's cost is predicted from the movie's cached metadata (fps,
+resolution, keyframes) and a throughput profile of the host:
+
+    decode    frames from the keyframe before each segment start to the
+              segment end (input-side seeking), at the source resolution
+    encode    frames of each segment at the output resolution, plus one
+              encode per output variant
+    overhead  one ffmpeg start per process, stream-copy joins and the
+              narration encode
+
+Throughput is measured in megapixels per second, so one profile covers
+every resolution. Without a calibrated profile (scripts/calibrate_encoder.py)
+conservative defaults are used and the plan says so.
+
+Every strategy is estimated, so a scheduler can compare them:
+
+    single    one filter graph (groups of group_size segments, joined by
+              stream copy)
+    parallel  one clip per segment on `workers` processes, scheduled
+              longest first; cached clips cost nothing
+    fast      stream copy of keyframe-snapped segments (no video encode)
+"""
+
+import heapq
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+PROFILE_VERSION = "1"
+
+# Uncalibrated defaults: whole-host x264 throughput in megapixels per second
+# per CPU core (1080p is about 2.1 megapixels per frame)
+DEFAULT_PRESET_MPPS_PER_CORE = {
+    "ultrafast": 120.0,
+    "superfast": 80.0,
+    "veryfast": 50.0,
+    "faster": 30.0,
+    "fast": 22.0,
+    "medium": 16.0,
+    "slow": 8.0
+}
+DEFAULT_DECODE_MPPS_PER_CORE = 150.0
+DEFAULT_PROCESS_OVERHEAD = 0.1    # Seconds to start ffmpeg and open the inputs
+DEFAULT_COPY_SPEED = 500.0        # Media seconds per second for stream copy
+DEFAULT_AUDIO_SPEED = 100.0       # Media seconds per second for the narration AAC encode
+
+STRATEGIES = {"single": "single graph", "parallel": "parallel clips", "fast": "stream copy"}
+
+
+@dataclass
+class EncoderThroughput:
+    """Measured throughput of one encoder configuration"""
+    preset: str
+    threads: int                    # Encoder threads per process
+    processes: int                  # Concurrent ffmpeg processes
+    mpps: float                     # Aggregate encoded megapixels per second
+    crf: int = 18
+    quality: Optional[float] = None    # Mean SSIM against the source, if measured
+    bitrate_kbps: Optional[float] = None    # Bitrate of the calibration encode
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EncoderThroughput":
+        return cls(
+            preset=data["preset"],
+            threads=int(data["threads"]),
+            processes=int(data["processes"]),
+            mpps=float(data["mpps"]),
+            crf=int(data.get("crf", 18)),
+            quality=data.get("quality"),
+            bitrate_kbps=data.get("bitrate_kbps")
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "preset": self.preset,
+            "threads": self.threads,
+            "processes": self.processes,
+            "mpps": self.mpps,
+            "crf": self.crf,
+            "quality": self.quality,
+            "bitrate_kbps": self.bitrate_kbps
+        }
+
+
+@dataclass
+class ThroughputProfile:
+    """Decode, encode and stream-copy throughput of a host"""
+    cpu_count: int
+    decode_mpps: float                 # Decoded megapixels per second (whole host)
+    process_overhead: float = DEFAULT_PROCESS_OVERHEAD
+    copy_speed: float = DEFAULT_COPY_SPEED
+    audio_speed: float = DEFAULT_AUDIO_SPEED
+    encoders: List[EncoderThroughput] = field(default_factory=list)
+    calibrated: bool = False
+    
+    @classmethod
+    def default(cls, cpu_count: int) -> "ThroughputProfile":
+        """Uncalibrated profile scaled to the core count"""
+        cpu_count = max(1, cpu_count)
+        return cls(
+            cpu_count=cpu_count,
+            decode_mpps=DEFAULT_DECODE_MPPS_PER_CORE * cpu_count,
+            encoders=[
+                EncoderThroughput(preset=preset, threads=cpu_count, processes=1, mpps=mpps * cpu_count)
+                for preset, mpps in DEFAULT_PRESET_MPPS_PER_CORE.items()
+            ]
+        )
+    
+    @classmethod
+    def load(cls, path: Path, cpu_count: int) -> "ThroughputProfile":
+        """Calibrated profile from path, or the default if missing or stale"""
+        if not path.exists():
+            return cls.default(cpu_count)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != PROFILE_VERSION or not data.get("encoders"):
+            return cls.default(cpu_count)
+        return cls.from_dict(data)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ThroughputProfile":
+        return cls(
+            cpu_count=int(data["cpu_count"]),
+            decode_mpps=float(data["decode_mpps"]),
+            process_overhead=float(data.get("process_overhead", DEFAULT_PROCESS_OVERHEAD)),
+            copy_speed=float(data.get("copy_speed", DEFAULT_COPY_SPEED)),
+            audio_speed=float(data.get("audio_speed", DEFAULT_AUDIO_SPEED)),
+            encoders=[EncoderThroughput.from_dict(e) for e in data["encoders"]],
+            calibrated=bool(data.get("calibrated", True))
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": PROFILE_VERSION,
+            "cpu_count": self.cpu_count,
+            "decode_mpps": self.decode_mpps,
+            "process_overhead": self.process_overhead,
+            "copy_speed": self.copy_speed,
+            "audio_speed": self.audio_speed,
+            "encoders": [e.to_dict() for e in self.encoders],
+            "calibrated": self.calibrated
+        }
+    
+    def save(self, path: Path) -> None:
+        """Write the profile as JSON"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+    
+    def encode_mpps(self, preset: str, processes: int = 1, crf: Optional[int] = None) -> float:
+        """Aggregate encode throughput of a preset on `processes` processes
+        
+        Uses the measurement with the nearest process count (then the
+        nearest CRF, if given); presets that were not measured fall back to
+        the default per-core rates, scaled by how the measured presets
+        compare to their defaults.
+        """
+        measured = [e for e in self.encoders if e.preset == preset]
+        if measured:
+            return min(measured, key=lambda e: (
+                abs(e.processes - processes), 0 if crf is None else abs(e.crf - crf), -e.mpps
+            )).mpps
+        
+        default_rate = DEFAULT_PRESET_MPPS_PER_CORE.get(preset, DEFAULT_PRESET_MPPS_PER_CORE["medium"])
+        ratios = [
+            e.mpps / (DEFAULT_PRESET_MPPS_PER_CORE[e.preset] * self.cpu_count)
+            for e in self.encoders if e.preset in DEFAULT_PRESET_MPPS_PER_CORE
+        ]
+        scale = float(np.median(ratios)) if ratios else 1.0
+        return default_rate * self.cpu_count * scale
+
+
+def choose_encoder(
+    profile: ThroughputProfile,
+    quality_target: float,
+    parallel: bool = False,
+    max_bitrate_kbps: Optional[float] = None
+) -> Optional[EncoderThroughput]:
+    """Fastest measured configuration whose SSIM meets quality_target
+    
+    For every preset and process count only the highest qualifying CRF is
+    considered: lower CRFs mostly buy quality with file size, and would
+    otherwise win on measurement noise alone. Fast presets reach a target
+    with larger files, so max_bitrate_kbps (compared with the bitrate of
+    the calibration encode) bounds how far speed may trade against size.
+    
+    Args:
+        profile: Calibrated host profile
+        quality_target: Minimum mean SSIM (0-1)
+        parallel: Consider every process count (parallel clips) instead of
+            single-process configurations only
+        max_bitrate_kbps: Optional maximum calibration bitrate
+    
+    Returns:
+        Fastest qualifying configuration, or None if none qualifies
+    """
+    highest_crf = {}
+    for e in profile.encoders:
+        if e.quality is None or e.quality < quality_target or not (parallel or e.processes == 1):
+            continue
+        if max_bitrate_kbps is not None and (e.bitrate_kbps is None or e.bitrate_kbps > max_bitrate_kbps):
+            continue
+        key = (e.preset, e.processes)
+        if key not in highest_crf or e.crf > highest_crf[key].crf:
+            highest_crf[key] = e
+    if not highest_crf:
+        return None
+    return max(highest_crf.values(), key=lambda e: e.mpps)
+
+
+@dataclass
+class SegmentCosts:
+    """Per-segment work and time, one entry per timeline segment"""
+    decode_frames: np.ndarray
+    encode_frames: np.ndarray
+    decode_seconds: np.ndarray
+    encode_seconds: np.ndarray
+    
+    def to_dict(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "decode_frames": int(round(df)),
+                "encode_frames": int(round(ef)),
+                "decode_seconds": ds,
+                "encode_seconds": es
+            }
+            for df, ef, ds, es in zip(
+                self.decode_frames.tolist(), self.encode_frames.tolist(),
+                self.decode_seconds.tolist(), self.encode_seconds.tolist()
+            )
+        ]
+
+
+@dataclass
+class RenderPlan:
+    """Predicted cost of a render"""
+    strategy: str                      # single, parallel or fast
+    predicted_wall_seconds: float
+    decode_seconds: float
+    encode_seconds: float
+    overhead_seconds: float
+    output_duration: float
+    processes: int                     # ffmpeg processes started
+    alternatives: Dict[str, float]     # Predicted wall seconds of every strategy
+    segments: SegmentCosts
+    calibrated: bool
+    details: Dict[str, Any] = field(default_factory=dict)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.strategy,
+            "strategy_name": STRATEGIES[self.strategy],
+            "predicted_wall_seconds": self.predicted_wall_seconds,
+            "decode_seconds": self.decode_seconds,
+            "encode_seconds": self.encode_seconds,
+            "overhead_seconds": self.overhead_seconds,
+            "output_duration": self.output_duration,
+            "processes": self.processes,
+            "alternatives": self.alternatives,
+            "calibrated_profile": self.calibrated,
+            **self.details,
+            "segments": self.segments.to_dict()
+        }
+
+
+def output_frame_size(width: int, height: int, max_height: Optional[int]) -> Tuple[int, int]:
+    """Frame size after downscaling to max_height (even width, keeps aspect)"""
+    if not max_height or height <= max_height:
+        return width, height
+    scaled_width = int(round(width * max_height / height / 2)) * 2
+    return scaled_width, max_height
+
+
+def seek_decode_frames(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    keyframes: np.ndarray,
+    fps: float
+) -> np.ndarray:
+    """Frames decoded per segment when seeking to the keyframe before its start"""
+    if len(keyframes) == 0:
+        keyframes = np.zeros(1)
+    before = np.searchsorted(keyframes, starts, side='right') - 1
+    seek_points = keyframes[np.maximum(before, 0)]
+    return np.maximum(ends - np.minimum(seek_points, starts), 0.0) * fps
+
+
+def longest_first_makespan(durations: np.ndarray, workers: int) -> float:
+    """Wall time of jobs on `workers` workers, longest job first to the least loaded"""
+    if len(durations) == 0:
+        return 0.0
+    loads = [0.0] * min(workers, len(durations))
+    for duration in np.sort(durations)[::-1].tolist():
+        heapq.heappush(loads, heapq.heappop(loads) + duration)
+    return max(loads)
+
+
+def estimate_segments(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    keyframes: np.ndarray,
+    fps: float,
+    source_size: Tuple[int, int],
+    output_size: Tuple[int, int],
+    output_fps: float,
+    decode_mpps: float,
+    encode_mpps: float
+) -> SegmentCosts:
+    """Decode and encode work of every segment at the given throughputs"""
+    decode_frames = seek_decode_frames(starts, ends, keyframes, fps)
+    encode_frames = (ends - starts) * output_fps
+    source_mp = source_size[0] * source_size[1] / 1e6
+    output_mp = output_size[0] * output_size[1] / 1e6
+    return SegmentCosts(
+        decode_frames=decode_frames,
+        encode_frames=encode_frames,
+        decode_seconds=decode_frames * source_mp / decode_mpps,
+        encode_seconds=encode_frames * output_mp / encode_mpps
+    )
+
+
+def plan_render(
+    starts: Sequence[float],
+    ends: Sequence[float],
+    media: Any,
+    profile: ThroughputProfile,
+    strategy: str = "single",
+    preset: str = "veryfast",
+    crf: Optional[int] = None,
+    max_height: Optional[int] = None,
+    max_fps: Optional[float] = None,
+    workers: Optional[int] = None,
+    group_size: int = 16,
+    cached: Optional[np.ndarray] = None,
+    variant_sizes: Sequence[Tuple[int, int]] = ()
+) -> RenderPlan:
+    """Estimate a render with every strategy and report the requested one
+    
+    Args:
+        starts: Segment start times in seconds
+        ends: Segment end times in seconds
+        media: Media metadata of the input (fps, width, height, keyframes)
+        profile: Host throughput profile
+        strategy: Strategy the render will use (single, parallel or fast)
+        preset: x264 preset of the render
+        crf: x264 CRF of the render (picks the nearest calibrated CRF)
+        max_height: Output height cap (proxy renders)
+        max_fps: Output frame rate cap (proxy renders)
+        workers: Concurrent processes in parallel mode (default: CPU count)
+        group_size: Maximum segments per filter graph in single mode
+        cached: Per-segment mask of clips already in the clip cache
+        variant_sizes: Frame sizes of additional output variants
+    
+    Returns:
+        RenderPlan of the requested strategy, with every strategy's
+        predicted wall time in alternatives
+    
+    Raises:
+        ValueError: If the strategy is unknown
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown render strategy: {strategy}")
+    
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    n_segments = len(starts)
+    output_duration = float(np.sum(ends - starts))
+    source_size = (media.width, media.height)
+    output_size = output_frame_size(media.width, media.height, max_height)
+    output_fps = min(media.fps, max_fps) if max_fps else media.fps
+    overhead = profile.process_overhead
+    copy_seconds = output_duration / profile.copy_speed
+    audio_seconds = output_duration / profile.audio_speed
+    
+    # Variants re-encode the whole output once more (parallel mode also
+    # decodes the assembled master again)
+    variant_mp = sum(w * h for w, h in variant_sizes) / 1e6
+    variant_encode = output_duration * output_fps * variant_mp / profile.encode_mpps(preset, 1, crf)
+    master_decode = output_duration * output_fps * output_size[0] * output_size[1] / 1e6 / profile.decode_mpps
+    
+    estimates = {}
+    
+    # Single graph, groups joined by stream copy
+    single = estimate_segments(
+        starts, ends, media.keyframes, media.fps, source_size, output_size, output_fps,
+        profile.decode_mpps, profile.encode_mpps(preset, 1, crf)
+    )
+    n_groups = max(1, -(-n_segments // max(1, group_size)))
+    single_overhead = overhead * n_groups + audio_seconds
+    if n_groups > 1:
+        single_overhead += overhead + copy_seconds + (overhead + master_decode if variant_sizes else 0.0)
+    estimates["single"] = (
+        single,
+        float(single.decode_seconds.sum()),
+        float(single.encode_seconds.sum()) + variant_encode,
+        single_overhead,
+        n_groups + int(n_groups > 1) + int(n_groups > 1 and bool(variant_sizes)),
+        {"groups": n_groups}
+    )
+    
+    # Parallel clips on shared cores: each clip runs at 1/workers of the
+    # aggregate throughput
+    n_workers = max(1, min(workers or profile.cpu_count, max(n_segments, 1)))
+    parallel = estimate_segments(
+        starts, ends, media.keyframes, media.fps, source_size, output_size, output_fps,
+        profile.decode_mpps, profile.encode_mpps(preset, n_workers, crf)
+    )
+    todo = np.ones(n_segments, dtype=bool) if cached is None else ~np.asarray(cached, dtype=bool)
+    clip_seconds = (overhead + (parallel.decode_seconds + parallel.encode_seconds) * n_workers)[todo]
+    makespan = longest_first_makespan(clip_seconds, n_workers)
+    clip_work = float(np.sum(parallel.decode_seconds[todo] + parallel.encode_seconds[todo]))
+    parallel_overhead = makespan - clip_work + overhead + copy_seconds + audio_seconds
+    parallel_decode = float(parallel.decode_seconds[todo].sum())
+    if variant_sizes:
+        parallel_overhead += overhead
+        parallel_decode += master_decode
+    estimates["parallel"] = (
+        parallel,
+        parallel_decode,
+        float(parallel.encode_seconds[todo].sum()) + variant_encode,
+        parallel_overhead,
+        int(todo.sum()) + 1 + int(bool(variant_sizes)),
+        {"workers": n_workers, "cached_clips": int(n_segments - todo.sum())}
+    )
+    
+    # Stream copy: no decode or encode
+    zeros = np.zeros(n_segments)
+    estimates["fast"] = (
+        SegmentCosts(zeros, zeros, zeros, zeros),
+        0.0,
+        0.0,
+        overhead + copy_seconds + audio_seconds,
+        1,
+        {}
+    )
+    
+    alternatives = {
+        name: decode + encode + extra
+        for name, (_, decode, encode, extra, _, _) in estimates.items()
+    }
+    segments, decode, encode, extra, processes, details = estimates[strategy]
+    return RenderPlan(
+        strategy=strategy,
+        predicted_wall_seconds=alternatives[strategy],
+        decode_seconds=decode,
+        encode_seconds=encode,
+        overhead_seconds=extra,
+        output_duration=output_duration,
+        processes=processes,
+        alternatives=alternatives,
+        segments=segments,
+        calibrated=profile.calibrated,
+        details=details
+    )
@@ -0,0 +1,172 @@
+"""Per-chunk scene weights and editor priorities
+
+The index stage derives a base weight for every movie chunk from its
+subtitle statistics and stores the table next to the index:
+
+    dialogue density   share of the chunk covered by subtitles; the match
+                       is based on that text, so denser chunks are more
+                       reliable (0.75 at no dialogue to 1.25 when covered)
+    word rate          words per second relative to the movie median;
+                       faster-than-median speech is usually rapid cutting
+                       between speakers and is damped
+    duration           chunks shorter than the preferred clip length are
+                       damped in proportion (down to half weight)
+
+Editors refine the table in project.json with scene_weight_overrides,
+applied at timeline time without re-indexing:
+
+    [{"start": 120.0, "end": 180.0, "weight": 1.5, "priority": 8},
+     {"segment_id": "movie_000042", "weight": 0.0}]
+
+A time-range override applies to every chunk overlapping the range; a
+weight replaces the base weight (0 excludes the chunk from selection)
+and a priority (1-10, higher is more important) marks the chunk for
+priority-aware budget trimming. The timeline stage only applies the table
+with options.scene_weights enabled.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+SCENE_WEIGHTS_VERSION = "1.0"
+
+MIN_WEIGHT = 0.25
+MAX_WEIGHT = 2.0
+PREFERRED_MIN_DURATION = 3.0    # Seconds; shorter chunks are damped
+WORD_RATE_DAMPING = 0.5         # Damping per median word rate above the median
+NO_PRIORITY = 0                 # Priority column value for "not set"
+
+
+def compute_scene_weights(
+    durations: Sequence[float],
+    word_counts: Sequence[float],
+    speech_seconds: Sequence[float]
+) -> np.ndarray:
+    """Derive base scene weights from chunk statistics
+    
+    Args:
+        durations: Chunk durations in seconds
+        word_counts: Words per chunk
+        speech_seconds: Seconds of each chunk covered by subtitles
+    
+    Returns:
+        Weight per chunk in [MIN_WEIGHT, MAX_WEIGHT]
+    """
+    durations = np.asarray(durations, dtype=np.float64)
+    word_counts = np.asarray(word_counts, dtype=np.float64)
+    speech_seconds = np.asarray(speech_seconds, dtype=np.float64)
+    if len(durations) == 0:
+        return np.empty(0)
+    
+    safe_durations = np.maximum(durations, 1e-6)
+    density = np.clip(speech_seconds / safe_durations, 0.0, 1.0)
+    word_rate = word_counts / safe_durations
+    median_rate = float(np.median(word_rate)) or 1.0
+    
+    density_factor = 0.75 + 0.5 * density
+    rate_factor = 1.0 / (1.0 + WORD_RATE_DAMPING * np.maximum(word_rate / median_rate - 1.0, 0.0))
+    duration_factor = np.clip(durations / PREFERRED_MIN_DURATION, 0.5, 1.0)
+    
+    return np.clip(density_factor * rate_factor * duration_factor, MIN_WEIGHT, MAX_WEIGHT)
+
+
+@dataclass
+class SceneWeightTable:
+    """Weight and priority per movie chunk (parallel columns)"""
+    segment_ids: List[str]
+    start_times: np.ndarray
+    end_times: np.ndarray
+    weights: np.ndarray
+    priorities: np.ndarray    # int, NO_PRIORITY where not set
+    
+    def __len__(self) -> int:
+        return len(self.segment_ids)
+    
+    @classmethod
+    def load(cls, path: Path) -> "SceneWeightTable":
+        """Load table written by save()"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(
+            segment_ids=data["segment_ids"],
+            start_times=np.asarray(data["start_time"], dtype=np.float64),
+            end_times=np.asarray(data["end_time"], dtype=np.float64),
+            weights=np.asarray(data["weight"], dtype=np.float64),
+            priorities=np.full(len(data["segment_ids"]), NO_PRIORITY, dtype=np.int64)
+        )
+    
+    def save(self, path: Path, extra: Optional[Dict[str, Any]] = None) -> None:
+        """Save base weights as JSON (priorities only come from overrides)
+        
+        Args:
+            path: Output file
+            extra: Additional fields (e.g. index fingerprint, chunk stats)
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": SCENE_WEIGHTS_VERSION,
+            "segment_ids": list(self.segment_ids),
+            "start_time": self.start_times.tolist(),
+            "end_time": self.end_times.tolist(),
+            "weight": self.weights.tolist()
+        }
+        if extra:
+            data.update(extra)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+    
+    def with_overrides(self, overrides: Optional[List[Dict[str, Any]]]) -> "SceneWeightTable":
+        """Apply editor overrides (later overrides win)
+        
+        Args:
+            overrides: Override entries with segment_id or start/end, and
+                weight and/or priority
+        
+        Returns:
+            New table
+        
+        Raises:
+            ValueError: If an override has neither segment_id nor start/end,
+                or a priority outside 1-10
+        """
+        weights = self.weights.copy()
+        priorities = self.priorities.copy()
+        positions = {segment_id: i for i, segment_id in enumerate(self.segment_ids)}
+        
+        for override in overrides or []:
+            if "segment_id" in override:
+                position = positions.get(override["segment_id"])
+                rows = np.asarray([] if position is None else [position], dtype=np.int64)
+            elif "start" in override and "end" in override:
+                rows = np.flatnonzero(
+                    (self.start_times < override["end"]) & (self.end_times > override["start"])
+                )
+            else:
+                raise ValueError(f"Scene weight override needs segment_id or start/end: {override}")
+            
+            if override.get("weight") is not None:
+                weights[rows] = float(override["weight"])
+            if override.get("priority") is not None:
+                priority = int(override["priority"])
+                if not 1 <= priority <= 10:
+                    raise ValueError(f"Scene priority must be between 1 and 10: {override}")
+                priorities[rows] = priority
+        
+        return SceneWeightTable(self.segment_ids, self.start_times, self.end_times, weights, priorities)
+    
+    def weight_map(self) -> Dict[str, float]:
+        """Weight keyed by segment_id"""
+        return dict(zip(self.segment_ids, self.weights.tolist()))
+    
+    def priority_map(self) -> Dict[str, int]:
+        """Priority keyed by segment_id (only chunks with a priority)"""
+        return {
+            segment_id: priority
+            for segment_id, priority in zip(self.segment_ids, self.priorities.tolist())
+            if priority != NO_PRIORITY
+        }
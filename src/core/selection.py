@@ -0,0 +1,405 @@
+"""Exact segment selection over narration intervals
+
+Dynamic programming: every narration interval picks one of its candidates
+or is skipped, maximizing total similarity subject to the minimum
+movie-time gap between consecutive picked segments.
+
+Skipped intervals are free, so the best path ending in a pick is its score
+plus the best path ending in any earlier pick whose center is at least
+min_time_gap away (or the empty path). The gap constraint only depends on
+the last pick's center, so the best value per distinct center is all the
+state that needs to be kept; two Fenwick trees over the sorted centers
+answer "best earlier pick at least min_time_gap below / above" in
+O(log D). The whole pass is O(N log D) for N candidates with D distinct
+centers, and the result is optimal (no state pruning).
+
+Without segment reuse the problem no longer has this structure;
+select_without_reuse searches it by branch and bound over the DP above,
+which is exact unless the search runs out of its DP budget.
+
+Candidates are stored ragged: interval t owns the flat slots
+offsets[t]:offsets[t + 1], so intervals with many candidates don't pad
+every other interval.
+"""
+
+import heapq
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.matching import Match
+
+
+logger = logging.getLogger(__name__)
+
+MAX_NO_REUSE_SOLVES = 50     # DP runs of the exact no-reuse search before it settles
+BOUND_TOLERANCE = 1e-9       # Score difference below which a subproblem cannot improve
+
+
+class _PrefixMaxTree:
+    """Fenwick tree of the best (value, slot) over rank prefixes
+    
+    Plain lists and scalar loops: every interval only touches a handful of
+    candidates, where per-call NumPy overhead would dominate.
+    """
+    
+    def __init__(self, size: int):
+        self.size = size
+        # Node 0 is never written
+        self.value = [-np.inf] * (size + 1)
+        self.slot = [-1] * (size + 1)
+    
+    def query(self, count: int) -> Tuple[float, int]:
+        """Best (value, slot) over ranks [0, count)"""
+        value, slot = -np.inf, -1
+        node = count
+        while node:
+            if self.value[node] > value:
+                value, slot = self.value[node], self.slot[node]
+            node &= node - 1
+        return value, slot
+    
+    def update(self, rank: int, value: float, slot: int) -> None:
+        """Raise the best value at a rank"""
+        node = rank + 1
+        while node <= self.size:
+            if value > self.value[node]:
+                self.value[node] = value
+                self.slot[node] = slot
+            node += node & -node
+
+
+def build_candidate_arrays(
+    interval_entries: List[int],
+    matches_by_narration: Dict[int, List[Match]]
+) -> Tuple[List[List[Match]], np.ndarray, np.ndarray, np.ndarray]:
+    """Build ragged candidate arrays for a sequence of intervals
+    
+    Args:
+        interval_entries: Narration entry index per interval
+        matches_by_narration: Dictionary mapping entry index to matches (best first)
+    
+    Returns:
+        Tuple of (candidates per interval, offsets (T + 1,), centers (N,),
+        scores (N,)); interval t owns slots offsets[t]:offsets[t + 1]
+    """
+    candidates = [matches_by_narration.get(entry_index, []) for entry_index in interval_entries]
+    
+    offsets = np.zeros(len(candidates) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(c) for c in candidates])
+    centers = np.array(
+        [(match.start_time + match.end_time) / 2.0 for matches in candidates for match in matches],
+        dtype=np.float64
+    )
+    scores = np.array(
+        [match.similarity_score for matches in candidates for match in matches],
+        dtype=np.float64
+    )
+    return candidates, offsets, centers, scores
+
+
+def dp_select(
+    offsets: np.ndarray,
+    centers: np.ndarray,
+    scores: np.ndarray,
+    min_time_gap: float = 30.0
+) -> np.ndarray:
+    """Pick one candidate (or skip) per interval maximizing total score
+    
+    Consecutive picks (ignoring skipped intervals) are at least
+    min_time_gap apart in movie time, measured between segment centers.
+    
+    Args:
+        offsets: Slot range per interval, shape (T + 1,)
+        centers: Candidate movie-time centers, shape (N,)
+        scores: Candidate scores, shape (N,); -inf marks unavailable slots
+        min_time_gap: Minimum movie-time gap between consecutive picks
+    
+    Returns:
+        Picked candidate index within its interval (-1 = skipped), shape (T,)
+    """
+    n_intervals = len(offsets) - 1
+    picks = np.full(n_intervals, -1, dtype=np.int64)
+    usable = scores > -np.inf
+    if n_intervals <= 0 or not usable.any():
+        return picks
+    
+    # Rank of every center, and how many ranks lie at least the gap below / above it
+    levels = np.unique(centers[usable])
+    n_levels = len(levels)
+    rank = np.searchsorted(levels, centers).tolist()
+    below = np.searchsorted(levels, centers - min_time_gap, side='right').tolist()
+    above = (n_levels - np.searchsorted(levels, centers + min_time_gap, side='left')).tolist()
+    lower = _PrefixMaxTree(n_levels)
+    upper = _PrefixMaxTree(n_levels)
+    
+    score_list = scores.tolist()
+    usable_list = usable.tolist()
+    bounds = offsets.tolist()
+    value = [-np.inf] * len(score_list)
+    previous = [-1] * len(score_list)
+    
+    for t in range(n_intervals):
+        slots = [slot for slot in range(bounds[t], bounds[t + 1]) if usable_list[slot]]
+        
+        # Query before inserting: only picks of earlier intervals are in the trees
+        for slot in slots:
+            best, best_slot = lower.query(below[slot])
+            above_value, above_slot = upper.query(above[slot])
+            if above_value > best:
+                best, best_slot = above_value, above_slot
+            # The empty path (nothing picked yet) is worth 0 and wins ties
+            if best <= 0.0:
+                best, best_slot = 0.0, -1
+            value[slot] = best + score_list[slot]
+            previous[slot] = best_slot
+        
+        for slot in slots:
+            lower.update(rank[slot], value[slot], slot)
+            upper.update(n_levels - 1 - rank[slot], value[slot], slot)
+    
+    slot = int(np.argmax(value))
+    if value[slot] <= 0.0:
+        return picks
+    
+    # Backtrack through the predecessor slots
+    interval_of = np.repeat(np.arange(n_intervals), np.diff(offsets))
+    while slot >= 0:
+        t = int(interval_of[slot])
+        picks[t] = slot - bounds[t]
+        slot = previous[slot]
+    
+    return picks
+
+
+def _picked_total(offsets: np.ndarray, scores: np.ndarray, picks: np.ndarray) -> Tuple[float, np.ndarray]:
+    """Total score and flat slots of a selection"""
+    picked_intervals = np.flatnonzero(picks >= 0)
+    slots = offsets[picked_intervals] + picks[picked_intervals]
+    return float(scores[slots].sum()), slots
+
+
+def _duplicated_slots(segment_ids: np.ndarray, slots: np.ndarray) -> Optional[np.ndarray]:
+    """Picked slots of the first segment that is picked more than once"""
+    picked_ids = segment_ids[slots]
+    unique_ids, counts = np.unique(picked_ids, return_counts=True)
+    duplicated = unique_ids[counts > 1]
+    if len(duplicated) == 0:
+        return None
+    return slots[picked_ids == duplicated[0]]
+
+
+def mask_duplicates(
+    segment_ids: np.ndarray,
+    offsets: np.ndarray,
+    centers: np.ndarray,
+    scores: np.ndarray,
+    min_time_gap: float = 30.0
+) -> np.ndarray:
+    """Fast reuse-free selection by masking duplicates (not always optimal)
+    
+    Re-solves with duplicates masked out: a segment picked more than once
+    keeps its highest-scoring use (earliest on ties) and is masked in every
+    other interval, until no segment is picked twice. Each round masks at
+    least one candidate, so the loop terminates.
+    
+    Args:
+        segment_ids: Integer segment identity per candidate, shape (N,)
+        offsets: Slot range per interval, shape (T + 1,)
+        centers: Candidate movie-time centers, shape (N,)
+        scores: Candidate scores, shape (N,)
+        min_time_gap: Minimum movie-time gap between consecutive picks
+    
+    Returns:
+        Picked candidate index within its interval (-1 = skipped), shape (T,)
+    """
+    scores = scores.copy()
+    
+    while True:
+        picks = dp_select(offsets, centers, scores, min_time_gap)
+        
+        picked_intervals = np.flatnonzero(picks >= 0)
+        picked_slots = offsets[picked_intervals] + picks[picked_intervals]
+        picked_ids = segment_ids[picked_slots]
+        unique_ids, counts = np.unique(picked_ids, return_counts=True)
+        duplicated = unique_ids[counts > 1]
+        if len(duplicated) == 0:
+            return picks
+        
+        for segment_id in duplicated.tolist():
+            used = picked_slots[picked_ids == segment_id]
+            # argmax returns the earliest interval on ties
+            keep = int(used[np.argmax(scores[used])])
+            mask = segment_ids == segment_id
+            mask[keep] = False
+            scores[mask] = -np.inf
+
+
+def select_without_reuse(
+    segment_ids: np.ndarray,
+    offsets: np.ndarray,
+    centers: np.ndarray,
+    scores: np.ndarray,
+    min_time_gap: float = 30.0,
+    max_solves: int = MAX_NO_REUSE_SOLVES
+) -> np.ndarray:
+    """Optimal DP selection where every movie segment is used at most once
+    
+    Branch and bound over the DP with reuse allowed, which bounds every
+    subproblem from above. A selection that picks a segment in slots P is
+    split into |P| subproblems, each keeping one slot of P and masking the
+    others (a reuse-free selection uses at most one of them). Subproblems
+    are solved best bound first, starting from the mask_duplicates
+    selection, and pruned once their bound cannot beat the best reuse-free
+    selection found. The result is optimal unless the search needs more
+    than max_solves DP runs; it then keeps the best selection found and
+    logs a warning.
+    
+    Args:
+        segment_ids: Integer segment identity per candidate, shape (N,)
+        offsets: Slot range per interval, shape (T + 1,)
+        centers: Candidate movie-time centers, shape (N,)
+        scores: Candidate scores, shape (N,)
+        min_time_gap: Minimum movie-time gap between consecutive picks
+        max_solves: Maximum DP runs of the search
+    
+    Returns:
+        Picked candidate index within its interval (-1 = skipped), shape (T,)
+    """
+    picks = dp_select(offsets, centers, scores, min_time_gap)
+    bound, slots = _picked_total(offsets, scores, picks)
+    duplicated = _duplicated_slots(segment_ids, slots)
+    if duplicated is None:
+        return picks
+    
+    best = mask_duplicates(segment_ids, offsets, centers, scores, min_time_gap)
+    best_total = _picked_total(offsets, scores, best)[0]
+    
+    # Heap of (-bound, tie breaker, masked slots, duplicated slots of the bound's selection)
+    heap = [(-bound, 0, (), duplicated)]
+    solves = 1
+    pushed = 1
+    while heap:
+        negative_bound, _, masked, duplicated = heapq.heappop(heap)
+        if -negative_bound <= best_total + BOUND_TOLERANCE:
+            break
+        
+        for keep in duplicated.tolist():
+            if solves >= max_solves:
+                logger.warning(
+                    "No-reuse selection stopped after %d DP runs; the result may be %.3f below the optimum",
+                    solves, -negative_bound - best_total
+                )
+                return best
+            
+            child_masked = masked + tuple(slot for slot in duplicated.tolist() if slot != keep)
+            child_scores = scores.copy()
+            child_scores[list(child_masked)] = -np.inf
+            child_picks = dp_select(offsets, centers, child_scores, min_time_gap)
+            solves += 1
+            
+            child_bound, child_slots = _picked_total(offsets, scores, child_picks)
+            if child_bound <= best_total + BOUND_TOLERANCE:
+                continue
+            child_duplicated = _duplicated_slots(segment_ids, child_slots)
+            if child_duplicated is None:
+                best, best_total = child_picks, child_bound
+            else:
+                heapq.heappush(heap, (-child_bound, pushed, child_masked, child_duplicated))
+                pushed += 1
+    
+    return best
+
+
+def select_candidates(
+    segment_ids: np.ndarray,
+    offsets: np.ndarray,
+    centers: np.ndarray,
+    scores: np.ndarray,
+    min_time_gap: float = 30.0,
+    allow_reuse: bool = True
+) -> np.ndarray:
+    """Pick one candidate (or skip) per interval, optionally without reuse
+    
+    Args:
+        segment_ids: Integer segment identity per candidate, shape (N,)
+        offsets: Slot range per interval, shape (T + 1,)
+        centers: Candidate movie-time centers, shape (N,)
+        scores: Candidate scores, shape (N,); -inf marks unavailable slots
+        min_time_gap: Minimum movie-time gap between consecutive picks
+        allow_reuse: Whether a segment may be picked in several intervals
+    
+    Returns:
+        Picked candidate index within its interval (-1 = skipped), shape (T,)
+    """
+    if allow_reuse:
+        return dp_select(offsets, centers, scores, min_time_gap)
+    return select_without_reuse(segment_ids, offsets, centers, scores, min_time_gap)
+
+
+def build_candidate_table(
+    interval_entries: np.ndarray,
+    entry_indices: np.ndarray,
+    similarity_scores: np.ndarray,
+    keep: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Build the ragged interval -> candidate row table
+    
+    Rows are grouped by narration entry and sorted best first (stable, so
+    ties keep input order), the same order as the grouped match lists.
+    
+    Args:
+        interval_entries: Narration entry index per interval, shape (T,)
+        entry_indices: Narration entry index per candidate row, shape (M,)
+        similarity_scores: Score per candidate row, shape (M,)
+        keep: Optional boolean mask of usable rows (e.g. above threshold)
+    
+    Returns:
+        Tuple of (offsets (T + 1,), rows (N,)); interval t's candidate rows
+        are rows[offsets[t]:offsets[t + 1]]
+    """
+    rows = np.arange(len(entry_indices)) if keep is None else np.flatnonzero(keep)
+    interval_entries = np.asarray(interval_entries, dtype=np.int64)
+    offsets = np.zeros(len(interval_entries) + 1, dtype=np.int64)
+    if len(rows) == 0 or len(interval_entries) == 0:
+        return offsets, np.empty(0, dtype=np.int64)
+    
+    rows = rows[np.lexsort((-similarity_scores[rows], entry_indices[rows]))]
+    group_entries, group_starts, group_sizes = np.unique(
+        entry_indices[rows], return_index=True, return_counts=True
+    )
+    
+    # Group of every interval (entries without candidates get size 0)
+    group = np.minimum(np.searchsorted(group_entries, interval_entries), len(group_entries) - 1)
+    found = group_entries[group] == interval_entries
+    sizes = np.where(found, group_sizes[group], 0)
+    offsets[1:] = np.cumsum(sizes)
+    
+    # Copy every interval's group slice into its slots
+    interval_of = np.repeat(np.arange(len(interval_entries)), sizes)
+    within = np.arange(offsets[-1]) - offsets[interval_of]
+    return offsets, rows[group_starts[group[interval_of]] + within]
+
+
+def table_candidate_arrays(
+    rows: np.ndarray,
+    start_times: np.ndarray,
+    end_times: np.ndarray,
+    similarity_scores: np.ndarray,
+    chunk_ids: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Gather selector inputs for the candidate rows of a table
+    
+    Args:
+        rows: Candidate row per slot, shape (N,)
+        start_times: Movie start time per candidate row
+        end_times: Movie end time per candidate row
+        similarity_scores: Score per candidate row
+        chunk_ids: Segment identity per candidate row
+    
+    Returns:
+        Tuple of (segment_ids, centers, scores), each shape (N,)
+    """
+    centers = (start_times[rows] + end_times[rows]) / 2.0
+    return chunk_ids[rows], centers, similarity_scores[rows]
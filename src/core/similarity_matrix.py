@@ -0,0 +1,330 @@
+"""Persisted narration x movie similarity matrix
+
+The search stage can store the similarity between every narration window
+and every movie chunk so candidates can be re-derived under new
+parameters (top-k, threshold) without the embedding model or ChromaDB.
+
+Two layouts are supported:
+- dense: float16 matrix of shape (windows, chunks)
+- topk: float16 scores and int32 chunk indices of shape (windows, k)
+
+Both are stored as memory-mapped .npy files next to a JSON manifest that
+records the index and embedding fingerprints they were computed from.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+MATRIX_VERSION = "1.0"
+MANIFEST_FILE = "manifest.json"
+SCORES_FILE = "scores.npy"
+INDICES_FILE = "indices.npy"
+WINDOWS_FILE = "windows.json"
+CHUNKS_FILE = "chunks.json"
+
+
+def compute_similarity_scores(query_embeddings: np.ndarray, chunk_embeddings: np.ndarray) -> np.ndarray:
+    """Compute similarity scores between query and chunk embeddings
+    
+    Uses the same convention as the search stage: similarity is
+    1 - squared L2 distance (ChromaDB's default distance), so scores
+    derived from the matrix match live query scores.
+    
+    Args:
+        query_embeddings: Array of shape (queries, dim)
+        chunk_embeddings: Array of shape (chunks, dim)
+    
+    Returns:
+        Array of shape (queries, chunks) with similarity scores
+    """
+    query_embeddings = np.asarray(query_embeddings, dtype=np.float32)
+    chunk_embeddings = np.asarray(chunk_embeddings, dtype=np.float32)
+    
+    query_norms = np.einsum('ij,ij->i', query_embeddings, query_embeddings)
+    chunk_norms = np.einsum('ij,ij->i', chunk_embeddings, chunk_embeddings)
+    squared_distances = query_norms[:, None] + chunk_norms[None, :] - 2.0 * (query_embeddings @ chunk_embeddings.T)
+    np.maximum(squared_distances, 0.0, out=squared_distances)
+    return 1.0 - squared_distances
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> tuple:
+    """Select the top-k scores of every row, sorted best first
+    
+    Args:
+        scores: Array of shape (rows, columns)
+        k: Number of entries to keep per row
+    
+    Returns:
+        Tuple of (indices, values), both of shape (rows, min(k, columns))
+    """
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.int32), empty.astype(scores.dtype)
+    
+    if k < scores.shape[1]:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind='stable')
+    indices = np.take_along_axis(part, order, axis=1).astype(np.int32)
+    values = np.take_along_axis(part_scores, order, axis=1)
+    return indices, values
+
+
+class SimilarityMatrixWriter:
+    """Writes a similarity matrix row block by row block
+    
+    Rows are written straight into a memory-mapped .npy file, so the full
+    matrix never has to be held in memory.
+    """
+    
+    def __init__(
+        self,
+        directory: Path,
+        n_windows: int,
+        chunk_ids: List[str],
+        chunk_starts: List[float],
+        chunk_ends: List[float],
+        kind: str = "dense",
+        top_k: int = 50,
+        chunk_spoiler_risks: Optional[List[float]] = None
+    ):
+        """Initialize writer
+        
+        Args:
+            directory: Directory to store the matrix in
+            n_windows: Number of narration windows (matrix rows)
+            chunk_ids: Movie chunk IDs (matrix columns)
+            chunk_starts: Movie chunk start times
+            chunk_ends: Movie chunk end times
+            kind: "dense" or "topk"
+            top_k: Entries kept per row in topk layout
+            chunk_spoiler_risks: Optional spoiler risk per movie chunk
+        """
+        if kind not in ("dense", "topk"):
+            raise ValueError(f"Unknown similarity matrix kind: {kind}")
+        
+        self.directory = directory
+        self.kind = kind
+        self.n_windows = n_windows
+        self.n_chunks = len(chunk_ids)
+        self.top_k = min(top_k, self.n_chunks) if kind == "topk" else self.n_chunks
+        self.chunk_ids = list(chunk_ids)
+        self.chunk_starts = [float(t) for t in chunk_starts]
+        self.chunk_ends = [float(t) for t in chunk_ends]
+        self.chunk_spoiler_risks = None
+        if chunk_spoiler_risks is not None:
+            self.chunk_spoiler_risks = [float(r) for r in chunk_spoiler_risks]
+        
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._scores = np.lib.format.open_memmap(
+            self.directory / SCORES_FILE,
+            mode='w+',
+            dtype=np.float16,
+            shape=(n_windows, self.top_k)
+        )
+        self._indices = None
+        if kind == "topk":
+            self._indices = np.lib.format.open_memmap(
+                self.directory / INDICES_FILE,
+                mode='w+',
+                dtype=np.int32,
+                shape=(n_windows, self.top_k)
+            )
+    
+    def write_rows(self, start_row: int, scores: np.ndarray) -> None:
+        """Write a block of full similarity rows
+        
+        Args:
+            start_row: Index of the first row in the block
+            scores: Array of shape (block_rows, chunks)
+        """
+        end_row = start_row + scores.shape[0]
+        if self.kind == "dense":
+            self._scores[start_row:end_row] = scores.astype(np.float16)
+        else:
+            indices, values = top_k_rows(scores, self.top_k)
+            self._scores[start_row:end_row] = values.astype(np.float16)
+            self._indices[start_row:end_row] = indices
+    
+    def close(self, windows: List[Dict[str, Any]], manifest_extra: Optional[Dict[str, Any]] = None) -> Path:
+        """Flush arrays and write window/chunk tables and manifest
+        
+        Args:
+            windows: One dict per row (narration_file_id, chunk_index, narration_time, narration_text)
+            manifest_extra: Additional manifest fields (fingerprints, collection name)
+        
+        Returns:
+            Path to the manifest file
+        """
+        self._scores.flush()
+        if self._indices is not None:
+            self._indices.flush()
+        
+        with open(self.directory / WINDOWS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(windows, f)
+        
+        chunks = {
+            "ids": self.chunk_ids,
+            "start_time": self.chunk_starts,
+            "end_time": self.chunk_ends
+        }
+        if self.chunk_spoiler_risks is not None:
+            chunks["spoiler_risk"] = self.chunk_spoiler_risks
+        with open(self.directory / CHUNKS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(chunks, f)
+        
+        manifest = {
+            "version": MATRIX_VERSION,
+            "kind": self.kind,
+            "shape": [self.n_windows, self.top_k],
+            "n_chunks": self.n_chunks,
+            "dtype": "float16"
+        }
+        if manifest_extra:
+            manifest.update(manifest_extra)
+        
+        manifest_path = self.directory / MANIFEST_FILE
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        
+        return manifest_path
+
+
+class SimilarityMatrix:
+    """Read-only view of a persisted similarity matrix"""
+    
+    def __init__(self, directory: Path):
+        """Open matrix stored in directory (arrays are memory-mapped)
+        
+        Args:
+            directory: Directory containing the manifest and arrays
+        """
+        self.directory = directory
+        with open(directory / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        
+        self.kind = self.manifest["kind"]
+        self.scores = np.load(directory / SCORES_FILE, mmap_mode='r')
+        self.indices = None
+        if self.kind == "topk":
+            self.indices = np.load(directory / INDICES_FILE, mmap_mode='r')
+        
+        with open(directory / WINDOWS_FILE, 'r', encoding='utf-8') as f:
+            self.windows = json.load(f)
+        
+        with open(directory / CHUNKS_FILE, 'r', encoding='utf-8') as f:
+            chunks = json.load(f)
+        self.chunk_ids = chunks["ids"]
+        self.chunk_starts = np.asarray(chunks["start_time"], dtype=np.float64)
+        self.chunk_ends = np.asarray(chunks["end_time"], dtype=np.float64)
+        self.chunk_spoiler_risks = None
+        if "spoiler_risk" in chunks:
+            self.chunk_spoiler_risks = np.asarray(chunks["spoiler_risk"], dtype=np.float64)
+    
+    @classmethod
+    def exists(cls, directory: Path) -> bool:
+        """Check whether a matrix is stored in directory"""
+        return (directory / MANIFEST_FILE).exists()
+    
+    def is_compatible(self, index_fingerprint: Optional[str], embedding_model: Optional[str]) -> bool:
+        """Check whether matrix was computed from the given index and model
+        
+        Args:
+            index_fingerprint: Current index fingerprint
+            embedding_model: Current embedding model name
+        
+        Returns:
+            True if both fingerprints match the stored ones
+        """
+        return (
+            self.manifest.get("index_fingerprint") == index_fingerprint
+            and self.manifest.get("embedding_model") == embedding_model
+        )
+    
+    @property
+    def max_k(self) -> int:
+        """Maximum number of candidates that can be derived per window"""
+        return self.scores.shape[1]
+    
+    def iter_candidates(
+        self,
+        k: int = 3,
+        threshold: Optional[float] = None,
+        block_size: int = 1024,
+        max_spoiler_risk: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Re-derive search candidates under new parameters
+        
+        Yields match dicts with the same fields the search stage writes,
+        processing rows in blocks so memory stays bounded.
+        
+        Args:
+            k: Number of candidates per narration window
+            threshold: Optional minimum similarity score
+            block_size: Rows processed per block
+            max_spoiler_risk: Optional maximum chunk spoiler risk; riskier
+                chunks are never returned (ignored if the matrix has no
+                spoiler scores)
+        
+        Yields:
+            Match dictionaries, best first within each window
+        """
+        k = min(k, self.max_k)
+        n_windows = self.scores.shape[0]
+        
+        blocked = None
+        if max_spoiler_risk is not None and self.chunk_spoiler_risks is not None:
+            blocked = self.chunk_spoiler_risks > max_spoiler_risk
+        
+        for start_row in range(0, n_windows, block_size):
+            end_row = min(start_row + block_size, n_windows)
+            block = np.asarray(self.scores[start_row:end_row], dtype=np.float32)
+            
+            allowed = None
+            if self.kind == "dense":
+                if blocked is not None:
+                    block[:, blocked] = -np.inf
+                chunk_indices, values = top_k_rows(block, k)
+                if blocked is not None:
+                    allowed = ~blocked[chunk_indices]
+            elif blocked is None:
+                # Rows are stored sorted best first
+                chunk_indices = np.asarray(self.indices[start_row:end_row, :k])
+                values = block[:, :k]
+            else:
+                # Move allowed chunks to the front of every row (stable, so
+                # they stay best first) and keep the first k
+                chunk_indices = np.asarray(self.indices[start_row:end_row])
+                allowed = ~blocked[chunk_indices]
+                order = np.argsort(~allowed, axis=1, kind='stable')[:, :k]
+                chunk_indices = np.take_along_axis(chunk_indices, order, axis=1)
+                values = np.take_along_axis(block, order, axis=1)
+                allowed = np.take_along_axis(allowed, order, axis=1)
+            
+            for row_offset in range(end_row - start_row):
+                window = self.windows[start_row + row_offset]
+                for rank in range(chunk_indices.shape[1]):
+                    if allowed is not None and not allowed[row_offset, rank]:
+                        break
+                    score = float(values[row_offset, rank])
+                    if threshold is not None and score < threshold:
+                        break
+                    chunk = int(chunk_indices[row_offset, rank])
+                    yield {
+                        "segment_id": self.chunk_ids[chunk],
+                        "start_time": float(self.chunk_starts[chunk]),
+                        "end_time": float(self.chunk_ends[chunk]),
+                        "similarity_score": score,
+                        "narration_text": window.get("narration_text"),
+                        "narration_file_id": window.get("narration_file_id"),
+                        "narration_time": window.get("narration_time"),
+                        "chunk_index": window.get("chunk_index"),
+                        "result_rank": rank
+                    }
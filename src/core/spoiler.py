@@ -0,0 +1,235 @@
+"""Spoiler-risk scoring for movie subtitle chunks
+
+Risk is computed once per chunk at index time from three signals:
+
+    position    relative position in the movie; 0 before the final act,
+                rising linearly to 1 at the end
+    lexicon     spoiler phrase hits per reason (deaths, twists, endings)
+    prototype   embedding similarity to spoiler prototype phrases
+
+Each signal s is scaled by its weight w and the results are combined as a
+noisy-OR, risk = 1 - prod(1 - w * s), so any single strong signal is
+enough to mark a chunk risky and agreeing signals reinforce each other.
+The reason reported is the spoiler reason with the strongest content
+signal (or "ending" when only the position signal fired).
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.core.similarity_matrix import compute_similarity_scores
+
+
+SPOILER_MODEL_VERSION = "1.1"
+
+# Chunk metadata keys written by the index stage
+RISK_KEY = "spoiler_risk"
+REASON_KEY = "spoiler_reason"
+CONFIDENCE_KEY = "spoiler_confidence"
+
+# Order defines the reason codes; must match SpoilerRisk.reason values
+SPOILER_REASONS = ("plot_twist", "ending", "character_death")
+
+# Multi-word phrases only: single words such as "dead", "secret" or
+# "finally" are everyday dialogue and would flag most of a movie
+SPOILER_LEXICON: Dict[str, List[str]] = {
+    "plot_twist": [
+        "it was you all along", "it was him all along", "it was her all along",
+        "i am your father", "i'm your father", "your real father", "your real mother",
+        "never really existed", "been lying to me the whole time", "working for them the whole time",
+        "a double agent"
+    ],
+    "ending": [
+        "it's finally over", "it is finally over", "this is the end of our",
+        "we finally did it", "happily ever after", "the war is over"
+    ],
+    "character_death": [
+        "he's dead", "she's dead", "he is dead", "she is dead", "they killed him",
+        "they killed her", "didn't survive", "passed away", "rest in peace",
+        "gathered here to mourn", "at his funeral", "at her funeral"
+    ]
+}
+
+SPOILER_PROTOTYPES: Dict[str, List[str]] = {
+    "plot_twist": [
+        "It was you all along.",
+        "I am your real father.",
+        "Everything you believed was a lie.",
+        "He was working for them the whole time."
+    ],
+    "ending": [
+        "It's finally over.",
+        "This is the end of our story.",
+        "Goodbye, my friend. We did it."
+    ],
+    "character_death": [
+        "He is dead.",
+        "She didn't survive.",
+        "They killed him.",
+        "We are gathered here to mourn her death."
+    ]
+}
+
+DEFAULT_FINAL_ACT_START = 0.75    # Relative movie position where the final act begins
+DEFAULT_POSITION_WEIGHT = 0.5
+DEFAULT_LEXICON_WEIGHT = 0.5      # One hit alone (0.25) stays below the default 0.3 threshold
+DEFAULT_PROTOTYPE_WEIGHT = 0.6
+PROTOTYPE_FLOOR = 0.2             # Similarity at which the prototype signal starts
+
+
+@dataclass
+class SpoilerScores:
+    """Per-chunk spoiler risk columns"""
+    risk: np.ndarray          # float64 in [0, 1]
+    reason: np.ndarray        # object, SpoilerRisk.reason values
+    confidence: np.ndarray    # float64 in [0, 1], share of signals that fired
+    
+    def __len__(self) -> int:
+        return len(self.risk)
+    
+    def to_metadata(self) -> List[Dict[str, object]]:
+        """Chunk metadata entries (one dict per chunk)"""
+        return [
+            {RISK_KEY: risk, REASON_KEY: reason, CONFIDENCE_KEY: confidence}
+            for risk, reason, confidence in zip(
+                self.risk.tolist(), self.reason.tolist(), self.confidence.tolist()
+            )
+        ]
+
+
+def position_risk(
+    times: Sequence[float],
+    movie_duration: float,
+    final_act_start: float = DEFAULT_FINAL_ACT_START
+) -> np.ndarray:
+    """Position signal: 0 before the final act, linear to 1 at the end
+    
+    Args:
+        times: Chunk times in seconds (e.g. center times)
+        movie_duration: Movie duration in seconds
+        final_act_start: Relative position where the final act begins
+    
+    Returns:
+        Array of position signals in [0, 1]
+    """
+    times = np.asarray(times, dtype=np.float64)
+    if movie_duration <= 0 or final_act_start >= 1.0:
+        return np.zeros(len(times))
+    relative = times / movie_duration
+    return np.clip((relative - final_act_start) / (1.0 - final_act_start), 0.0, 1.0)
+
+
+def lexicon_hits(texts: Sequence[str], lexicon: Optional[Dict[str, List[str]]] = None) -> np.ndarray:
+    """Count lexicon hits per spoiler reason
+    
+    Args:
+        texts: Chunk texts
+        lexicon: Keywords per reason (default SPOILER_LEXICON)
+    
+    Returns:
+        Integer array of shape (chunks, len(SPOILER_REASONS))
+    """
+    lexicon = SPOILER_LEXICON if lexicon is None else lexicon
+    hits = np.zeros((len(texts), len(SPOILER_REASONS)), dtype=np.int64)
+    
+    for r, reason in enumerate(SPOILER_REASONS):
+        keywords = lexicon.get(reason) or []
+        if not keywords:
+            continue
+        pattern = re.compile(
+            r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b",
+            re.IGNORECASE
+        )
+        hits[:, r] = [len(pattern.findall(text or "")) for text in texts]
+    
+    return hits
+
+
+def prototype_similarity(
+    chunk_embeddings: np.ndarray,
+    prototype_embeddings: Dict[str, np.ndarray]
+) -> np.ndarray:
+    """Best similarity of every chunk to the prototypes of each reason
+    
+    Args:
+        chunk_embeddings: Array of shape (chunks, dim)
+        prototype_embeddings: Prototype embeddings per reason, (phrases, dim)
+    
+    Returns:
+        Array of shape (chunks, len(SPOILER_REASONS)); -inf for reasons
+        without prototypes
+    """
+    chunk_embeddings = np.asarray(chunk_embeddings, dtype=np.float32)
+    best = np.full((len(chunk_embeddings), len(SPOILER_REASONS)), -np.inf)
+    
+    for r, reason in enumerate(SPOILER_REASONS):
+        prototypes = prototype_embeddings.get(reason)
+        if prototypes is None or len(prototypes) == 0 or len(chunk_embeddings) == 0:
+            continue
+        best[:, r] = compute_similarity_scores(chunk_embeddings, prototypes).max(axis=1)
+    
+    return best
+
+
+def score_spoiler_risk(
+    texts: Sequence[str],
+    times: Sequence[float],
+    movie_duration: float,
+    chunk_embeddings: Optional[np.ndarray] = None,
+    prototype_embeddings: Optional[Dict[str, np.ndarray]] = None,
+    final_act_start: float = DEFAULT_FINAL_ACT_START,
+    position_weight: float = DEFAULT_POSITION_WEIGHT,
+    lexicon_weight: float = DEFAULT_LEXICON_WEIGHT,
+    prototype_weight: float = DEFAULT_PROTOTYPE_WEIGHT,
+    lexicon: Optional[Dict[str, List[str]]] = None
+) -> SpoilerScores:
+    """Score spoiler risk for a set of chunks
+    
+    Args:
+        texts: Chunk texts
+        times: Chunk times in seconds (e.g. center times)
+        movie_duration: Movie duration in seconds
+        chunk_embeddings: Optional chunk embeddings, shape (chunks, dim)
+        prototype_embeddings: Optional prototype embeddings per reason; the
+            prototype signal is skipped unless both embeddings are given
+        final_act_start: Relative position where the final act begins
+        position_weight: Weight of the position signal
+        lexicon_weight: Weight of the lexicon signal
+        prototype_weight: Weight of the prototype signal
+        lexicon: Keywords per reason (default SPOILER_LEXICON)
+    
+    Returns:
+        SpoilerScores with one entry per chunk
+    """
+    position = position_risk(times, movie_duration, final_act_start)
+    # Every additional hit halves the remaining distance to 1
+    lexical = 1.0 - 0.5 ** lexicon_hits(texts, lexicon)
+    content = lexical
+    signals = [position_weight * position, lexicon_weight * lexical.max(axis=1, initial=0.0)]
+    
+    if chunk_embeddings is not None and prototype_embeddings:
+        similarity = prototype_similarity(chunk_embeddings, prototype_embeddings)
+        prototype = np.clip((similarity - PROTOTYPE_FLOOR) / (1.0 - PROTOTYPE_FLOOR), 0.0, 1.0)
+        content = np.maximum(content, prototype)
+        signals.append(prototype_weight * prototype.max(axis=1, initial=0.0))
+    
+    signals = np.clip(np.stack(signals, axis=1), 0.0, 1.0)
+    risk = 1.0 - np.prod(1.0 - signals, axis=1)
+    confidence = (signals > 0).mean(axis=1)
+    
+    reasons = np.array(SPOILER_REASONS, dtype=object)
+    reason = np.where(
+        content.max(axis=1, initial=0.0) > 0,
+        reasons[np.argmax(content, axis=1)],
+        np.where(position > 0, "ending", "none")
+    ).astype(object)
+    
+    return SpoilerScores(risk=risk, reason=reason, confidence=confidence)
+
+
+def spoiler_filter(risk_threshold: float) -> Dict[str, Dict[str, float]]:
+    """Vector store metadata filter keeping chunks at or below risk_threshold"""
+    return {RISK_KEY: {"$lte": float(risk_threshold)}}
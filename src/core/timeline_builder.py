@@ -1,11 +1,17 @@
 """Timeline JSON generation from matched segments"""
 
 import json
-from typing import List, Optional, Dict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
-from src.core.matching import Match
+import numpy as np
+from pydantic import TypeAdapter, ValidationError
+
+from src.core.matching import Match, MatchBatch
+from src.core.interval_index import IntervalIndex
+from src.core.selection import build_candidate_arrays, select_candidates
 from src.utils.srt_parser import SRTEntry
 from src.contracts.models.timeline import (
     Timeline,
@@ -15,6 +21,49 @@ from src.contracts.models.timeline import (
 )
 
 
+SEGMENT_WRITE_BATCH = 10_000  # Segments serialized per write in save_timeline_json
+
+_SEGMENT_LIST = TypeAdapter(List[Segment])
+
+
+def build_segments(matches: List[Match]) -> List[Segment]:
+    """Build timeline segments from matches with one bulk validation
+    
+    The segment values are collected as plain dicts and validated in a
+    single TypeAdapter call instead of one model construction per segment.
+    Scene weight and priority are copied when set on the match.
+    
+    Args:
+        matches: Matched segments
+        
+    Returns:
+        List of segments in match order
+        
+    Raises:
+        ValueError: If a match score or priority is out of range
+    """
+    values = [
+        {
+            "start": m.start_time,
+            "end": m.end_time,
+            "score": m.similarity_score,
+            "weight": None if m.weight is None else float(m.weight),
+            "priority": m.priority
+        }
+        for m in matches
+    ]
+    
+    try:
+        return _SEGMENT_LIST.validate_python(values)
+    except ValidationError as e:
+        error = e.errors()[0]
+        i = error["loc"][0]
+        field = ".".join(str(part) for part in error["loc"][1:])
+        raise ValueError(
+            f"Segment {i} ({matches[i].segment_id}): {field} {error['msg']}"
+        ) from None
+
+
 def build_timeline(
     matches: List[Match],
     input_video_path: str,
@@ -26,6 +75,9 @@ def build_timeline(
 ) -> Timeline:
     """Build Timeline JSON from matched segments
     
+    Only the timeline header (paths and metadata) goes through full
+    Pydantic validation; segments are validated in bulk by build_segments.
+    
     Args:
         matches: List of matched segments
         input_video_path: Path to input video file
@@ -38,15 +90,7 @@ def build_timeline(
     Returns:
         Timeline object ready for JSON serialization
     """
-    segments = []
-    
-    for match in matches:
-        segment = Segment(
-            start=match.start_time,
-            end=match.end_time,
-            score=match.similarity_score
-        )
-        segments.append(segment)
+    segments = build_segments(matches)
     
     metadata = None
     if project_id or movie_id or options:
@@ -58,24 +102,33 @@ def build_timeline(
             options=options
         )
     
-    timeline = Timeline(
+    return Timeline(
         input=input_video_path,
         narration=narration_audio_path,
         output=output_video_path,
         segments=segments,
         metadata=metadata
     )
-    
-    return timeline
 
 
-def save_timeline_json(timeline: Timeline, output_path: Path, minimal: bool = False) -> None:
+def save_timeline_json(
+    timeline: Timeline,
+    output_path: Path,
+    minimal: bool = False,
+    batch_size: int = SEGMENT_WRITE_BATCH
+) -> None:
     """Save timeline to JSON file
     
+    The full format is written in a streaming fashion: the header is
+    serialized once and the segments batch_size at a time, so large
+    timelines never exist as a single JSON string. The output is identical
+    to timeline.model_dump_json(indent=2, exclude_none=True).
+    
     Args:
         timeline: Timeline object
         output_path: Path to save JSON file
         minimal: If True, only include essential fields (backward compatible)
+        batch_size: Segments serialized per write
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
@@ -96,66 +149,227 @@ def save_timeline_json(timeline: Timeline, output_path: Path, minimal: bool = Fa
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(minimal_data, f, indent=2)
     else:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(timeline.model_dump_json(indent=2, exclude_none=True))
+        header = timeline.model_copy(update={"segments": []}).model_dump_json(indent=2, exclude_none=True)
+        write_timeline_json(
+            output_path,
+            header.encode('utf-8'),
+            timeline.segments,
+            lambda batch: _SEGMENT_LIST.dump_json(batch, indent=2, exclude_none=True),
+            batch_size
+        )
 
 
-def build_timeline_for_narration_intervals(
+def write_timeline_json(
+    output_path: Path,
+    header: bytes,
+    segments: Sequence[Any],
+    dump_batch: Callable[[Sequence[Any]], bytes],
+    batch_size: int = SEGMENT_WRITE_BATCH
+) -> None:
+    """Write timeline JSON, streaming the segments into a serialized header
+    
+    Args:
+        output_path: Path to save JSON file
+        header: Timeline serialized with indent=2 and an empty segments list
+        segments: Segments (models or dicts, whatever dump_batch accepts)
+        dump_batch: Serializes a list of segments as an indent=2 JSON array
+        batch_size: Segments serialized per write
+    """
+    before, marker, after = header.partition(b'\n  "segments": []')
+    if not marker or not segments:
+        with open(output_path, 'wb') as f:
+            f.write(header)
+        return
+    
+    with open(output_path, 'wb') as f:
+        f.write(before)
+        f.write(b'\n  "segments": [')
+        for offset in range(0, len(segments), batch_size):
+            if offset:
+                f.write(b',')
+            # Drop the array brackets and nest the items one level deeper
+            items = dump_batch(segments[offset:offset + batch_size])[1:-2]
+            f.write(items.replace(b'\n', b'\n  '))
+        f.write(b'\n  ]')
+        f.write(after)
+
+
+@dataclass
+class IntervalSelection:
+    """Result of interval-based match selection"""
+    matches: List[Match]          # Selected matches after copyright compliance filter
+    intervals: int = 0            # Narration intervals covered by a narration entry
+    intervals_with_candidates: int = 0
+    fallbacks: int = 0            # Intervals where no copyright-compliant match existed
+    dropped: int = 0              # Selected matches removed by the final compliance check
+    skipped: int = 0              # Intervals with candidates left empty by the DP selector
+    trimmed: int = 0              # Selected matches removed to fit max_duration
+
+
+def group_matches_by_narration_entry(
+    match_dicts: Iterable[Dict[str, Any]],
+    narration_entries: List[SRTEntry],
+    similarity_threshold: Optional[float] = None
+) -> Dict[int, List[Match]]:
+    """Group search match dictionaries by the narration entry they belong to
+    
+    A match belongs to the first entry containing its narration_time
+    (entry 0 if none does). Each group is sorted by similarity (best first).
+    
+    Args:
+        match_dicts: Search match dictionaries (search output or similarity matrix)
+        narration_entries: Narration SRT entries sorted by start time
+        similarity_threshold: Optional minimum similarity score
+        
+    Returns:
+        Dictionary mapping narration entry index to list of matches
+    """
+    return group_match_batch_by_narration_entry(
+        MatchBatch.from_dicts(match_dicts),
+        narration_entries,
+        similarity_threshold=similarity_threshold
+    )
+
+
+def group_match_batch_by_narration_entry(
+    batch: MatchBatch,
+    narration_entries: List[SRTEntry],
+    similarity_threshold: Optional[float] = None,
+    scores: Optional[np.ndarray] = None
+) -> Dict[int, List[Match]]:
+    """Vectorized grouping of a match batch by narration entry
+    
+    Entry lookup, threshold filtering and the per-entry sort are single
+    NumPy passes; Match objects are only built for surviving rows.
+    
+    Args:
+        batch: Candidate matches
+        narration_entries: Narration SRT entries sorted by start time
+        similarity_threshold: Optional minimum similarity score
+        scores: Optional ranking score per row (e.g. weighted similarity);
+            defaults to the similarity score
+        
+    Returns:
+        Dictionary mapping narration entry index to list of matches
+        (best first; entries without matches are omitted)
+    """
+    entry_indices = IntervalIndex.from_entries(narration_entries).find_many(
+        batch.narration_time, default=0
+    )
+    if scores is None:
+        scores = batch.similarity_score
+    
+    if similarity_threshold is not None:
+        keep = batch.similarity_score >= similarity_threshold
+        batch = batch.take(keep)
+        entry_indices = entry_indices[keep]
+        scores = scores[keep]
+    
+    if len(batch) == 0:
+        return {}
+    
+    # Stable sort by entry, then score descending (ties keep input order)
+    order = np.lexsort((-scores, entry_indices))
+    entry_indices = entry_indices[order]
+    matches = batch.take(order).to_matches()
+    
+    group_starts = np.flatnonzero(np.diff(entry_indices)) + 1
+    bounds = [0] + group_starts.tolist() + [len(matches)]
+    return {
+        int(entry_indices[lo]): matches[lo:hi]
+        for lo, hi in zip(bounds[:-1], bounds[1:])
+    }
+
+
+def narration_interval_entries(
+    entry_index: IntervalIndex,
+    interval_seconds: float = 4.0
+) -> np.ndarray:
+    """Narration entry index of every interval tick covered by an entry
+    
+    Ticks are 0, interval_seconds, 2 * interval_seconds, ... up to the end
+    of the last entry; ticks in pauses between entries are left out.
+    
+    Args:
+        entry_index: Interval index over the narration entries
+        interval_seconds: Interval length in seconds
+        
+    Returns:
+        Entry index per covered interval, in narration order
+    """
+    if len(entry_index) == 0:
+        return np.empty(0, dtype=np.int64)
+    
+    ticks = []
+    current_time = 0.0
+    end_time = float(entry_index.ends[-1])
+    while current_time < end_time:
+        ticks.append(current_time)
+        current_time += interval_seconds
+    
+    entry_indices = entry_index.find_many(ticks)
+    return entry_indices[entry_indices >= 0]
+
+
+def select_matches_for_narration_intervals(
     narration_entries: List[SRTEntry],
     matches_by_narration: Dict[int, List[Match]],
-    input_video_path: str,
-    narration_audio_path: str,
-    output_video_path: str,
     interval_seconds: float = 4.0,
     min_time_gap: float = 30.0,
-    project_id: Optional[str] = None,
-    movie_id: Optional[str] = None,
-    options: Optional[TimelineOptions] = None
-) -> Timeline:
-    """Build timeline with segments for every 3-5 seconds of narration
-    
-    Creates segments that align with narration timing while ensuring
-    movie segments are distributed (copyright compliance).
+    strategy: str = "greedy",
+    allow_reuse: bool = True
+) -> IntervalSelection:
+    """Select one match for every 3-5 seconds of narration
     
     Args:
         narration_entries: List of narration SRT entries
         matches_by_narration: Dictionary mapping narration entry index to list of matches (sorted by score)
-        input_video_path: Path to input video file
-        narration_audio_path: Path to narration audio file
-        output_video_path: Path to output video file
         interval_seconds: Interval for creating segments (default: 4.0 seconds)
         min_time_gap: Minimum time gap between consecutive segments in movie time (default: 30.0)
-        project_id: Optional project identifier
-        movie_id: Optional movie identifier
-        options: Optional timeline options
+        strategy: "greedy" (first compliant candidate per interval) or
+            "dp" (maximum total similarity, see src.core.selection)
+        allow_reuse: Whether the same movie segment may be selected more
+            than once (dp strategy only)
         
     Returns:
-        Timeline object ready for JSON serialization
+        IntervalSelection with the selected matches and selection statistics
     """
+    if strategy == "dp":
+        return select_optimal_matches_for_narration_intervals(
+            narration_entries,
+            matches_by_narration,
+            interval_seconds=interval_seconds,
+            min_time_gap=min_time_gap,
+            allow_reuse=allow_reuse
+        )
+    if strategy != "greedy":
+        raise ValueError(f"Unknown selection strategy: {strategy}")
+    
     from src.core.filtering import prevent_consecutive_segments
     
-    segments = []
+    selection = IntervalSelection(matches=[])
     selected_matches = []
     last_movie_time = None
     
+    # Sorted-interval index makes every time -> entry lookup O(log N)
+    entry_index_lookup = IntervalIndex.from_entries(narration_entries)
+    
     # Process narration in intervals
     current_time = 0.0
-    narration_index = 0
     
     while current_time < narration_entries[-1].end_time if narration_entries else 0:
         # Find narration entry that covers current time
-        current_entry = None
-        for entry in narration_entries:
-            if entry.start_time <= current_time <= entry.end_time:
-                current_entry = entry
-                break
+        entry_index = entry_index_lookup.find(current_time)
         
-        if current_entry:
+        if entry_index is not None:
+            selection.intervals += 1
+            
             # Get matches for this narration entry
-            entry_index = narration_entries.index(current_entry)
             matches = matches_by_narration.get(entry_index, [])
             
             if matches:
+                selection.intervals_with_candidates += 1
+                
                 # Try to select best match that complies with copyright
                 selected = None
                 
@@ -176,71 +390,168 @@ def build_timeline_for_narration_intervals(
                 # If no compliant match found, use best match anyway (log warning)
                 if selected is None and matches:
                     selected = matches[0]  # Use best match
+                    selection.fallbacks += 1
                 
                 if selected:
-                    segment = Segment(
-                        start=selected.start_time,
-                        end=selected.end_time,
-                        score=selected.similarity_score
-                    )
-                    segments.append(segment)
                     selected_matches.append(selected)
                     last_movie_time = (selected.start_time + selected.end_time) / 2.0
         
         # Move to next interval
         current_time += interval_seconds
-        narration_index += 1
     
     # Apply copyright compliance filter as final check
     if selected_matches:
-        from src.core.filtering import prevent_consecutive_segments
         # Build alternative matches dict for fallback
         alternative_matches = {}
-        for i, match in enumerate(selected_matches):
+        for match in selected_matches:
             entry_index = None
-            for idx, entry in enumerate(narration_entries):
-                if hasattr(match, 'narration_time') and entry.start_time <= match.narration_time <= entry.end_time:
-                    entry_index = idx
-                    break
+            if match.narration_time is not None:
+                entry_index = entry_index_lookup.find(match.narration_time)
             
             if entry_index is not None:
                 alt_matches = matches_by_narration.get(entry_index, [])
                 if len(alt_matches) > 1:
                     alternative_matches[match.segment_id] = alt_matches[1:]  # Skip first (best)
         
-        filtered_matches = prevent_consecutive_segments(
+        selection.matches = prevent_consecutive_segments(
             selected_matches,
             min_time_gap=min_time_gap,
             alternative_matches=alternative_matches if alternative_matches else None
         )
+        selection.dropped = len(selected_matches) - len(selection.matches)
+    
+    return selection
+
+
+def select_optimal_matches_for_narration_intervals(
+    narration_entries: List[SRTEntry],
+    matches_by_narration: Dict[int, List[Match]],
+    interval_seconds: float = 4.0,
+    min_time_gap: float = 30.0,
+    allow_reuse: bool = True
+) -> IntervalSelection:
+    """Select at most one match per narration interval maximizing total similarity
+    
+    Unlike the greedy selection, intervals are skipped instead of falling
+    back to a non-compliant match, so nothing is dropped afterwards.
+    
+    Args:
+        narration_entries: List of narration SRT entries
+        matches_by_narration: Dictionary mapping narration entry index to list of matches (sorted by score)
+        interval_seconds: Interval for creating segments (default: 4.0 seconds)
+        min_time_gap: Minimum time gap between consecutive segments in movie time (default: 30.0)
+        allow_reuse: Whether the same movie segment may be selected more than once
         
-        # Rebuild segments from filtered matches
-        segments = [
-            Segment(
-                start=m.start_time,
-                end=m.end_time,
-                score=m.similarity_score
-            )
-            for m in filtered_matches
-        ]
+    Returns:
+        IntervalSelection with the selected matches and selection statistics
+    """
+    interval_entries = narration_interval_entries(
+        IntervalIndex.from_entries(narration_entries), interval_seconds
+    ).tolist()
+    candidates, offsets, centers, scores = build_candidate_arrays(interval_entries, matches_by_narration)
     
-    metadata = None
-    if project_id or movie_id or options:
-        metadata = TimelineMetadata(
-            project_id=project_id,
-            movie_id=movie_id,
-            generated_at=datetime.now(),
-            version="1.0",
-            options=options
-        )
+    ids = {}
+    segment_ids = np.array(
+        [ids.setdefault(match.segment_id, len(ids)) for matches in candidates for match in matches],
+        dtype=np.int64
+    )
     
-    timeline = Timeline(
-        input=input_video_path,
-        narration=narration_audio_path,
-        output=output_video_path,
-        segments=segments,
-        metadata=metadata
+    picks = select_candidates(segment_ids, offsets, centers, scores, min_time_gap, allow_reuse)
+    
+    selection = IntervalSelection(
+        matches=[candidates[t][j] for t, j in enumerate(picks.tolist()) if j >= 0],
+        intervals=len(interval_entries),
+        intervals_with_candidates=sum(1 for c in candidates if c)
+    )
+    selection.skipped = selection.intervals_with_candidates - len(selection.matches)
+    return selection
+
+
+def build_timeline_for_narration_intervals(
+    narration_entries: List[SRTEntry],
+    matches_by_narration: Dict[int, List[Match]],
+    input_video_path: str,
+    narration_audio_path: str,
+    output_video_path: str,
+    interval_seconds: float = 4.0,
+    min_time_gap: float = 30.0,
+    project_id: Optional[str] = None,
+    movie_id: Optional[str] = None,
+    options: Optional[TimelineOptions] = None,
+    selection_strategy: str = "greedy",
+    allow_reuse: bool = True
+) -> Timeline:
+    """Build timeline with segments for every 3-5 seconds of narration
+    
+    Creates segments that align with narration timing while ensuring
+    movie segments are distributed (copyright compliance).
+    
+    Args:
+        narration_entries: List of narration SRT entries
+        matches_by_narration: Dictionary mapping narration entry index to list of matches (sorted by score)
+        input_video_path: Path to input video file
+        narration_audio_path: Path to narration audio file
+        output_video_path: Path to output video file
+        interval_seconds: Interval for creating segments (default: 4.0 seconds)
+        min_time_gap: Minimum time gap between consecutive segments in movie time (default: 30.0)
+        project_id: Optional project identifier
+        movie_id: Optional movie identifier
+        options: Optional timeline options
+        selection_strategy: "greedy" or "dp" (see select_matches_for_narration_intervals)
+        allow_reuse: Whether a movie segment may be selected more than once (dp only)
+        
+    Returns:
+        Timeline object ready for JSON serialization
+    """
+    selection = select_matches_for_narration_intervals(
+        narration_entries,
+        matches_by_narration,
+        interval_seconds=interval_seconds,
+        min_time_gap=min_time_gap,
+        strategy=selection_strategy,
+        allow_reuse=allow_reuse
     )
     
-    return timeline
+    return build_timeline_from_selection(
+        selection,
+        input_video_path=input_video_path,
+        narration_audio_path=narration_audio_path,
+        output_video_path=output_video_path,
+        project_id=project_id,
+        movie_id=movie_id,
+        options=options
+    )
+
 
+def build_timeline_from_selection(
+    selection: IntervalSelection,
+    input_video_path: str,
+    narration_audio_path: str,
+    output_video_path: str,
+    project_id: Optional[str] = None,
+    movie_id: Optional[str] = None,
+    options: Optional[TimelineOptions] = None
+) -> Timeline:
+    """Build timeline from an interval selection (one segment per selected match)
+    
+    Args:
+        selection: Result of select_matches_for_narration_intervals
+        input_video_path: Path to input video file
+        narration_audio_path: Path to narration audio file
+        output_video_path: Path to output video file
+        project_id: Optional project identifier
+        movie_id: Optional movie identifier
+        options: Optional timeline options
+        
+    Returns:
+        Timeline object ready for JSON serialization
+    """
+    return build_timeline(
+        selection.matches,
+        input_video_path=input_video_path,
+        narration_audio_path=narration_audio_path,
+        output_video_path=output_video_path,
+        project_id=project_id,
+        movie_id=movie_id,
+        options=options
+    )
@@ -0,0 +1,222 @@
+"""Persisted intermediate timeline state for incremental re-runs
+
+The timeline stage stores its intermediate results in layers, each keyed
+by a fingerprint of everything it depends on:
+
+    candidates   narration entry intervals, candidate batch and the entry
+                 of every candidate (inputs: narration SRTs, search output
+                 or similarity matrix, candidate options)
+    table        interval -> candidate rows table the DP selector runs on
+                 (+ similarity_threshold, interval_seconds)
+    selection    picked candidate per interval
+                 (+ copyright_min_gap, allow_segment_reuse)
+
+A re-run recomputes only the layers whose key changed; changing the
+inputs invalidates everything. Every file is written to a temporary file
+and moved into place, and a layer's key is dropped from the manifest
+before its files are replaced, so an interrupted save never leaves a key
+pointing at other data.
+
+    timeline_state/
+      manifest.json     version and layer keys
+      candidates.npz    entry intervals, batch columns, entry index per row
+      strings.json      segment id, narration file id and text tables
+      selection.npz     table offsets and rows, picks
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.core.interval_index import IntervalIndex
+from src.core.matching import MatchBatch
+
+
+STATE_VERSION = "1.2"    # 1.2: exact no-reuse selection
+MANIFEST_FILE = "manifest.json"
+CANDIDATES_FILE = "candidates.npz"
+STRINGS_FILE = "strings.json"
+SELECTION_FILE = "selection.npz"
+
+
+class TimelineState:
+    """Layered timeline state stored in a directory"""
+    
+    def __init__(self, directory: Path):
+        """Open (or prepare) timeline state
+        
+        Args:
+            directory: State directory (created on first save)
+        """
+        self.directory = directory
+        self.manifest = self._load_manifest()
+    
+    def _load_manifest(self) -> Dict[str, Any]:
+        manifest_path = self.directory / MANIFEST_FILE
+        if not manifest_path.exists():
+            return {}
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return manifest if manifest.get("version") == STATE_VERSION else {}
+    
+    def _save_manifest(self) -> None:
+        self.manifest["version"] = STATE_VERSION
+        _write_json(self.directory / MANIFEST_FILE, self.manifest, indent=2)
+    
+    def load_candidates(self, inputs_key: str) -> Optional[Tuple[IntervalIndex, MatchBatch, np.ndarray]]:
+        """Load candidate layer if it was built from the same inputs
+        
+        Args:
+            inputs_key: Fingerprint of the current inputs
+        
+        Returns:
+            Tuple of (entry interval index, candidate batch, entry index per
+            candidate), or None if missing or stale
+        """
+        if self.manifest.get("inputs_key") != inputs_key:
+            return None
+        
+        with np.load(self.directory / CANDIDATES_FILE) as data:
+            arrays = {key: data[key] for key in data.files}
+        with open(self.directory / STRINGS_FILE, 'r', encoding='utf-8') as f:
+            strings = json.load(f)
+        
+        segment_ids = np.array(strings["segment_ids"], dtype=object)
+        file_ids = np.array(strings["narration_file_ids"], dtype=object)
+        texts = np.array(strings["narration_texts"], dtype=object)
+        
+        batch = MatchBatch(
+            segment_id=segment_ids[arrays["chunk_id"]],
+            start_time=arrays["start_time"],
+            end_time=arrays["end_time"],
+            similarity_score=arrays["similarity_score"],
+            narration_time=arrays["narration_time"],
+            narration_text=texts[arrays["text_code"]],
+            narration_file_id=file_ids[arrays["file_code"]],
+            chunk_id=arrays["chunk_id"]
+        )
+        entry_index = IntervalIndex(arrays["entry_starts"], arrays["entry_ends"])
+        return entry_index, batch, arrays["entry_indices"]
+    
+    def save_candidates(
+        self,
+        inputs_key: str,
+        entry_index: IntervalIndex,
+        batch: MatchBatch,
+        entry_indices: np.ndarray
+    ) -> None:
+        """Store candidate layer (invalidates table and selection layers)
+        
+        Args:
+            inputs_key: Fingerprint of the inputs the candidates came from
+            entry_index: Interval index over the narration entries
+            batch: Candidate batch
+            entry_indices: Narration entry index per candidate
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        
+        # Segment ids are stored once per chunk, repeated strings once each
+        chunk_ids, first_rows = np.unique(batch.chunk_id, return_index=True)
+        segment_ids = [None] * (int(chunk_ids[-1]) + 1 if len(chunk_ids) else 0)
+        for chunk_id, segment_id in zip(chunk_ids.tolist(), batch.segment_id[first_rows].tolist()):
+            segment_ids[chunk_id] = segment_id
+        file_ids, file_codes = _encode_strings(batch.narration_file_id)
+        texts, text_codes = _encode_strings(batch.narration_text)
+        
+        # Invalidate every layer before replacing its files
+        self.manifest = {}
+        self._save_manifest()
+        
+        _write_npz(
+            self.directory / CANDIDATES_FILE,
+            entry_starts=entry_index.starts,
+            entry_ends=entry_index.ends,
+            entry_indices=np.asarray(entry_indices, dtype=np.int64),
+            start_time=batch.start_time,
+            end_time=batch.end_time,
+            similarity_score=batch.similarity_score,
+            narration_time=batch.narration_time,
+            chunk_id=batch.chunk_id,
+            file_code=file_codes,
+            text_code=text_codes
+        )
+        _write_json(self.directory / STRINGS_FILE, {
+            "segment_ids": segment_ids,
+            "narration_file_ids": file_ids,
+            "narration_texts": texts
+        }, ensure_ascii=False)
+        
+        self.manifest = {"inputs_key": inputs_key, "candidates": len(batch)}
+        self._save_manifest()
+    
+    def load_table(self, table_key: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Load (offsets, rows) candidate table if its key matches"""
+        if self.manifest.get("table_key") != table_key:
+            return None
+        with np.load(self.directory / SELECTION_FILE) as data:
+            return data["offsets"], data["rows"]
+    
+    def load_picks(self, selection_key: str) -> Optional[np.ndarray]:
+        """Load picked candidate per interval if its key matches"""
+        if self.manifest.get("selection_key") != selection_key:
+            return None
+        with np.load(self.directory / SELECTION_FILE) as data:
+            return data["picks"]
+    
+    def save_selection(
+        self,
+        table_key: str,
+        offsets: np.ndarray,
+        rows: np.ndarray,
+        selection_key: str,
+        picks: np.ndarray
+    ) -> None:
+        """Store table and selection layers
+        
+        Args:
+            table_key: Fingerprint of candidates + table options
+            offsets: Candidate slot range per interval
+            rows: Candidate row per slot
+            selection_key: Fingerprint of table + selection options
+            picks: Picked candidate within its interval (-1 = skipped)
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest.pop("table_key", None)
+        self.manifest.pop("selection_key", None)
+        self._save_manifest()
+        
+        _write_npz(self.directory / SELECTION_FILE, offsets=offsets, rows=rows, picks=picks)
+        self.manifest["table_key"] = table_key
+        self.manifest["selection_key"] = selection_key
+        self._save_manifest()
+
+
+def _write_npz(path: Path, **arrays: np.ndarray) -> None:
+    """Write arrays to an npz file through a temporary file"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    # A file object keeps np.savez from appending .npz to the name
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def _write_json(path: Path, data: Any, **kwargs: Any) -> None:
+    """Write JSON through a temporary file"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **kwargs)
+    os.replace(tmp_path, path)
+
+
+def _encode_strings(values: np.ndarray) -> Tuple[list, np.ndarray]:
+    """Encode an object column as (distinct values, int32 codes)"""
+    table = {}
+    codes = np.fromiter(
+        (table.setdefault(value, len(table)) for value in values.tolist()),
+        dtype=np.int32,
+        count=len(values)
+    )
+    return list(table), codes
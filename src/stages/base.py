@@ -3,6 +3,7 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional
 from pathlib import Path
+import json
 
 
 class BaseStage(ABC):
@@ -108,6 +109,42 @@ class BaseStage(ABC):
         """Get project logs directory path"""
         return self.get_project_path(project_id) / "logs"
 
+    def get_similarity_matrix_path(self, project_id: str) -> Path:
+        """Get persisted narration x movie similarity matrix directory path"""
+        return self.get_project_path(project_id) / "index" / "similarity"
+
+    def get_scene_weights_path(self, project_id: str) -> Path:
+        """Get per-chunk scene weight table path (written by the index stage)"""
+        return self.get_project_path(project_id) / "index" / "scene_weights.json"
+
+    def get_media_cache_path(self, project_id: str) -> Path:
+        """Get media metadata/keyframe cache directory path (keyed by file hash)"""
+        return self.get_project_path(project_id) / "cache" / "media"
+
+    def get_clip_cache_path(self, project_id: str) -> Path:
+        """Get rendered segment clip cache directory path"""
+        return self.get_project_path(project_id) / "cache" / "clips"
+
+    def get_proxy_cache_path(self, project_id: str) -> Path:
+        """Get low-resolution proxy transcode cache directory path"""
+        return self.get_project_path(project_id) / "cache" / "proxy"
+
+    def load_project_config(self, project_id: str) -> Dict[str, Any]:
+        """Load project configuration (configs/project.json)
+        
+        Args:
+            project_id: Project identifier
+            
+        Returns:
+            Project configuration dictionary (empty if no config exists)
+        """
+        config_path = self.get_configs_path(project_id) / "project.json"
+        if not config_path.exists():
+            return {}
+        
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
     def ensure_project_structure(self, project_id: str) -> None:
         """Ensure project workspace structure exists"""
         paths = [
@@ -1,15 +1,20 @@
 """Stage 2: Movie subtitle indexing"""
 
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import json
 
+import numpy as np
+
 from src.stages.base import BaseStage, StageExecutionError
 from src.contracts.models.stage_outputs import IndexOutput
 from src.utils.srt_parser import parse_srt_file
-from src.core.chunking import chunk_srt_entries
+from src.core.chunking import Chunk, chunk_srt_entries
+from src.core.scene_weights import NO_PRIORITY, SceneWeightTable, compute_scene_weights
+from src.core.spoiler import SPOILER_MODEL_VERSION, SPOILER_PROTOTYPES, SpoilerScores, score_spoiler_risk
 from src.adapters.chromadb_adapter import ChromaDBAdapter
 from src.adapters.embedding_adapter import EmbeddingAdapter
+from src.utils.fingerprint import fingerprint_file, fingerprint_values
 
 
 class IndexStage(BaseStage):
@@ -50,6 +55,10 @@ class IndexStage(BaseStage):
         chunk_texts = [chunk.text for chunk in chunks]
         embeddings = embedding_adapter.embed_texts(chunk_texts)
         
+        # Spoiler risk is scored once here and stored with every chunk
+        spoiler_scores = self.score_spoiler_risk(chunks, embeddings, embedding_adapter)
+        spoiler_metadata = spoiler_scores.to_metadata()
+        
         metadatas = []
         ids = []
         for i, chunk in enumerate(chunks):
@@ -64,7 +73,8 @@ class IndexStage(BaseStage):
                 "duration": chunk.duration,
                 "word_count": chunk.word_count,
                 "sentence_index": i,  # Index of center sentence
-                "sentence_count": len(chunk.entries)  # Number of sentences in chunk (1-3)
+                "sentence_count": len(chunk.entries),  # Number of sentences in chunk (1-3)
+                **spoiler_metadata[i]
             })
             ids.append(f"movie_{i:06d}")
         
@@ -79,14 +89,100 @@ class IndexStage(BaseStage):
         
         total_duration = sum(chunk.duration for chunk in chunks)
         
+        # Fingerprint identifies this exact index (subtitles + model + chunking)
+        index_fingerprint = fingerprint_values(
+            fingerprint_file(Path(movie_srt_path)),
+            self.embedding_model,
+            "3_sentence",
+            len(chunks),
+            SPOILER_MODEL_VERSION
+        )
+        
+        self.save_scene_weights(project_id, chunks, ids, index_fingerprint)
+        
         output = IndexOutput(
             collection_name=collection_name,
             chunks_indexed=len(chunks),
-            total_duration=total_duration
+            total_duration=total_duration,
+            embedding_model=self.embedding_model,
+            fingerprint=index_fingerprint,
+            spoiler_scored=True
         )
         
         return output.model_dump()
     
+    def save_scene_weights(
+        self,
+        project_id: str,
+        chunks: List[Chunk],
+        ids: List[str],
+        index_fingerprint: str
+    ) -> Path:
+        """Compute base scene weights from chunk statistics and store them
+        
+        Editor overrides from project.json are applied by the timeline
+        stage, so they never require re-indexing.
+        
+        Args:
+            project_id: Project identifier
+            chunks: Movie subtitle chunks
+            ids: Chunk IDs (same order as chunks)
+            index_fingerprint: Fingerprint of this index
+        
+        Returns:
+            Path to the weight table
+        """
+        weights = compute_scene_weights(
+            durations=[chunk.duration for chunk in chunks],
+            word_counts=[chunk.word_count for chunk in chunks],
+            speech_seconds=[sum(entry.duration for entry in chunk.entries) for chunk in chunks]
+        )
+        table = SceneWeightTable(
+            segment_ids=ids,
+            start_times=np.asarray([chunk.start_time for chunk in chunks], dtype=np.float64),
+            end_times=np.asarray([chunk.end_time for chunk in chunks], dtype=np.float64),
+            weights=weights,
+            priorities=np.full(len(ids), NO_PRIORITY, dtype=np.int64)
+        )
+        
+        weights_path = self.get_scene_weights_path(project_id)
+        table.save(weights_path, extra={"index_fingerprint": index_fingerprint})
+        return weights_path
+    
+    def score_spoiler_risk(
+        self,
+        chunks: List[Chunk],
+        embeddings: List[List[float]],
+        embedding_adapter: EmbeddingAdapter
+    ) -> SpoilerScores:
+        """Score spoiler risk of every chunk
+        
+        Combines position in the movie, lexicon hits and similarity to the
+        spoiler prototype phrases (embedded with the index model).
+        
+        Args:
+            chunks: Movie subtitle chunks
+            embeddings: Chunk embeddings (same order as chunks)
+            embedding_adapter: Embedding adapter for the prototype phrases
+        
+        Returns:
+            SpoilerScores with one entry per chunk
+        """
+        movie_duration = max((chunk.end_time for chunk in chunks), default=0.0)
+        center_times = [(chunk.start_time + chunk.end_time) / 2.0 for chunk in chunks]
+        prototype_embeddings = {
+            reason: np.asarray(embedding_adapter.embed_texts(phrases), dtype=np.float32)
+            for reason, phrases in SPOILER_PROTOTYPES.items()
+        }
+        
+        return score_spoiler_risk(
+            [chunk.text for chunk in chunks],
+            center_times,
+            movie_duration,
+            chunk_embeddings=np.asarray(embeddings, dtype=np.float32),
+            prototype_embeddings=prototype_embeddings
+        )
+    
     def load_input(self, project_id: str) -> Dict[str, Any]:
         """Load ingest stage output"""
         ingest_output_path = self.get_outputs_path(project_id) / "ingest_output.json"
@@ -1,12 +1,39 @@
 """Stage 5: Video rendering"""
 
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import json
+import logging
+import os
+import threading
+import time
 
 from src.stages.base import BaseStage, StageExecutionError
+from src.contracts.models.project import OutputVariant
 from src.contracts.models.timeline import Timeline
-from src.adapters.ffmpeg_adapter import FFmpegAdapter
+from src.adapters.clip_cache import ClipCache
+from src.adapters.ffmpeg_adapter import (
+    DEFAULT_GROUP_SIZE,
+    DEFAULT_VIDEO_SETTINGS,
+    PROXY_VIDEO_SETTINGS,
+    FFmpegAdapter,
+    VideoSettings
+)
+from src.adapters.ffmpeg_process import (
+    FFmpegCancelledError,
+    FFmpegProgress,
+    FFmpegTimeoutError,
+    RingLog
+)
+from src.core.media_index import MediaIndex, MediaInfo, segment_bounds, snap_segments
+from src.core.render_plan import ThroughputProfile, choose_encoder, plan_render
+from src.utils.fingerprint import fingerprint_values
+
+
+logger = logging.getLogger(__name__)
+
+RENDER_MODES = ("single", "parallel", "fast")
+PROGRESS_INTERVAL = 1.0    # Seconds between progress reports (per render)
 
 
 class RenderStage(BaseStage):
@@ -15,32 +42,502 @@ class RenderStage(BaseStage):
     def __init__(self, project_root: Optional[Path] = None, ffmpeg_path: Optional[str] = None):
         super().__init__(project_root)
         self.ffmpeg_path = ffmpeg_path
+        self.cancel_event = threading.Event()
+    
+    def cancel(self) -> None:
+        """Stop the running render (safe to call from another thread)"""
+        self.cancel_event.set()
     
     def run(self, project_id: str, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Execute render stage"""
+        """Execute render stage
+        
+        ffmpeg's stderr goes to logs/ffmpeg_render.log and the latest
+        progress report to logs/render_progress.json. The render stops
+        when cancel() is called or after the render_timeout option.
+        """
+        opts = self.resolve_options(self.load_project_config(project_id), config)
+        # Reject an unknown render_mode before any work
+        self.get_render_mode(opts)
+        
         # Load timeline
-        timeline_data = self.load_input(project_id)
-        timeline = Timeline(**timeline_data)
+        timeline = self.load_timeline(project_id)
+        
+        self.cancel_event.clear()
+        timeout = opts.get("render_timeout")
+        logs_path = self.get_logs_path(project_id)
+        ffmpeg_log = RingLog(logs_path / "ffmpeg_render.log")
+        
+        try:
+            # Initialize FFmpeg adapter
+            ffmpeg_adapter = FFmpegAdapter(
+                ffmpeg_path=self.ffmpeg_path,
+                progress_callback=self.make_progress_callback(logs_path / "render_progress.json"),
+                cancel_event=self.cancel_event,
+                deadline=time.monotonic() + timeout if timeout else None,
+                log=ffmpeg_log
+            )
+            
+            # Check FFmpeg availability
+            if not ffmpeg_adapter.check_ffmpeg_available():
+                raise StageExecutionError("FFmpeg is not available. Please install FFmpeg.")
+            
+            return self.render(project_id, timeline, opts, ffmpeg_adapter)
+        finally:
+            ffmpeg_log.close()
+    
+    def plan(self, project_id: str, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Dry run: predict the render's cost without rendering
+        
+        Uses the movie's cached metadata (probed once if missing), the
+        clip cache and the host's throughput profile (see
+        get_encoder_profile_path). Proxy renders with proxy_source are
+        estimated as cuts from the movie.
+        
+        Returns:
+            Plan with the chosen strategy, predicted wall time, decode and
+            encode seconds (in total and per segment) and the predicted
+            wall time of every other strategy
+        """
+        opts = self.resolve_options(self.load_project_config(project_id), config)
+        render_mode = self.get_render_mode(opts)
+        timeline = self.load_timeline(project_id)
+        if not timeline.segments:
+            raise StageExecutionError("Timeline has no segments to render")
         
-        # Initialize FFmpeg adapter
         ffmpeg_adapter = FFmpegAdapter(ffmpeg_path=self.ffmpeg_path)
+        try:
+            media = self.load_media_info(project_id, timeline.input, ffmpeg_adapter)
+        except StageExecutionError:
+            raise
+        except Exception as e:
+            raise StageExecutionError(f"Could not probe input video: {str(e)}")
+        
+        proxy = opts.get("preset") == "proxy"
+        video, workers = self.get_encoder_settings(opts, parallel=render_mode == "parallel")
+        if proxy:
+            video = self.get_proxy_video_settings(project_id, timeline, opts, ffmpeg_adapter)
+        variants = [] if proxy or render_mode == "fast" else self.get_output_variants(timeline, opts)
         
-        # Check FFmpeg availability
-        if not ffmpeg_adapter.check_ffmpeg_available():
-            raise StageExecutionError("FFmpeg is not available. Please install FFmpeg.")
+        cached = None
+        if render_mode == "parallel" and opts.get("clip_cache", True):
+            input_hash = self.get_input_hash(project_id, timeline.input)
+            settings = ffmpeg_adapter.clip_settings(video)
+            with ClipCache(self.get_clip_cache_path(project_id)) as clip_cache:
+                cached = [
+                    clip_cache.clip_path(clip_cache.make_key(input_hash, seg.start, seg.end, settings)).exists()
+                    for seg in timeline.segments
+                ]
         
+        profile = ThroughputProfile.load(self.get_encoder_profile_path(), os.cpu_count() or 1)
+        starts, ends = segment_bounds(timeline.segments)
+        plan = plan_render(
+            starts,
+            ends,
+            media,
+            profile,
+            strategy=render_mode,
+            preset=video.preset,
+            crf=video.crf,
+            max_height=video.max_height,
+            max_fps=video.fps,
+            workers=workers,
+            group_size=opts.get("render_group_size", DEFAULT_GROUP_SIZE),
+            cached=cached,
+            variant_sizes=[
+                self.get_variant_frame_size(variant, media.width, media.height)
+                for variant, _ in variants
+            ]
+        )
+        
+        return {
+            "status": "planned",
+            "output_file": timeline.output,
+            "segments_planned": len(timeline.segments),
+            "render_mode": render_mode,
+            "proxy": proxy,
+            "preset": video.preset,
+            "crf": video.crf,
+            "source": {"duration": media.duration, "fps": media.fps, "width": media.width, "height": media.height},
+            **plan.to_dict()
+        }
+    
+    def render(
+        self,
+        project_id: str,
+        timeline: Timeline,
+        opts: Dict[str, Any],
+        ffmpeg_adapter: FFmpegAdapter
+    ) -> Dict[str, Any]:
+        """Render the timeline in the configured mode"""
         # Render video
+        render_mode = self.get_render_mode(opts)
+        if render_mode == "fast":
+            return self.render_fast(project_id, timeline, opts, ffmpeg_adapter)
+        
+        # Proxy: low-res, fast encode, written next to the output
+        proxy = opts.get("preset") == "proxy"
+        video, workers = self.get_encoder_settings(opts, parallel=render_mode == "parallel")
+        if proxy:
+            video = self.get_proxy_video_settings(project_id, timeline, opts, ffmpeg_adapter)
+            timeline = self.get_proxy_timeline(project_id, timeline, video, opts, ffmpeg_adapter)
+        
+        # Extra outputs share the master's decode (not rendered for proxies)
+        variants = [] if proxy else self.get_output_variants(timeline, opts)
+        
+        clip_cache = None
         try:
-            ffmpeg_adapter.cut_and_concat_video(timeline, overwrite=True)
+            if render_mode == "parallel":
+                input_hash = None
+                if opts.get("clip_cache", True):
+                    clip_cache = ClipCache(
+                        self.get_clip_cache_path(project_id),
+                        max_bytes=int(opts.get("clip_cache_max_gb", 20.0) * 1024 ** 3)
+                    )
+                    input_hash = self.get_input_hash(project_id, timeline.input)
+                ffmpeg_adapter.render_parallel(
+                    timeline,
+                    max_workers=workers,
+                    overwrite=True,
+                    clip_cache=clip_cache,
+                    input_hash=input_hash,
+                    video=video
+                )
+                ffmpeg_adapter.transcode_variants(timeline.output, variants, video=video)
+            else:
+                ffmpeg_adapter.cut_and_concat_video(
+                    timeline,
+                    overwrite=True,
+                    video=video,
+                    variants=variants,
+                    group_size=opts.get("render_group_size", DEFAULT_GROUP_SIZE)
+                )
+        except StageExecutionError:
+            raise
         except Exception as e:
-            raise StageExecutionError(f"FFmpeg rendering failed: {str(e)}")
+            raise self.render_error("FFmpeg rendering failed", e, opts)
+        finally:
+            if clip_cache is not None:
+                clip_cache.close()
         
         return {
             "status": "success",
             "output_file": timeline.output,
-            "segments_processed": len(timeline.segments)
+            "segments_processed": len(timeline.segments),
+            "render_mode": render_mode,
+            "proxy": proxy,
+            "encoder": {"preset": video.preset, "crf": video.crf},
+            "variant_outputs": {variant.name: path for variant, path in variants},
+            "clip_cache": clip_cache.stats() if clip_cache else None
+        }
+    
+    def get_encoder_settings(self, opts: Dict[str, Any], parallel: bool = False) -> Tuple[VideoSettings, Optional[int]]:
+        """Encoder settings and parallel worker count from the project options
+        
+        With quality_target, the fastest configuration of the calibrated
+        throughput profile whose SSIM meets the target (and whose bitrate
+        stays within max_bitrate_kbps, if set) is used: its preset and CRF,
+        and for parallel renders without render_workers its process count.
+        Otherwise video_preset and video_crf apply.
+        
+        Returns:
+            Tuple of (video settings, worker count or None for the default)
+        """
+        video = VideoSettings(
+            preset=opts.get("video_preset", DEFAULT_VIDEO_SETTINGS.preset),
+            crf=opts.get("video_crf", DEFAULT_VIDEO_SETTINGS.crf)
+        )
+        workers = opts.get("render_workers")
+        quality_target = opts.get("quality_target")
+        if quality_target is None:
+            return video, workers
+        
+        profile = ThroughputProfile.load(self.get_encoder_profile_path(), os.cpu_count() or 1)
+        if not profile.calibrated:
+            logger.warning(
+                "quality_target needs a calibrated throughput profile "
+                "(run scripts/calibrate_encoder.py), using video_preset"
+            )
+            return video, workers
+        max_bitrate_kbps = opts.get("max_bitrate_kbps")
+        chosen = choose_encoder(profile, quality_target, parallel=parallel, max_bitrate_kbps=max_bitrate_kbps)
+        if chosen is None:
+            logger.warning(
+                f"No calibrated encoder configuration reaches SSIM {quality_target}"
+                + (f" within {max_bitrate_kbps} kb/s" if max_bitrate_kbps is not None else "")
+                + ", using video_preset"
+            )
+            return video, workers
+        
+        logger.info(
+            f"Encoder for SSIM >= {quality_target}: preset {chosen.preset}, CRF {chosen.crf}"
+            + (f", {chosen.processes} processes" if parallel else "")
+        )
+        if parallel and workers is None:
+            workers = chosen.processes
+        return VideoSettings(preset=chosen.preset, crf=chosen.crf), workers
+    
+    def get_output_variants(self, timeline: Timeline, opts: Dict[str, Any]) -> List[Tuple[OutputVariant, str]]:
+        """Configured output variants with their paths (<output>_<name>.<container>)
+        
+        Raises:
+            StageExecutionError: If a variant is invalid or names repeat
+        """
+        try:
+            variants = [OutputVariant.model_validate(v) for v in opts.get("output_variants") or []]
+        except ValueError as e:
+            raise StageExecutionError(f"Invalid output variant: {e}")
+        
+        names = [variant.name for variant in variants]
+        if len(set(names)) != len(names):
+            raise StageExecutionError(f"Output variant names must be unique: {names}")
+        
+        return [
+            (variant, str(self.get_variant_output_path(timeline.output, variant.name).with_suffix(f".{variant.container}")))
+            for variant in variants
+        ]
+    
+    def get_proxy_video_settings(
+        self,
+        project_id: str,
+        timeline: Timeline,
+        opts: Dict[str, Any],
+        ffmpeg_adapter: FFmpegAdapter
+    ) -> VideoSettings:
+        """Proxy encoder settings from the project options
+        
+        proxy_max_fps caps the frame rate: it is only applied when the
+        movie (probed via the media cache) is faster, or cannot be probed.
+        """
+        fps = opts.get("proxy_max_fps")
+        if fps:
+            try:
+                source_fps = self.load_media_info(project_id, timeline.input, ffmpeg_adapter).fps
+            except Exception as e:
+                logger.warning(f"Could not probe source frame rate, applying proxy_max_fps: {e}")
+                source_fps = 0.0
+            if 0 < source_fps <= fps:
+                fps = None
+        
+        return VideoSettings(
+            preset=PROXY_VIDEO_SETTINGS.preset,
+            crf=opts.get("proxy_crf", PROXY_VIDEO_SETTINGS.crf),
+            max_height=opts.get("proxy_height", PROXY_VIDEO_SETTINGS.max_height),
+            fps=fps
+        )
+    
+    def get_proxy_timeline(
+        self,
+        project_id: str,
+        timeline: Timeline,
+        video: VideoSettings,
+        opts: Dict[str, Any],
+        ffmpeg_adapter: FFmpegAdapter
+    ) -> Timeline:
+        """Timeline rendering to the proxy output path
+        
+        With proxy_source, segments are cut from a cached low-res
+        transcode of the movie instead of the movie itself.
+        """
+        update = {"output": str(self.get_variant_output_path(timeline.output, "proxy"))}
+        if opts.get("proxy_source"):
+            try:
+                update["input"] = str(self.ensure_proxy_source(project_id, timeline.input, video, ffmpeg_adapter))
+            except StageExecutionError:
+                raise
+            except Exception as e:
+                raise self.render_error("FFmpeg proxy transcode failed", e, opts)
+        return timeline.model_copy(update=update)
+    
+    def ensure_proxy_source(
+        self,
+        project_id: str,
+        input_file: str,
+        video: VideoSettings,
+        ffmpeg_adapter: FFmpegAdapter
+    ) -> Path:
+        """Low-res transcode of the movie, created once per content and settings"""
+        input_hash = self.get_input_hash(project_id, input_file)
+        settings_key = fingerprint_values(video.encode_args(), video.filters())
+        proxy_path = self.get_proxy_cache_path(project_id) / f"{input_hash[:16]}_{settings_key[:12]}.mp4"
+        if proxy_path.exists():
+            return proxy_path
+        
+        proxy_path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = proxy_path.with_name(f"{proxy_path.stem}.part{proxy_path.suffix}")
+        try:
+            ffmpeg_adapter.transcode_proxy(input_file, part_path, video)
+            os.replace(part_path, proxy_path)
+        finally:
+            part_path.unlink(missing_ok=True)
+        return proxy_path
+    
+    def render_fast(
+        self,
+        project_id: str,
+        timeline: Timeline,
+        opts: Dict[str, Any],
+        ffmpeg_adapter: FFmpegAdapter
+    ) -> Dict[str, Any]:
+        """Stream-copy preview with segment boundaries snapped to keyframes
+        
+        Nothing is re-encoded except the narration, so the preview takes
+        seconds. It is written next to the output (<name>_preview.<ext>)
+        and the result reports how far every boundary moved.
+        """
+        if not timeline.segments:
+            raise StageExecutionError("Timeline has no segments to render")
+        
+        try:
+            media = self.load_media_info(project_id, timeline.input, ffmpeg_adapter)
+            starts, ends = segment_bounds(timeline.segments)
+            report = snap_segments(starts, ends, media.keyframes, media.duration)
+            
+            output_file = self.get_variant_output_path(timeline.output, "preview")
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            ffmpeg_adapter.copy_concat_segments(
+                timeline.input,
+                report.starts.tolist(),
+                report.ends.tolist(),
+                timeline.narration,
+                str(output_file),
+                self.get_outputs_path(project_id) / "preview_concat.txt",
+                overwrite=True
+            )
+        except Exception as e:
+            raise self.render_error("FFmpeg preview rendering failed", e, opts)
+        
+        return {
+            "status": "success",
+            "output_file": str(output_file),
+            "segments_processed": len(timeline.segments),
+            "render_mode": "fast",
+            "keyframe_snapping": report.to_dict()
         }
     
+    def render_error(self, message: str, error: Exception, opts: Dict[str, Any]) -> StageExecutionError:
+        """Stage error for a failed render step (cancellation and timeout get their own message)"""
+        if isinstance(error, FFmpegCancelledError):
+            return StageExecutionError("Render cancelled")
+        if isinstance(error, FFmpegTimeoutError):
+            return StageExecutionError(f"Render timed out after {opts.get('render_timeout')}s")
+        return StageExecutionError(f"{message}: {str(error)}")
+    
+    def make_progress_callback(self, progress_path: Path) -> Callable[[FFmpegProgress], None]:
+        """Progress handler logging and saving at most one report per PROGRESS_INTERVAL
+        
+        The latest report is written atomically to progress_path, so a
+        dashboard can poll the file while the render runs. Reports of
+        finished processes are always kept.
+        """
+        lock = threading.Lock()
+        last_report = [0.0]
+        
+        def on_progress(progress: FFmpegProgress) -> None:
+            with lock:
+                now = time.monotonic()
+                if not progress.done and now - last_report[0] < PROGRESS_INTERVAL:
+                    return
+                last_report[0] = now
+                
+                eta = f", eta {progress.eta:.0f}s" if progress.eta is not None else ""
+                logger.info(
+                    f"[{progress.label}] frame {progress.frame}, {progress.fps:.1f} fps, "
+                    f"speed {progress.speed or 0:.2f}x, {progress.out_time:.1f}s written{eta}"
+                )
+                
+                progress_path.parent.mkdir(parents=True, exist_ok=True)
+                part_path = progress_path.with_name(progress_path.name + ".part")
+                with open(part_path, 'w', encoding='utf-8') as f:
+                    json.dump({"updated_at": time.time(), **progress.to_dict()}, f, indent=2)
+                os.replace(part_path, progress_path)
+        
+        return on_progress
+    
+    @staticmethod
+    def get_variant_frame_size(variant: OutputVariant, width: int, height: int) -> Tuple[int, int]:
+        """Frame size of a variant rendered from width x height video"""
+        if variant.crop:
+            num, den = (int(x) for x in variant.crop.split(":"))
+            width, height = min(width, height * num / den), min(height, width * den / num)
+        if variant.width and variant.height:
+            return variant.width, variant.height
+        if variant.width:
+            return variant.width, int(round(height * variant.width / width))
+        if variant.height:
+            return int(round(width * variant.height / height)), variant.height
+        return int(width), int(height)
+    
+    def get_encoder_profile_path(self) -> Path:
+        """Host throughput profile written by scripts/calibrate_encoder.py"""
+        return (self.project_root or Path(".")) / "cache" / "encoder_profile.json"
+    
+    def save_plan(self, project_id: str, data: Dict[str, Any]) -> Path:
+        """Save dry-run plan"""
+        plan_path = self.get_outputs_path(project_id) / "render_plan.json"
+        plan_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(plan_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        
+        return plan_path
+    
+    def load_media_info(self, project_id: str, input_file: str, ffmpeg_adapter: FFmpegAdapter) -> MediaInfo:
+        """Media metadata and keyframe index, probed once per file content"""
+        input_path = Path(input_file)
+        media_index = MediaIndex(self.get_media_cache_path(project_id))
+        file_hash = self.get_input_hash(project_id, input_file)
+        media = media_index.get(file_hash)
+        if media is None:
+            media = MediaInfo.from_dict({"file_hash": file_hash, **ffmpeg_adapter.probe_media(str(input_path))})
+            media_index.put(media)
+        return media
+    
+    def get_input_hash(self, project_id: str, input_file: str) -> str:
+        """Content hash of the input video (memoized by size and mtime)
+        
+        Raises:
+            StageExecutionError: If the input file does not exist
+        """
+        input_path = Path(input_file)
+        if not input_path.exists():
+            raise StageExecutionError(f"Input video not found: {input_path}")
+        return MediaIndex(self.get_media_cache_path(project_id)).file_hash(input_path)
+    
+    def get_variant_output_path(self, output_file: str, variant: str) -> Path:
+        """Path next to the final output (<name>_<variant>.<ext>)"""
+        output_path = Path(output_file)
+        return output_path.with_name(f"{output_path.stem}_{variant}{output_path.suffix}")
+    
+    def resolve_options(
+        self,
+        project_config: Optional[Dict[str, Any]],
+        config: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Merge project.json options with run-time overrides"""
+        opts = dict((project_config or {}).get("options") or {})
+        if config and config.get("options"):
+            opts.update(config["options"])
+        return opts
+    
+    def get_render_mode(self, opts: Dict[str, Any]) -> str:
+        """Validated render_mode option
+        
+        Args:
+            opts: Effective project options
+        
+        Returns:
+            One of RENDER_MODES
+        
+        Raises:
+            StageExecutionError: If render_mode is not one of RENDER_MODES
+        """
+        render_mode = opts.get("render_mode", "single")
+        if render_mode not in RENDER_MODES:
+            raise StageExecutionError(
+                f"Unknown render_mode: {render_mode!r} (expected one of: {', '.join(RENDER_MODES)})"
+            )
+        return render_mode
+    
     def load_input(self, project_id: str) -> Dict[str, Any]:
         """Load timeline JSON"""
         timeline_path = self.get_outputs_path(project_id) / "timeline.json"
@@ -51,6 +548,19 @@ class RenderStage(BaseStage):
         with open(timeline_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     
+    def load_timeline(self, project_id: str) -> Timeline:
+        """Load and validate timeline JSON in a single pass
+        
+        Parses the file bytes directly into the model, skipping the
+        intermediate dict and the keyword-argument re-validation.
+        """
+        timeline_path = self.get_outputs_path(project_id) / "timeline.json"
+        
+        if not timeline_path.exists():
+            raise StageExecutionError(f"Timeline not found: {timeline_path}")
+        
+        return Timeline.model_validate_json(timeline_path.read_bytes())
+    
     def save_output(self, project_id: str, data: Dict[str, Any]) -> Path:
         """Save render output"""
         output_path = self.get_outputs_path(project_id) / "outputs" / "render_output.json"
@@ -63,5 +573,9 @@ class RenderStage(BaseStage):
     
     def validate(self, config: Optional[Dict[str, Any]] = None) -> bool:
         """Validate render configuration"""
+        try:
+            self.get_render_mode((config or {}).get("options") or {})
+        except StageExecutionError as e:
+            raise ValueError(str(e)) from None
         return True
 
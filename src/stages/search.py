@@ -2,13 +2,31 @@
 
 from pathlib import Path
 from typing import Dict, Any, Optional, List
+import contextlib
 import json
+import logging
+
+import numpy as np
 
 from src.stages.base import BaseStage, StageExecutionError
 from src.contracts.models.stage_outputs import SearchOutput, SearchMatch
 from src.utils.srt_parser import parse_srt_file, SRTEntry
 from src.adapters.chromadb_adapter import ChromaDBAdapter
 from src.adapters.embedding_adapter import EmbeddingAdapter
+from src.adapters.query_cache import QueryResultCache
+from src.core.similarity_matrix import SimilarityMatrixWriter, compute_similarity_scores
+from src.core.spoiler import RISK_KEY, spoiler_filter
+from src.utils.fingerprint import fingerprint_values
+from src.utils.search_results import (
+    SearchResultWriter,
+    ColumnarSearchResultWriter,
+    remove_search_outputs,
+    SEARCH_OUTPUT_JSON,
+    SEARCH_OUTPUT_JSONL,
+    SEARCH_RESULTS_DIR
+)
+
+logger = logging.getLogger(__name__)
 
 
 class SearchStage(BaseStage):
@@ -50,60 +68,252 @@ class SearchStage(BaseStage):
             index_data = json.load(f)
         collection_name = index_data["collection_name"]
         
+        project_options = self.load_project_config(project_id).get("options") or {}
+        matrix_kind = project_options.get("similarity_matrix")
+        
+        # Cache query results so re-runs only search changed narration windows
+        query_cache = None
+        if project_options.get("query_cache", True):
+            query_cache = QueryResultCache(
+                self.get_project_path(project_id) / "index" / "query_cache.sqlite",
+                max_entries=project_options.get("query_cache_max_entries", 100000)
+            )
+        index_fingerprint = index_data.get("fingerprint") or fingerprint_values(
+            collection_name, index_data.get("chunks_indexed")
+        )
+        
+        # Spoiler-safe projects filter risky chunks inside the vector store query
+        where = None
+        if project_options.get("spoiler_safe_mode"):
+            if index_data.get("spoiler_scored"):
+                where = spoiler_filter(project_options.get("spoiler_risk_threshold", 0.3))
+            else:
+                logger.warning(
+                    "spoiler_safe_mode is enabled but the index has no spoiler scores; "
+                    "re-run the index stage to filter spoilers"
+                )
+        
+        # JSONL and columnar results are streamed to disk per window instead of collected in memory
+        output_format = project_options.get("search_output_format", "json")
+        writer = None
+        if output_format == "jsonl":
+            writer = SearchResultWriter(self.get_outputs_path(project_id) / SEARCH_OUTPUT_JSONL)
+        elif output_format == "columnar":
+            writer = ColumnarSearchResultWriter(self.get_outputs_path(project_id) / SEARCH_RESULTS_DIR)
+        
         # Process each narration file
         all_matches = []
+        matrix_windows = []
+        
+        with writer if writer else contextlib.nullcontext(), query_cache if query_cache else contextlib.nullcontext():
+            for narration_file_idx, narration_srt_path in enumerate(narration_srt_files):
+                # Parse narration SRT
+                narration_entries = parse_srt_file(Path(narration_srt_path))
+                
+                # Use 3-sentence window for each entry (prev + current + next)
+                from src.core.chunking import chunk_srt_entries_3_sentence
+                narration_chunks = chunk_srt_entries_3_sentence(narration_entries)
+                
+                # Search for each 3-sentence chunk
+                for chunk_idx, chunk in enumerate(narration_chunks):
+                    # Get center entry for narration time
+                    center_entry = chunk.entries[len(chunk.entries) // 2] if chunk.entries else None
+                    narration_time = center_entry.start_time if center_entry else chunk.start_time
+                    
+                    window = {
+                        "narration_file_id": f"narration_{narration_file_idx}",
+                        "chunk_index": chunk_idx,
+                        "narration_time": narration_time,
+                        "narration_text": chunk.text
+                    }
+                    if matrix_kind:
+                        matrix_windows.append(window)
+                    
+                    window_matches = self._search_window(
+                        window,
+                        chroma_adapter=chroma_adapter,
+                        embedding_adapter=embedding_adapter,
+                        collection_name=collection_name,
+                        query_cache=query_cache,
+                        index_fingerprint=index_fingerprint,
+                        where=where
+                    )
+                    
+                    if writer:
+                        writer.write_window(window, window_matches)
+                    else:
+                        all_matches.extend(window_matches)
+        
+        if matrix_kind:
+            self._persist_similarity_matrix(
+                project_id,
+                kind=matrix_kind,
+                top_k=project_options.get("similarity_matrix_top_k", 50),
+                windows=matrix_windows,
+                chroma_adapter=chroma_adapter,
+                embedding_adapter=embedding_adapter,
+                index_data=index_data
+            )
+        
+        cache_stats = query_cache.stats() if query_cache else None
+        if cache_stats:
+            logger.info(
+                "Query cache: %d hits, %d misses (hit rate %.1f%%), %d evictions",
+                cache_stats["hits"], cache_stats["misses"], cache_stats["hit_rate"] * 100, cache_stats["evictions"]
+            )
+        
+        if writer:
+            return {
+                "format": output_format,
+                "output_path": str(writer.output_path),
+                "windows": writer.windows_written,
+                "matches": writer.matches_written,
+                "query_cache": cache_stats
+            }
+        
+        output = SearchOutput(matches=all_matches).model_dump()
+        output["query_cache"] = cache_stats
+        return output
+    
+    def _search_window(
+        self,
+        window: Dict[str, Any],
+        chroma_adapter: ChromaDBAdapter,
+        embedding_adapter: EmbeddingAdapter,
+        collection_name: str,
+        query_cache: Optional[QueryResultCache] = None,
+        index_fingerprint: Optional[str] = None,
+        n_results: int = 3,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Search movie chunks for one narration window
+        
+        Args:
+            window: Narration window fields (file id, chunk index, time, text)
+            chroma_adapter: ChromaDB adapter
+            embedding_adapter: Embedding adapter
+            collection_name: Movie subtitle collection
+            query_cache: Optional query-result cache
+            index_fingerprint: Fingerprint of the queried index (cache key)
+            n_results: Number of results (top 3 gives fallback options)
+            where: Optional metadata filter (e.g. maximum spoiler risk)
+            
+        Returns:
+            Match dictionaries, best first
+        """
+        results = None
+        cache_key = None
+        if query_cache:
+            cache_key = query_cache.make_key(
+                window["narration_text"],
+                self.embedding_model,
+                index_fingerprint,
+                n_results,
+                where=where
+            )
+            results = query_cache.get(cache_key)
         
-        for narration_file_idx, narration_srt_path in enumerate(narration_srt_files):
-            # Parse narration SRT
-            narration_entries = parse_srt_file(Path(narration_srt_path))
+        if results is None:
+            # Embed query chunk
+            query_embedding = embedding_adapter.embed_text(window["narration_text"])
             
-            # Use 3-sentence window for each entry (prev + current + next)
-            from src.core.chunking import chunk_srt_entries_3_sentence
-            narration_chunks = chunk_srt_entries_3_sentence(narration_entries)
+            # Query ChromaDB
+            results = chroma_adapter.query(
+                collection_name=collection_name,
+                query_embeddings=[query_embedding],
+                n_results=n_results,
+                where=where
+            )
             
-            # Search for each 3-sentence chunk
-            for chunk_idx, chunk in enumerate(narration_chunks):
-                # Get center entry for narration time
-                center_entry = chunk.entries[len(chunk.entries) // 2] if chunk.entries else None
-                narration_time = center_entry.start_time if center_entry else chunk.start_time
-                
-                # Embed query chunk
-                query_embedding = embedding_adapter.embed_text(chunk.text)
+            if query_cache:
+                query_cache.put(cache_key, {
+                    "ids": results.get("ids"),
+                    "metadatas": results.get("metadatas"),
+                    "distances": results.get("distances")
+                })
+        
+        # Process results
+        window_matches = []
+        if results.get("ids") and len(results["ids"][0]) > 0:
+            for i, (id_val, metadata, distance) in enumerate(zip(
+                results["ids"][0],
+                results["metadatas"][0],
+                results["distances"][0]
+            )):
+                similarity_score = 1.0 - distance  # Convert distance to similarity
                 
-                # Query ChromaDB (get top 3 results for fallback options)
-                results = chroma_adapter.query(
-                    collection_name=collection_name,
-                    query_embeddings=[query_embedding],
-                    n_results=3
+                match = SearchMatch(
+                    segment_id=id_val,
+                    start_time=metadata["start_time"],
+                    end_time=metadata["end_time"],
+                    similarity_score=similarity_score,
+                    narration_text=window["narration_text"],
+                    narration_file_id=window["narration_file_id"],
+                    narration_time=window["narration_time"],
+                    chunk_index=window["chunk_index"],
+                    result_rank=i  # 0=best, 1=second, 2=third
                 )
-                
-                # Process results
-                if results.get("ids") and len(results["ids"][0]) > 0:
-                    for i, (id_val, metadata, distance) in enumerate(zip(
-                        results["ids"][0],
-                        results["metadatas"][0],
-                        results["distances"][0]
-                    )):
-                        similarity_score = 1.0 - distance  # Convert distance to similarity
-                        
-                        match = SearchMatch(
-                            segment_id=id_val,
-                            start_time=metadata["start_time"],
-                            end_time=metadata["end_time"],
-                            similarity_score=similarity_score,
-                            narration_text=chunk.text
-                        )
-                        # Add narration file identifier
-                        match_dict = match.model_dump()
-                        match_dict["narration_file_id"] = f"narration_{narration_file_idx}"
-                        match_dict["narration_time"] = narration_time
-                        match_dict["chunk_index"] = chunk_idx
-                        match_dict["result_rank"] = i  # 0=best, 1=second, 2=third
-                        
-                        all_matches.append(match_dict)
-        
-        output = SearchOutput(matches=all_matches)
-        return output.model_dump()
+                window_matches.append(match.model_dump())
+        
+        return window_matches
+    
+    def _persist_similarity_matrix(
+        self,
+        project_id: str,
+        kind: str,
+        top_k: int,
+        windows: List[Dict[str, Any]],
+        chroma_adapter: ChromaDBAdapter,
+        embedding_adapter: EmbeddingAdapter,
+        index_data: Dict[str, Any],
+        block_size: int = 1024
+    ) -> Path:
+        """Persist narration x movie similarity matrix next to the index
+        
+        Args:
+            project_id: Project identifier
+            kind: "dense" or "topk"
+            top_k: Entries kept per window in topk layout
+            windows: Narration window records (one per matrix row)
+            chroma_adapter: ChromaDB adapter holding the movie chunks
+            embedding_adapter: Embedding adapter (query embeddings are cached)
+            index_data: Index stage output (collection name and fingerprint)
+            block_size: Windows processed per block
+            
+        Returns:
+            Path to the matrix manifest
+        """
+        records = chroma_adapter.get_all(index_data["collection_name"])
+        if not records.get("ids"):
+            raise StageExecutionError("Cannot build similarity matrix: movie index is empty")
+        
+        # Stable column order by chunk ID
+        order = sorted(range(len(records["ids"])), key=lambda i: records["ids"][i])
+        chunk_ids = [records["ids"][i] for i in order]
+        chunk_embeddings = np.asarray([records["embeddings"][i] for i in order], dtype=np.float32)
+        chunk_metadatas = [records["metadatas"][i] for i in order]
+        
+        writer = SimilarityMatrixWriter(
+            directory=self.get_similarity_matrix_path(project_id),
+            n_windows=len(windows),
+            chunk_ids=chunk_ids,
+            chunk_starts=[m["start_time"] for m in chunk_metadatas],
+            chunk_ends=[m["end_time"] for m in chunk_metadatas],
+            chunk_spoiler_risks=[m[RISK_KEY] for m in chunk_metadatas] if index_data.get("spoiler_scored") else None,
+            kind=kind,
+            top_k=top_k
+        )
+        
+        for start_row in range(0, len(windows), block_size):
+            block = windows[start_row:start_row + block_size]
+            query_embeddings = embedding_adapter.embed_texts([w["narration_text"] for w in block])
+            writer.write_rows(start_row, compute_similarity_scores(query_embeddings, chunk_embeddings))
+        
+        return writer.close(windows, manifest_extra={
+            "collection_name": index_data["collection_name"],
+            "index_fingerprint": index_data.get("fingerprint"),
+            "embedding_model": self.embedding_model
+        })
     
     def load_input(self, project_id: str) -> Dict[str, Any]:
         """Load ingest output"""
@@ -116,13 +326,26 @@ class SearchStage(BaseStage):
             return json.load(f)
     
     def save_output(self, project_id: str, data: Dict[str, Any]) -> Path:
-        """Save search output"""
-        output_path = self.get_outputs_path(project_id) / "search_output.json"
+        """Save search output
+        
+        JSONL and columnar outputs are already streamed to disk by run();
+        only stale outputs of other formats are removed.
+        """
+        outputs_path = self.get_outputs_path(project_id)
+        
+        if data.get("format") in ("jsonl", "columnar"):
+            output_path = Path(data["output_path"])
+            remove_search_outputs(outputs_path, keep=output_path)
+            return output_path
+        
+        output_path = outputs_path / SEARCH_OUTPUT_JSON
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2)
         
+        remove_search_outputs(outputs_path, keep=output_path)
+        
         return output_path
     
     def validate(self, config: Optional[Dict[str, Any]] = None) -> bool:
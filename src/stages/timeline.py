@@ -1,99 +1,69 @@
 """Stage 4: Timeline generation"""
 
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Iterable, List
 import json
+import logging
+
+import numpy as np
+from pydantic_core import to_json
 
 from src.stages.base import BaseStage, StageExecutionError
-from src.contracts.models.timeline import Timeline, TimelineOptions
-from src.contracts.models.stage_outputs import SearchOutput, SearchMatch
-from src.core.matching import filter_by_similarity_threshold, remove_severe_overlaps
-from src.core.filtering import merge_nearby_segments
-from src.core.timeline_builder import build_timeline, save_timeline_json
+from src.contracts.models.timeline import TimelineOptions
+from src.core.matching import MatchBatch
+from src.core.budget import apply_duration_budget
+from src.core.filtering import apply_scene_weights, priority_column, scene_weight_column
+from src.core.interval_index import IntervalIndex
+from src.core.scene_weights import SceneWeightTable
+from src.core.selection import build_candidate_table, select_candidates, table_candidate_arrays
+from src.core.similarity_matrix import SimilarityMatrix
+from src.core.timeline_state import STATE_VERSION as TIMELINE_STATE_VERSION, TimelineState
+from src.utils.fingerprint import fingerprint_paths, fingerprint_values
+from src.utils.srt_parser import parse_srt_file, SRTEntry
+from src.utils.search_results import (
+    SEARCH_RESULTS_DIR,
+    SearchResults,
+    find_search_output,
+    iter_search_output
+)
+from src.core.timeline_builder import (
+    IntervalSelection,
+    build_timeline_from_selection,
+    save_timeline_json,
+    write_timeline_json,
+    group_match_batch_by_narration_entry,
+    narration_interval_entries,
+    select_matches_for_narration_intervals
+)
+
+logger = logging.getLogger(__name__)
 
 
 class TimelineStage(BaseStage):
     """Timeline stage: generates timeline JSON from search matches"""
     
     def run(self, project_id: str, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Execute timeline generation stage"""
-        # Load search output
-        search_data = self.load_input(project_id)
-        search_output = SearchOutput(**search_data)
+        """Execute timeline generation stage
         
+        Args:
+            project_id: Project identifier
+            config: Optional overrides; config["options"] is merged over
+                the project.json options (used by the tuning CLI)
+        """
         # Load ingest output for file paths
-        ingest_output_path = self.get_outputs_path(project_id) / "ingest_output.json"
-        with open(ingest_output_path, 'r', encoding='utf-8') as f:
-            ingest_data = json.load(f)
+        ingest_data = self.load_ingest_output(project_id)
         
         # Load project config for options
-        project_config_path = self.get_configs_path(project_id) / "project.json"
-        project_config = None
-        if project_config_path.exists():
-            with open(project_config_path, 'r', encoding='utf-8') as f:
-                project_config = json.load(f)
-        
-        # Load narration SRT files to build intervals
-        from src.utils.srt_parser import parse_srt_file
-        narration_srt_files = ingest_data.get("narration_srt_files", [])
-        if not narration_srt_files:
-            narration_srt_path = ingest_data.get("narration_srt_path")
-            if narration_srt_path:
-                narration_srt_files = [narration_srt_path]
+        project_config = self.load_project_config(project_id) or None
+        opts = self.resolve_options(project_config, config)
         
-        # Parse all narration entries
-        all_narration_entries = []
-        for narration_file in narration_srt_files:
-            entries = parse_srt_file(Path(narration_file))
-            all_narration_entries.extend(entries)
+        similarity_threshold = opts.get("similarity_threshold", 0.75)
         
-        # Sort narration entries by time
-        all_narration_entries.sort(key=lambda e: e.start_time)
+        # Select matches, reusing persisted intermediate state where possible
+        selection = self.select_matches(project_id, ingest_data, opts)
         
-        # Organize matches by narration entry index
-        from src.core.matching import Match
-        matches_by_narration = {}
-        
-        for match_data in search_output.matches:
-            if isinstance(match_data, dict):
-                chunk_index = match_data.get("chunk_index", 0)
-                narration_time = match_data.get("narration_time", 0.0)
-                
-                # Find narration entry index
-                entry_index = 0
-                for i, entry in enumerate(all_narration_entries):
-                    if entry.start_time <= narration_time <= entry.end_time:
-                        entry_index = i
-                        break
-                
-                match = Match(
-                    segment_id=match_data["segment_id"],
-                    start_time=match_data["start_time"],
-                    end_time=match_data["end_time"],
-                    similarity_score=match_data["similarity_score"],
-                    narration_text=match_data.get("narration_text", ""),
-                    narration_time=narration_time,
-                    narration_file_id=match_data.get("narration_file_id")
-                )
-                
-                if entry_index not in matches_by_narration:
-                    matches_by_narration[entry_index] = []
-                matches_by_narration[entry_index].append(match)
-        
-        # Sort matches by similarity score (best first)
-        for entry_index in matches_by_narration:
-            matches_by_narration[entry_index].sort(key=lambda m: m.similarity_score, reverse=True)
-        
-        # Apply similarity threshold
-        similarity_threshold = 0.75
-        if project_config and project_config.get("options"):
-            similarity_threshold = project_config["options"].get("similarity_threshold", 0.75)
-        
-        for entry_index in matches_by_narration:
-            matches_by_narration[entry_index] = [
-                m for m in matches_by_narration[entry_index]
-                if m.similarity_score >= similarity_threshold
-            ]
+        # Enforce the output duration budget
+        self.apply_budget(selection, opts)
         
         # Build timeline using interval-based approach
         input_video = ingest_data.get("movie_video_path", "films/input/movie.mp4")
@@ -101,29 +71,20 @@ class TimelineStage(BaseStage):
         output_video = str(self.get_outputs_path(project_id) / "final.mp4")
         
         timeline_options = None
-        min_time_gap = 30.0
-        if project_config and project_config.get("options"):
-            opts = project_config["options"]
+        if opts:
             timeline_options = TimelineOptions(
                 spoiler_safe_mode=opts.get("spoiler_safe_mode", False),
                 spoiler_risk_threshold=opts.get("spoiler_risk_threshold", 0.3),
                 max_duration=opts.get("max_duration"),
                 min_segment_length=opts.get("min_segment_length", 3.0),
-                similarity_threshold=opts.get("similarity_threshold", 0.75)
+                similarity_threshold=similarity_threshold
             )
-            # Copyright compliance time gap (can be configurable)
-            min_time_gap = opts.get("copyright_min_gap", 30.0)
         
-        from src.core.timeline_builder import build_timeline_for_narration_intervals
-        
-        timeline = build_timeline_for_narration_intervals(
-            narration_entries=all_narration_entries,
-            matches_by_narration=matches_by_narration,
+        timeline = build_timeline_from_selection(
+            selection,
             input_video_path=input_video,
             narration_audio_path=narration_audio,
             output_video_path=output_video,
-            interval_seconds=4.0,  # 3-5 second intervals
-            min_time_gap=min_time_gap,
             project_id=project_id,
             movie_id=project_config.get("movie_id") if project_config else None,
             options=timeline_options
@@ -133,33 +94,442 @@ class TimelineStage(BaseStage):
         timeline_path = self.get_outputs_path(project_id) / "timeline.json"
         save_timeline_json(timeline, timeline_path)
         
-        return timeline.model_dump()
+        return timeline.model_dump(exclude_none=True)
     
-    def load_input(self, project_id: str) -> Dict[str, Any]:
-        """Load search output"""
-        search_output_path = self.get_outputs_path(project_id) / "search_output.json"
+    def select_matches(
+        self,
+        project_id: str,
+        ingest_data: Dict[str, Any],
+        opts: Dict[str, Any],
+        state_dir: Optional[Path] = None
+    ) -> IntervalSelection:
+        """Select one match per narration interval, incrementally
+        
+        Candidates, the DP candidate table and the DP picks are persisted in
+        outputs/timeline_state/. Each layer is only recomputed when an
+        option it depends on changed; changed inputs (narration SRTs, search
+        output, similarity matrix) rebuild everything.
+        
+        Args:
+            project_id: Project identifier
+            ingest_data: Ingest stage output
+            opts: Effective project options
+            state_dir: Optional state directory instead of
+                outputs/timeline_state (e.g. for parameter sweeps)
+        
+        Returns:
+            IntervalSelection
+        """
+        similarity_threshold = opts.get("similarity_threshold", 0.75)
+        interval_seconds = opts.get("interval_seconds", 4.0)  # 3-5 second intervals
+        # Copyright compliance time gap (can be configurable)
+        min_time_gap = opts.get("copyright_min_gap", 30.0)
+        strategy = opts.get("selection_strategy", "greedy")
+        
+        state = TimelineState(state_dir or self.get_outputs_path(project_id) / "timeline_state")
+        inputs_key = self.get_inputs_key(project_id, ingest_data, opts)
+        
+        cached = state.load_candidates(inputs_key)
+        if cached is not None:
+            entry_index, batch, entry_indices = cached
+            logger.info("Reusing timeline candidates (%d matches)", len(batch))
+        else:
+            # Load narration entries (sorted by time) to build intervals
+            entry_index = IntervalIndex.from_entries(self.load_narration_entries(ingest_data))
+            batch = self.load_candidate_batch(project_id, opts)
+            entry_indices = entry_index.find_many(batch.narration_time, default=0)
+            state.save_candidates(inputs_key, entry_index, batch, entry_indices)
+        
+        # Scene weights scale the selection scores; Segment.score stays the raw similarity
+        weight_table = self.load_scene_weights(project_id, opts)
+        weights = np.ones(len(batch))
+        priorities = np.zeros(len(batch), dtype=np.int64)
+        if weight_table is not None:
+            weight_map = weight_table.weight_map()
+            priority_map = weight_table.priority_map()
+            weights = scene_weight_column(batch, weight_map)
+            priorities = priority_column(batch, priority_map)
+        weighted_scores = batch.similarity_score * weights
+        
+        # A weight of 0 (editor override) excludes the chunk
+        keep = (batch.similarity_score >= similarity_threshold) & (weights > 0)
+        min_priority = opts.get("min_priority")
+        if min_priority:
+            keep &= (priorities == 0) | (priorities >= min_priority)
+        
+        if strategy != "dp":
+            # Greedy selection works on grouped Match lists
+            narration_entries = [
+                SRTEntry(index=i + 1, start_time=start, end_time=end, text="")
+                for i, (start, end) in enumerate(zip(entry_index.starts.tolist(), entry_index.ends.tolist()))
+            ]
+            selection = select_matches_for_narration_intervals(
+                narration_entries,
+                group_match_batch_by_narration_entry(
+                    batch.take(keep), narration_entries, scores=weighted_scores[keep]
+                ),
+                interval_seconds=interval_seconds,
+                min_time_gap=min_time_gap,
+                strategy=strategy
+            )
+        else:
+            selection = self.select_dp(
+                state, inputs_key, self.get_weights_key(project_id, opts),
+                entry_index, batch, entry_indices, weighted_scores, keep, opts
+            )
+        
+        if weight_table is not None:
+            selection.matches = apply_scene_weights(selection.matches, weight_map, priority_map)
+        return selection
+    
+    def apply_budget(self, selection: IntervalSelection, opts: Dict[str, Any]) -> IntervalSelection:
+        """Trim selected matches to options.max_duration (no-op without it)
+        
+        Scene weights and priorities of the matches are honoured.
+        
+        Args:
+            selection: Selection to trim in place
+            opts: Effective project options
+        
+        Returns:
+            The same selection
+        """
+        max_duration = opts.get("max_duration")
+        if max_duration:
+            matches = apply_duration_budget(
+                selection.matches,
+                max_duration,
+                min_segment_length=opts.get("min_segment_length", 3.0),
+                min_time_gap=opts.get("copyright_min_gap", 30.0),
+                weights=[1.0 if m.weight is None else m.weight for m in selection.matches],
+                priorities=[m.priority for m in selection.matches]
+            )
+            selection.trimmed = len(selection.matches) - len(matches)
+            selection.matches = matches
+        return selection
+    
+    def select_dp(
+        self,
+        state: TimelineState,
+        inputs_key: str,
+        weights_key: str,
+        entry_index: IntervalIndex,
+        batch: MatchBatch,
+        entry_indices: np.ndarray,
+        weighted_scores: np.ndarray,
+        keep: np.ndarray,
+        opts: Dict[str, Any]
+    ) -> IntervalSelection:
+        """DP selection over the candidate table, reusing persisted layers
+        
+        Args:
+            state: Persisted timeline state
+            inputs_key: Fingerprint of the candidate inputs
+            weights_key: Fingerprint of the scene weights and priority filter
+            entry_index: Interval index over the narration entries
+            batch: Candidate batch
+            entry_indices: Narration entry index per candidate
+            weighted_scores: Similarity times scene weight per candidate
+            keep: Usable candidates (threshold and priority filter)
+            opts: Effective project options
+        
+        Returns:
+            IntervalSelection
+        """
+        similarity_threshold = opts.get("similarity_threshold", 0.75)
+        interval_seconds = opts.get("interval_seconds", 4.0)
+        min_time_gap = opts.get("copyright_min_gap", 30.0)
+        allow_reuse = opts.get("allow_segment_reuse", True)
+        
+        table_key = fingerprint_values(inputs_key, weights_key, similarity_threshold, interval_seconds)
+        selection_key = fingerprint_values(table_key, min_time_gap, allow_reuse)
+        
+        picks = None
+        table = state.load_table(table_key)
+        if table is None:
+            offsets, rows = build_candidate_table(
+                narration_interval_entries(entry_index, interval_seconds),
+                entry_indices,
+                weighted_scores,
+                keep=keep
+            )
+        else:
+            offsets, rows = table
+            picks = state.load_picks(selection_key)
+            logger.info("Reusing timeline candidate table (%d intervals)", len(offsets) - 1)
+        
+        if picks is None:
+            segment_ids, centers, scores = table_candidate_arrays(
+                rows, batch.start_time, batch.end_time, weighted_scores, batch.chunk_id
+            )
+            picks = select_candidates(segment_ids, offsets, centers, scores, min_time_gap, allow_reuse)
+            state.save_selection(table_key, offsets, rows, selection_key, picks)
+        else:
+            logger.info("Reusing timeline selection")
+        
+        picked = np.flatnonzero(picks >= 0)
+        intervals_with_candidates = int((np.diff(offsets) > 0).sum())
+        return IntervalSelection(
+            matches=batch.take(rows[offsets[picked] + picks[picked]]).to_matches(),
+            intervals=len(offsets) - 1,
+            intervals_with_candidates=intervals_with_candidates,
+            skipped=intervals_with_candidates - len(picked)
+        )
+    
+    def load_scene_weights(self, project_id: str, opts: Dict[str, Any]) -> Optional[SceneWeightTable]:
+        """Load the index stage's scene weight table with editor overrides
+        
+        Args:
+            project_id: Project identifier
+            opts: Effective project options
+        
+        Returns:
+            SceneWeightTable, or None if disabled or not built yet
+        """
+        if not opts.get("scene_weights", False):
+            if opts.get("scene_weight_overrides"):
+                logger.warning("Scene weight overrides ignored: scene_weights is disabled")
+            return None
+        
+        weights_path = self.get_scene_weights_path(project_id)
+        if not weights_path.exists():
+            if opts.get("scene_weight_overrides"):
+                logger.warning("Scene weight overrides ignored: %s not found (re-run the index stage)", weights_path)
+            return None
+        
+        try:
+            return SceneWeightTable.load(weights_path).with_overrides(opts.get("scene_weight_overrides"))
+        except ValueError as e:
+            raise StageExecutionError(f"Invalid scene_weight_overrides: {e}")
+    
+    def get_weights_key(self, project_id: str, opts: Dict[str, Any]) -> str:
+        """Fingerprint of the scene weight table, overrides and priority filter"""
+        weights_path = None
+        if opts.get("scene_weights", False):
+            weights_path = self.get_scene_weights_path(project_id)
+        return fingerprint_values(
+            fingerprint_paths([weights_path]),
+            opts.get("scene_weight_overrides"),
+            opts.get("min_priority")
+        )
+    
+    def get_inputs_key(self, project_id: str, ingest_data: Dict[str, Any], opts: Dict[str, Any]) -> str:
+        """Fingerprint of everything the timeline candidates are derived from
         
-        if not search_output_path.exists():
-            raise StageExecutionError(f"Search output not found: {search_output_path}")
+        Args:
+            project_id: Project identifier
+            ingest_data: Ingest stage output
+            opts: Effective project options
         
-        with open(search_output_path, 'r', encoding='utf-8') as f:
+        Returns:
+            Inputs fingerprint (file sizes and modification times)
+        """
+        narration_srt_files = ingest_data.get("narration_srt_files") or [ingest_data.get("narration_srt_path")]
+        outputs_path = self.get_outputs_path(project_id)
+        
+        paths = [Path(p) for p in narration_srt_files if p]
+        paths.append(find_search_output(outputs_path))
+        candidate_options = None
+        if opts.get("use_similarity_matrix"):
+            paths.append(self.get_similarity_matrix_path(project_id))
+            paths.append(outputs_path / "index_output.json")
+            candidate_options = [opts.get("candidate_top_k", 3), self.max_spoiler_risk(opts)]
+        
+        return fingerprint_values(TIMELINE_STATE_VERSION, fingerprint_paths(paths), candidate_options)
+    
+    def load_ingest_output(self, project_id: str) -> Dict[str, Any]:
+        """Load ingest output (file paths)"""
+        ingest_output_path = self.get_outputs_path(project_id) / "ingest_output.json"
+        
+        if not ingest_output_path.exists():
+            raise StageExecutionError(f"Ingest output not found: {ingest_output_path}")
+        
+        with open(ingest_output_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     
+    def load_narration_entries(self, ingest_data: Dict[str, Any]) -> List[SRTEntry]:
+        """Parse all narration SRT files listed in the ingest output
+        
+        Args:
+            ingest_data: Ingest stage output
+        
+        Returns:
+            Narration entries of all files, sorted by start time
+        """
+        narration_srt_files = ingest_data.get("narration_srt_files", [])
+        if not narration_srt_files:
+            narration_srt_path = ingest_data.get("narration_srt_path")
+            if narration_srt_path:
+                narration_srt_files = [narration_srt_path]
+        
+        # Parse all narration entries
+        all_narration_entries = []
+        for narration_file in narration_srt_files:
+            entries = parse_srt_file(Path(narration_file))
+            all_narration_entries.extend(entries)
+        
+        # Sort narration entries by time
+        all_narration_entries.sort(key=lambda e: e.start_time)
+        return all_narration_entries
+    
+    def resolve_options(
+        self,
+        project_config: Optional[Dict[str, Any]],
+        config: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Merge project.json options with run-time overrides
+        
+        Args:
+            project_config: Project configuration (may be None)
+            config: Optional stage config with an "options" override dict
+        
+        Returns:
+            Effective options dictionary
+        """
+        opts = dict((project_config or {}).get("options") or {})
+        if config and config.get("options"):
+            opts.update(config["options"])
+        return opts
+    
+    def max_spoiler_risk(self, opts: Dict[str, Any]) -> Optional[float]:
+        """Maximum chunk spoiler risk for candidates (None = no filtering)
+        
+        Search applies the same limit as a vector store filter; candidates
+        re-derived from the similarity matrix are filtered here.
+        """
+        if not opts.get("spoiler_safe_mode"):
+            return None
+        return opts.get("spoiler_risk_threshold", 0.3)
+    
+    def load_candidates(self, project_id: str, opts: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """Load search candidates as match dictionaries
+        
+        Uses the persisted similarity matrix when enabled and built from the
+        current index, otherwise the search stage output.
+        
+        Args:
+            project_id: Project identifier
+            opts: Effective project options
+        
+        Returns:
+            Iterable of match dictionaries
+        """
+        if opts.get("use_similarity_matrix"):
+            matrix = self.load_similarity_matrix(project_id)
+            if matrix is not None:
+                return matrix.iter_candidates(
+                    k=opts.get("candidate_top_k", 3),
+                    max_spoiler_risk=self.max_spoiler_risk(opts)
+                )
+        
+        # Stream matches (JSONL is read one window at a time)
+        outputs_path = self.get_outputs_path(project_id)
+        if find_search_output(outputs_path) is None:
+            raise StageExecutionError(f"Search output not found in {outputs_path}")
+        return iter_search_output(outputs_path)
+    
+    def load_candidate_batch(self, project_id: str, opts: Dict[str, Any]) -> MatchBatch:
+        """Load search candidates as a columnar match batch
+        
+        Columnar search results are mapped to batch columns directly
+        (no per-match dictionaries); other sources go through load_candidates.
+        
+        Args:
+            project_id: Project identifier
+            opts: Effective project options
+        
+        Returns:
+            MatchBatch with all candidates
+        """
+        search_output_path = find_search_output(self.get_outputs_path(project_id))
+        
+        if (
+            not opts.get("use_similarity_matrix")
+            and search_output_path is not None
+            and search_output_path.name == SEARCH_RESULTS_DIR
+        ):
+            results = SearchResults(search_output_path)
+            windows = results.windows
+            matches = results.matches
+            chunks = results.chunks
+            
+            window_ids = matches["window_id"]
+            chunk_ids = matches["chunk_id"]
+            texts = np.array([text or "" for text in results.narration_texts], dtype=object)
+            file_ids = np.array(results.narration_file_ids, dtype=object)
+            
+            return MatchBatch(
+                segment_id=np.array(chunks["segment_id"], dtype=object)[chunk_ids],
+                start_time=chunks["start_time"][chunk_ids],
+                end_time=chunks["end_time"][chunk_ids],
+                similarity_score=matches["score"].astype(np.float64),
+                narration_time=windows["narration_time"][window_ids],
+                narration_text=texts[window_ids],
+                narration_file_id=file_ids[windows["file_index"][window_ids]],
+                chunk_id=chunk_ids.astype(np.int32)
+            )
+        
+        return MatchBatch.from_dicts(self.load_candidates(project_id, opts))
+    
+    def load_similarity_matrix(self, project_id: str) -> Optional[SimilarityMatrix]:
+        """Load persisted similarity matrix if it matches the current index
+        
+        Without an index output (or an index fingerprint) the matrix cannot
+        be checked and counts as stale.
+        
+        Args:
+            project_id: Project identifier
+        
+        Returns:
+            SimilarityMatrix, or None if missing or stale
+        """
+        matrix_path = self.get_similarity_matrix_path(project_id)
+        if not SimilarityMatrix.exists(matrix_path):
+            return None
+        
+        index_output_path = self.get_outputs_path(project_id) / "index_output.json"
+        if not index_output_path.exists():
+            logger.warning("Similarity matrix ignored: %s not found", index_output_path)
+            return None
+        with open(index_output_path, 'r', encoding='utf-8') as f:
+            index_data = json.load(f)
+        
+        matrix = SimilarityMatrix(matrix_path)
+        fingerprint = index_data.get("fingerprint")
+        if not fingerprint or not matrix.is_compatible(fingerprint, index_data.get("embedding_model")):
+            logger.warning("Similarity matrix ignored: it was not computed from the current index")
+            return None
+        
+        return matrix
+    
+    def load_input(self, project_id: str) -> Dict[str, Any]:
+        """Load search output in any format (columnar, JSONL or JSON)
+        
+        Returns:
+            Dictionary with the list of match dictionaries under "matches"
+        """
+        outputs_path = self.get_outputs_path(project_id)
+        if find_search_output(outputs_path) is None:
+            raise StageExecutionError(f"Search output not found in {outputs_path}")
+        return {"matches": list(iter_search_output(outputs_path))}
+    
     def save_output(self, project_id: str, data: Dict[str, Any]) -> Path:
         """Save timeline output"""
         output_path = self.get_outputs_path(project_id) / "outputs" / "timeline.json"
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Use Pydantic's JSON serialization which handles datetime
-        from src.contracts.models.timeline import Timeline
-        timeline = Timeline(**data)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(timeline.model_dump_json(indent=2, exclude_none=True))
+        # data is run()'s model_dump(exclude_none=True) output: serialize it
+        # as-is (pydantic_core handles datetime) instead of validating the
+        # whole timeline again
+        write_timeline_json(
+            output_path,
+            to_json({**data, "segments": []}, indent=2),
+            data["segments"],
+            lambda batch: to_json(batch, indent=2)
+        )
         
         return output_path
     
     def validate(self, config: Optional[Dict[str, Any]] = None) -> bool:
         """Validate timeline configuration"""
         return True
-
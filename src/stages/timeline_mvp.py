@@ -28,10 +28,10 @@ class TimelineStageMVP(BaseStage):
         self.ensure_project_structure(project_id)
         
         # Try to load search output first
-        search_output_path = self.get_outputs_path(project_id) / "search_output.json"
+        from src.utils.search_results import find_search_output
         segments_data = None
         
-        if search_output_path.exists():
+        if find_search_output(self.get_outputs_path(project_id)) is not None:
             # Use real search output
             segments_data = self._load_from_search_output(project_id)
         elif config and "segments" in config:
@@ -116,20 +116,15 @@ class TimelineStageMVP(BaseStage):
     
     def _load_from_search_output(self, project_id: str) -> List[Dict[str, Any]]:
         """Load segments from search output"""
-        from src.contracts.models.stage_outputs import SearchOutput
+        from src.utils.search_results import iter_search_output
         
-        search_output_path = self.get_outputs_path(project_id) / "search_output.json"
-        with open(search_output_path, 'r', encoding='utf-8') as f:
-            search_data = json.load(f)
-        
-        search_output = SearchOutput(**search_data)
         return [
             {
                 "start": match["start_time"],
                 "end": match["end_time"],
                 "score": match["similarity_score"]
             }
-            for match in search_output.matches
+            for match in iter_search_output(self.get_outputs_path(project_id))
         ]
     
     def _load_project_config(self, project_id: str) -> Optional[Dict[str, Any]]:
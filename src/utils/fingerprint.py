@@ -0,0 +1,67 @@
+"""Content fingerprints for cache invalidation"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+
+def fingerprint_file(file_path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Compute SHA-256 fingerprint of a file's content
+    
+    Args:
+        file_path: Path to file
+        chunk_size: Read buffer size in bytes
+    
+    Returns:
+        Hex digest of file content
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint_values(*values: Any) -> str:
+    """Compute SHA-256 fingerprint of JSON-serializable values
+    
+    Args:
+        values: Values to fingerprint (order matters)
+    
+    Returns:
+        Hex digest of the canonical JSON encoding
+    """
+    payload = json.dumps(values, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def fingerprint_paths(paths: Iterable[Optional[Path]]) -> str:
+    """Compute a cheap fingerprint of files from their size and modification time
+    
+    Directories contribute every file below them. Missing paths are
+    recorded as missing, so creating or deleting a file changes the result.
+    Content is not read, which keeps this fast for large search outputs.
+    
+    Args:
+        paths: Files or directories (None entries are ignored)
+    
+    Returns:
+        Hex digest of the (path, size, mtime) signatures
+    """
+    signatures = []
+    for path in paths:
+        if path is None:
+            continue
+        path = Path(path)
+        if path.is_dir():
+            files = sorted(p for p in path.rglob('*') if p.is_file())
+        else:
+            files = [path]
+        for file_path in files:
+            if file_path.exists():
+                stat = file_path.stat()
+                signatures.append([str(file_path), stat.st_size, stat.st_mtime_ns])
+            else:
+                signatures.append([str(file_path), None, None])
+    return fingerprint_values(signatures)
@@ -0,0 +1,420 @@
+"""Search result files - streaming writers and readers
+
+Three formats are supported:
+- json: legacy search_output.json ({"matches": [...]})
+- jsonl: search_output.jsonl, one record per narration window
+- columnar: search_results/ directory, normalized tables (version 2.0)
+
+The JSONL format stores one record per narration window:
+
+    {"narration_file_id": "narration_0", "chunk_index": 12, "narration_time": 48.2,
+     "narration_text": "...", "matches": [{"segment_id": "movie_000123",
+     "start_time": 2450.3, "end_time": 2470.8, "similarity_score": 0.82,
+     "result_rank": 0}, ...]}
+
+Records are written as soon as a window is searched and read back one at a
+time, so memory stays flat regardless of narration length.
+
+The columnar format stores every narration window and movie chunk once and
+matches as compact (window_id, chunk_id, score, rank) columns:
+
+    search_results/
+      manifest.json      version, narration file ids, counts
+      windows.npz        file_index, chunk_index, narration_time per window
+      window_texts.jsonl narration text per window (one JSON string per line)
+      chunks.json        segment_id, start_time, end_time per referenced chunk
+      matches.npz        window_id, chunk_id, score, rank per match
+"""
+
+import json
+import shutil
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+SEARCH_OUTPUT_JSON = "search_output.json"
+SEARCH_OUTPUT_JSONL = "search_output.jsonl"
+SEARCH_RESULTS_DIR = "search_results"
+
+COLUMNAR_VERSION = "2.0"
+
+WINDOW_FIELDS = ("narration_file_id", "chunk_index", "narration_time", "narration_text")
+
+
+class SearchResultWriter:
+    """Streams search results to a JSONL file, one record per narration window"""
+    
+    def __init__(self, output_path: Path):
+        """Initialize writer
+        
+        Args:
+            output_path: Path to the JSONL file (overwritten)
+        """
+        self.output_path = output_path
+        self.windows_written = 0
+        self.matches_written = 0
+        self._file = None
+    
+    def __enter__(self) -> "SearchResultWriter":
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file so readers never see a partial result
+        self._tmp_path = self.output_path.with_name(self.output_path.name + ".tmp")
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._file.close()
+        self._file = None
+        if exc_type is None:
+            self._tmp_path.replace(self.output_path)
+        else:
+            self._tmp_path.unlink()
+    
+    def write_window(self, window: Dict[str, Any], matches: List[Dict[str, Any]]) -> None:
+        """Write the results of one narration window
+        
+        Args:
+            window: Window fields (narration_file_id, chunk_index, narration_time, narration_text)
+            matches: Match dicts (segment_id, start_time, end_time, similarity_score, result_rank)
+        """
+        record = {field: window.get(field) for field in WINDOW_FIELDS}
+        record["matches"] = [
+            {key: value for key, value in match.items() if key not in WINDOW_FIELDS}
+            for match in matches
+        ]
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write("\n")
+        self.windows_written += 1
+        self.matches_written += len(matches)
+
+
+class ColumnarSearchResultWriter:
+    """Streams search results into the normalized columnar format
+    
+    Match columns are accumulated in typed arrays (a few bytes per match);
+    narration text is written to disk as each window arrives.
+    """
+    
+    def __init__(self, output_path: Path):
+        """Initialize writer
+        
+        Args:
+            output_path: Path to the search_results directory (replaced)
+        """
+        self.output_path = output_path
+        self.windows_written = 0
+        self.matches_written = 0
+        
+        self._file_ids = {}
+        self._window_file_index = array('i')
+        self._window_chunk_index = array('i')
+        self._window_time = array('d')
+        
+        self._chunk_ids = {}
+        self._chunk_starts = array('d')
+        self._chunk_ends = array('d')
+        
+        self._match_window = array('i')
+        self._match_chunk = array('i')
+        self._match_score = array('d')
+        self._match_rank = array('h')
+        self._texts = None
+    
+    def __enter__(self) -> "ColumnarSearchResultWriter":
+        # Build in a temporary directory so readers never see a partial result
+        self._tmp_path = self.output_path.with_name(self.output_path.name + ".tmp")
+        if self._tmp_path.exists():
+            shutil.rmtree(self._tmp_path)
+        self._tmp_path.mkdir(parents=True)
+        self._texts = open(self._tmp_path / "window_texts.jsonl", 'w', encoding='utf-8')
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._texts.close()
+        self._texts = None
+        if exc_type is not None:
+            shutil.rmtree(self._tmp_path)
+            return
+        
+        self._write_tables(self._tmp_path)
+        if self.output_path.exists():
+            shutil.rmtree(self.output_path)
+        self._tmp_path.replace(self.output_path)
+    
+    def write_window(self, window: Dict[str, Any], matches: List[Dict[str, Any]]) -> None:
+        """Write the results of one narration window
+        
+        Args:
+            window: Window fields (narration_file_id, chunk_index, narration_time, narration_text)
+            matches: Match dicts (segment_id, start_time, end_time, similarity_score, result_rank)
+        """
+        window_id = self.windows_written
+        file_id = window.get("narration_file_id")
+        if file_id not in self._file_ids:
+            self._file_ids[file_id] = len(self._file_ids)
+        
+        self._window_file_index.append(self._file_ids[file_id])
+        self._window_chunk_index.append(window.get("chunk_index") or 0)
+        self._window_time.append(window.get("narration_time") or 0.0)
+        self._texts.write(json.dumps(window.get("narration_text"), ensure_ascii=False))
+        self._texts.write("\n")
+        
+        for rank, match in enumerate(matches):
+            segment_id = match["segment_id"]
+            chunk_id = self._chunk_ids.get(segment_id)
+            if chunk_id is None:
+                chunk_id = len(self._chunk_ids)
+                self._chunk_ids[segment_id] = chunk_id
+                self._chunk_starts.append(match["start_time"])
+                self._chunk_ends.append(match["end_time"])
+            
+            self._match_window.append(window_id)
+            self._match_chunk.append(chunk_id)
+            self._match_score.append(match["similarity_score"])
+            self._match_rank.append(match.get("result_rank", rank))
+        
+        self.windows_written += 1
+        self.matches_written += len(matches)
+    
+    def _write_tables(self, directory: Path) -> None:
+        """Write column tables and manifest"""
+        np.savez(
+            directory / "windows.npz",
+            file_index=np.frombuffer(self._window_file_index, dtype=np.int32),
+            chunk_index=np.frombuffer(self._window_chunk_index, dtype=np.int32),
+            narration_time=np.frombuffer(self._window_time, dtype=np.float64)
+        )
+        np.savez(
+            directory / "matches.npz",
+            window_id=np.frombuffer(self._match_window, dtype=np.int32),
+            chunk_id=np.frombuffer(self._match_chunk, dtype=np.int32),
+            score=np.frombuffer(self._match_score, dtype=np.float64),
+            rank=np.frombuffer(self._match_rank, dtype=np.int16)
+        )
+        with open(directory / "chunks.json", 'w', encoding='utf-8') as f:
+            json.dump({
+                "segment_id": list(self._chunk_ids),
+                "start_time": self._chunk_starts.tolist(),
+                "end_time": self._chunk_ends.tolist()
+            }, f)
+        with open(directory / "manifest.json", 'w', encoding='utf-8') as f:
+            json.dump({
+                "format": "columnar",
+                "version": COLUMNAR_VERSION,
+                "narration_file_ids": list(self._file_ids),
+                "windows": self.windows_written,
+                "chunks": len(self._chunk_ids),
+                "matches": self.matches_written
+            }, f, indent=2)
+
+
+class SearchResults:
+    """Lazy reader for the columnar search result format
+    
+    Tables are loaded on first access, so callers that only need match
+    columns never parse narration text.
+    """
+    
+    def __init__(self, directory: Path):
+        """Open columnar search results
+        
+        Args:
+            directory: Path to the search_results directory
+        
+        Raises:
+            ValueError: If the format version is not supported
+        """
+        self.directory = directory
+        with open(directory / "manifest.json", 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        
+        version = str(self.manifest.get("version", ""))
+        if version.split(".")[0] != COLUMNAR_VERSION.split(".")[0]:
+            raise ValueError(f"Unsupported search results version: {version}")
+        
+        self.narration_file_ids = self.manifest["narration_file_ids"]
+        self._windows = None
+        self._matches = None
+        self._chunks = None
+        self._texts = None
+    
+    def __len__(self) -> int:
+        """Number of matches"""
+        return self.manifest["matches"]
+    
+    @property
+    def windows(self) -> Dict[str, np.ndarray]:
+        """Window table columns (file_index, chunk_index, narration_time)"""
+        if self._windows is None:
+            with np.load(self.directory / "windows.npz") as data:
+                self._windows = {key: data[key] for key in data.files}
+        return self._windows
+    
+    @property
+    def matches(self) -> Dict[str, np.ndarray]:
+        """Match table columns (window_id, chunk_id, score, rank)"""
+        if self._matches is None:
+            with np.load(self.directory / "matches.npz") as data:
+                self._matches = {key: data[key] for key in data.files}
+        return self._matches
+    
+    @property
+    def chunks(self) -> Dict[str, Any]:
+        """Chunk table (segment_id list, start_time and end_time columns)"""
+        if self._chunks is None:
+            with open(self.directory / "chunks.json", 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._chunks = {
+                "segment_id": data["segment_id"],
+                "start_time": np.asarray(data["start_time"], dtype=np.float64),
+                "end_time": np.asarray(data["end_time"], dtype=np.float64)
+            }
+        return self._chunks
+    
+    @property
+    def narration_texts(self) -> List[str]:
+        """Narration text per window"""
+        if self._texts is None:
+            with open(self.directory / "window_texts.jsonl", 'r', encoding='utf-8') as f:
+                self._texts = [json.loads(line) for line in f if line.strip()]
+        return self._texts
+    
+    def iter_matches(self, include_text: bool = True) -> Iterator[Dict[str, Any]]:
+        """Iterate over flat match dicts (same shape as search_output.json)
+        
+        Args:
+            include_text: Whether to attach narration_text (loads the text table)
+        
+        Yields:
+            Match dictionaries
+        """
+        windows = self.windows
+        matches = self.matches
+        chunks = self.chunks
+        texts = self.narration_texts if include_text else None
+        
+        window_ids = matches["window_id"].tolist()
+        chunk_ids = matches["chunk_id"].tolist()
+        scores = matches["score"].tolist()
+        ranks = matches["rank"].tolist()
+        file_index = windows["file_index"].tolist()
+        chunk_index = windows["chunk_index"].tolist()
+        narration_time = windows["narration_time"].tolist()
+        chunk_starts = chunks["start_time"].tolist()
+        chunk_ends = chunks["end_time"].tolist()
+        
+        for window_id, chunk_id, score, rank in zip(window_ids, chunk_ids, scores, ranks):
+            yield {
+                "segment_id": chunks["segment_id"][chunk_id],
+                "start_time": chunk_starts[chunk_id],
+                "end_time": chunk_ends[chunk_id],
+                "similarity_score": score,
+                "narration_text": texts[window_id] if texts is not None else None,
+                "narration_file_id": self.narration_file_ids[file_index[window_id]],
+                "narration_time": narration_time[window_id],
+                "chunk_index": chunk_index[window_id],
+                "result_rank": rank
+            }
+
+
+def iter_search_windows(jsonl_path: Path) -> Iterator[Dict[str, Any]]:
+    """Iterate over narration window records of a JSONL search output
+    
+    Args:
+        jsonl_path: Path to search_output.jsonl
+    
+    Yields:
+        Window record dictionaries (with their "matches" list)
+    """
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_search_matches(jsonl_path: Path) -> Iterator[Dict[str, Any]]:
+    """Iterate over flat match dicts of a JSONL search output
+    
+    Each match carries its window fields, i.e. the same shape as the
+    matches of search_output.json.
+    
+    Args:
+        jsonl_path: Path to search_output.jsonl
+    
+    Yields:
+        Match dictionaries
+    """
+    for record in iter_search_windows(jsonl_path):
+        window = {field: record.get(field) for field in WINDOW_FIELDS}
+        for match in record.get("matches", []):
+            match_dict = dict(match)
+            match_dict.update(window)
+            yield match_dict
+
+
+def find_search_output(outputs_path: Path) -> Optional[Path]:
+    """Find the search output of a project (columnar, then JSONL, then JSON)
+    
+    Args:
+        outputs_path: Project outputs directory
+    
+    Returns:
+        Path to the search output, or None if the search stage has not run
+    """
+    for name in (SEARCH_RESULTS_DIR, SEARCH_OUTPUT_JSONL, SEARCH_OUTPUT_JSON):
+        path = outputs_path / name
+        if path.exists():
+            return path
+    return None
+
+
+def iter_search_output(outputs_path: Path) -> Iterator[Dict[str, Any]]:
+    """Iterate over search matches regardless of output format
+    
+    Args:
+        outputs_path: Project outputs directory
+    
+    Yields:
+        Match dictionaries
+    
+    Raises:
+        FileNotFoundError: If no search output exists
+    """
+    path = find_search_output(outputs_path)
+    if path is None:
+        raise FileNotFoundError(f"Search output not found in {outputs_path}")
+    
+    if path.name == SEARCH_RESULTS_DIR:
+        yield from SearchResults(path).iter_matches()
+        return
+    
+    if path.name == SEARCH_OUTPUT_JSONL:
+        yield from iter_search_matches(path)
+        return
+    
+    from src.contracts.models.stage_outputs import SearchOutput
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        search_output = SearchOutput(**json.load(f))
+    for match in search_output.matches:
+        yield match.model_dump()
+
+
+def remove_search_outputs(outputs_path: Path, keep: Optional[Path] = None) -> None:
+    """Remove search outputs of all formats except keep
+    
+    Args:
+        outputs_path: Project outputs directory
+        keep: Output path to keep (the one just written)
+    """
+    for name in (SEARCH_RESULTS_DIR, SEARCH_OUTPUT_JSONL, SEARCH_OUTPUT_JSON):
+        path = outputs_path / name
+        if keep is not None and path == keep:
+            continue
+        if path.is_dir():
+            shutil.rmtree(path)
+        elif path.exists():
+            path.unlink()